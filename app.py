@@ -1,16 +1,66 @@
 import streamlit as st
 from datetime import datetime, timedelta, date, time as dt_time
 import uuid
-import mysql.connector as con
 import time
 from config import Config
-from db_helper import get_db
+from db_helper import get_db, TransactionRollback
+from query_log import QueryBudgetExceeded
+import profiler
+from sessions import get_sessions
 
 # Initialize database connection
 @st.cache_resource
 def init_database():
     """Initialize database connection (cached)"""
-    return get_db()
+    db = get_db()
+    if profiler.record_query not in db.query_log.listeners:
+        db.query_log.listeners.append(profiler.record_query)
+    return db
+
+
+# URL query parameter holding the login session token
+SESSION_PARAM = "session"
+
+
+def start_session(user_id):
+    """Issue a login session token and keep it in the URL, so a refresh stays signed in"""
+    token = get_sessions().issue(user_id)
+    if token:
+        st.session_state.session_token = token
+        st.session_state.session_saved = ("events", None)
+        st.query_params[SESSION_PARAM] = token
+
+
+def restore_session():
+    """Sign back in from the URL's session token after a refresh (no password check)"""
+    token = st.query_params.get(SESSION_PARAM)
+    if not token:
+        return
+    session = get_sessions().restore(token)
+    if session is None:
+        del st.query_params[SESSION_PARAM]
+        return
+
+    st.session_state.logged_in = True
+    st.session_state.user_id = session["user_ID"]
+    st.session_state.user_name = f"{session['first_name']} {session['last_name']}"
+    st.session_state.user_email = session["username"]
+    st.session_state.user_contact = session["mobile_no"]
+    st.session_state.user_role = session["rrole"]
+    st.session_state.current_page = session["current_page"] or "events"
+    if session["current_event"] is not None:
+        st.session_state.current_event = session["current_event"]
+    st.session_state.session_token = token
+    st.session_state.session_saved = (st.session_state.current_page, session["current_event"])
+
+
+def save_session_state():
+    """Store the current page and event with the session when they change"""
+    token = st.session_state.get("session_token")
+    state = (st.session_state.current_page, st.session_state.get("current_event"))
+    if token and state != st.session_state.get("session_saved"):
+        get_sessions().save_state(token, *state)
+        st.session_state.session_saved = state
 
 
 # Page configuration
@@ -22,6 +72,7 @@ st.set_page_config(
 )
 
 # Design System - CSS Custom Properties and Component Styles
+@profiler.profiled
 def load_design_system():
     """Load the complete design system with CSS custom properties"""
     st.markdown("""
@@ -685,6 +736,7 @@ def get_status_badge(status):
     config = status_config.get(status.lower(), status_config["upcoming"])
     return f'<span class="status-badge {config["class"]}">{config["icon"]} {config["text"]}</span>'
 
+@profiler.profiled
 def render_header(user_name, user_email):
     """Render the application header with gradient background"""
     header_html = f"""
@@ -703,8 +755,23 @@ def render_header(user_name, user_email):
     """
     st.markdown(header_html, unsafe_allow_html=True)
 
+def get_user_event_roles():
+    """Return the user's {event_id: user_role} map, loaded once per session"""
+    if st.session_state.get("user_event_roles") is None:
+        db = init_database()
+        st.session_state.user_event_roles = db.get_user_event_roles(st.session_state.user_id)
+    return st.session_state.user_event_roles
+
+def refresh_user_event_roles():
+    """Drop the cached role map after a join, event creation or role change"""
+    st.session_state.user_event_roles = None
+
 def check_permission(event_id, user_role, required_roles):
     """Check if user has permission based on role"""
+    # Fall back to the session role map when no role is given
+    if user_role is None:
+        user_role = get_user_event_roles().get(event_id, "participant")
+    
     # Normalize role (handle legacy 'organiser' as 'admin')
     role_lower = user_role.lower()
     if role_lower == "organiser":
@@ -712,6 +779,163 @@ def check_permission(event_id, user_role, required_roles):
     
     return role_lower in [r.lower() for r in required_roles]
 
+# Most DB queries a page may run in one rerun with a cold cache; enforced
+# when QUERY_BUDGET_ENFORCE=1 so N+1 regressions fail loudly
+PAGE_QUERY_BUDGETS = {
+    "events_page": 5,
+    "event_details_page": 12,
+}
+
+def render_query_panel(scope):
+    """Debug panel with the DB calls made during this rerun"""
+    summary = scope.summary()
+    budget = f" / {summary['budget']}" if summary["budget"] is not None else ""
+    with st.expander(f"🐞 {summary['name']}: {summary['queries']}{budget} queries, "
+                     f"{summary['db_time'] * 1000:.0f} ms in DB"):
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("DB Queries", f"{summary['queries']}{budget}")
+        col2.metric("Calls", summary["calls"])
+        col3.metric("Served From Cache", summary["cached"])
+        col4.metric("Rerun Time", f"{summary['elapsed'] * 1000:.0f} ms")
+        st.dataframe(
+            [
+                {
+                    "method": call["method"],
+                    "rows": call["rows"],
+                    "queries": call["queries"],
+                    "ms": round(call["elapsed"] * 1000, 1),
+                }
+                for call in scope.calls
+            ],
+            use_container_width=True
+        )
+
+def run_page(page):
+    """Render a page inside a query scope, checking its query budget"""
+    db = init_database()
+    name = page.__name__
+    try:
+        with db.query_log.scope(name, budget=PAGE_QUERY_BUDGETS.get(name)) as scope:
+            page()
+    except QueryBudgetExceeded:
+        if Config.QUERY_DEBUG:
+            render_query_panel(scope)
+        raise
+    if Config.QUERY_DEBUG:
+        render_query_panel(scope)
+
+def render_chat_messages(messages):
+    """Render chat messages as bubbles (own messages on the right)"""
+    for message in messages:
+        is_my_message = message["sender_username"] == st.session_state.user_email
+        timestamp = message['created_at'].strftime('%H:%M') if hasattr(message['created_at'], 'strftime') else str(message['created_at'])[11:16]
+        
+        if is_my_message:
+            col_space, col_msg = st.columns([1, 4])
+            with col_msg:
+                st.markdown(f"""
+                <div class="message-bubble message-bubble--sent">
+                    <strong>You</strong><br>
+                    {message['chat_message_text']}<br>
+                    <div class="message-bubble__time">{timestamp}</div>
+                </div>
+                """, unsafe_allow_html=True)
+        else:
+            col_msg, col_space = st.columns([4, 1])
+            with col_msg:
+                st.markdown(f"""
+                <div class="message-bubble message-bubble--received">
+                    <strong>{message['sender_username']}</strong><br>
+                    {message['chat_message_text']}<br>
+                    <div class="message-bubble__time">{timestamp}</div>
+                </div>
+                """, unsafe_allow_html=True)
+
+def poll_chat_history(history):
+    """Append messages newer than the last one seen and adapt the poll interval
+    
+    Busy rooms are polled every CHAT_POLL_MIN_SECONDS; each empty poll doubles
+    the interval up to CHAT_POLL_MAX_SECONDS.
+    """
+    new_messages = history["subscription"].poll()
+    if new_messages:
+        history["messages"] += new_messages
+        if new_messages[0]["chat_id"] < history["last_id"]:
+            history["messages"].sort(key=lambda message: message["chat_id"])
+        history["last_id"] = history["messages"][-1]["chat_id"]
+        history["interval"] = Config.CHAT_POLL_MIN_SECONDS
+    else:
+        history["interval"] = min(history["interval"] * 2, Config.CHAT_POLL_MAX_SECONDS)
+    history["next_poll"] = time.time() + history["interval"]
+
+def load_older_messages(history, load_page, page_size):
+    """Prepend the page before the oldest loaded message"""
+    oldest_id = history["messages"][0]["chat_id"] if history["messages"] else None
+    older = load_page(oldest_id, page_size)
+    history["messages"] = older + history["messages"]
+    history["has_older"] = len(older) == page_size
+
+@st.fragment(run_every=Config.CHAT_TICK_SECONDS)
+def chat_room(room_key, load_page, subscribe, send, page_size, empty_text, first_page=None):
+    """Live chat room that refreshes on its own without a full page rerun
+    
+    load_page(before_id, limit) returns one page in chronological order,
+    subscribe(after_id) opens a broker subscription and send(text) posts a
+    message. The newest page is read once (or taken from first_page when it
+    was prefetched); after that each due tick only picks up messages above
+    the last chat_id seen, shared across sessions.
+    """
+    histories = st.session_state.setdefault("chat_histories", {})
+    history = histories.get(room_key)
+    
+    if history is None:
+        messages = first_page if first_page is not None else load_page(None, page_size)
+        last_id = messages[-1]["chat_id"] if messages else 0
+        history = {
+            "messages": messages,
+            "has_older": len(messages) == page_size,
+            "last_id": last_id,
+            "subscription": subscribe(last_id),
+            "interval": Config.CHAT_POLL_MIN_SECONDS,
+            "next_poll": time.time() + Config.CHAT_POLL_MIN_SECONDS,
+        }
+        histories[room_key] = history
+    elif time.time() >= history["next_poll"]:
+        poll_chat_history(history)
+    
+    # Chat input
+    with st.form(f"chat_form_{room_key}", clear_on_submit=True):
+        col_chat1, col_chat2 = st.columns([5, 1])
+        with col_chat1:
+            message_text = st.text_input(
+                "Message", 
+                key=f"msg_input_{room_key}",
+                placeholder="Type your message...",
+                label_visibility="collapsed"
+            )
+        with col_chat2:
+            send_btn = st.form_submit_button("📤 Send", use_container_width=True)
+        
+        if send_btn and message_text:
+            result = send(message_text)
+            if result.get("queued"):
+                # Write-behind: the message shows up on the next tick once flushed
+                history["interval"] = Config.CHAT_POLL_MIN_SECONDS
+                history["next_poll"] = time.time()
+            elif result["success"]:
+                poll_chat_history(history)
+            else:
+                st.error(f"❌ {result['error']}")
+    
+    if history["has_older"]:
+        if st.button("⬆️ Load older messages", key=f"older_{room_key}"):
+            load_older_messages(history, load_page, page_size)
+    
+    if not history["messages"]:
+        st.info(empty_text)
+    else:
+        render_chat_messages(history["messages"])
+
 def login_signup_page():
     load_design_system()
     
@@ -865,6 +1089,7 @@ def login_signup_page():
                             st.session_state.user_contact = user["mobile_no"]
                             st.session_state.user_role = user["rrole"]
                             st.session_state.current_page = "events"
+                            start_session(user["user_ID"])
                             st.success("✅ Login successful!")
                             time.sleep(0.5)
                             st.rerun()
@@ -921,6 +1146,7 @@ def login_signup_page():
                             st.session_state.user_contact = contact
                             st.session_state.user_role = "participant"
                             st.session_state.current_page = "events"
+                            start_session(result["user_id"])
                             st.success("✅ Account created successfully! Redirecting...")
                             time.sleep(0.5)
                             st.rerun()
@@ -957,34 +1183,24 @@ def join_event_modal():
             found_event = db.get_event_by_code(event_code.upper())
             
             if found_event:
-                # Check if already joined
-                already_joined = db.check_user_joined_event(
-                    st.session_state.user_id,
-                    found_event["event_id"]
+                # Join event in database (a no-op if already joined)
+                result = db.join_event(
+                    user_id=st.session_state.user_id,
+                    event_id=found_event["event_id"],
+                    role=role.lower()
                 )
-                
-                if already_joined:
+
+                if not result["success"]:
+                    st.error(f"❌ {result['error']}")
+                elif not result["joined"]:
                     st.warning("⚠️ You have already joined this event!")
                 else:
-                    # Join event in database
-                    result = db.join_event(
-                        user_id=st.session_state.user_id,
-                        event_id=found_event["event_id"]
-                    )
-                    
-                    if result["success"]:
-                        # Update role in Joins table
-                        db.execute_query(
-                            "UPDATE joins SET user_role = %s WHERE user_id = %s AND event_id = %s",
-                            (role.lower(), st.session_state.user_id, found_event["event_id"])
-                        )
-                        
-                        st.success(f"✅ Successfully joined {found_event['title']} as {role}!")
-                        st.session_state.show_join_modal = False
-                        time.sleep(1)
-                        st.rerun()
-                    else:
-                        st.error(f"❌ {result['error']}")
+                    refresh_user_event_roles()
+
+                    st.success(f"✅ Successfully joined {found_event['title']} as {role}!")
+                    st.session_state.show_join_modal = False
+                    time.sleep(1)
+                    st.rerun()
             else:
                 st.error("❌ Event not found! Please check the event code.")
 
@@ -1039,68 +1255,70 @@ def create_event_page():
             
             db = init_database()
             
-            # Check if event code already exists
-            existing_event = db.get_event_by_code(event_code.upper())
-            if existing_event:
-                st.error("❌ Event code already exists! Please use a unique code.")
-                return
-            
-            # First, create or get organiser profile
-            organiser = db.get_organiser_by_user_id(st.session_state.user_id)
-            
-            if not organiser:
-                # Create organiser profile
-                org_result = db.create_organiser(
-                    organiser_name=st.session_state.user_name,
-                    phone_number=st.session_state.user_contact,
-                    email=st.session_state.user_email,
-                    post="Event Organiser",
-                    user_id=st.session_state.user_id
-                )
-                
-                if not org_result["success"]:
-                    st.error(f"❌ Error creating organiser profile: {org_result['error']}")
-                    return
-                
-                organiser_id = org_result["organiser_id"]
-            else:
-                organiser_id = organiser["organiser_id"]
-            
-            # Create event in database
-            result = db.create_event(
-                title=title,
-                category=category,
-                event_description=description,
-                start_date=start_date,
-                end_date=end_date,
-                start_time=dt_time(9, 0),  # Default start time
-                end_time=dt_time(17, 0),  # Default end time
-                event_status=status,
-                event_code=event_code.upper(),
-                organiser_id=organiser_id,
-                type_of_event="conference"
-            )
-            
-            if result["success"]:
-                event_id = result["event_id"]
-                
-                # Automatically join the event as admin
-                join_result = db.join_event(st.session_state.user_id, event_id)
-                
-                if join_result["success"]:
-                    # Set role to admin
-                    db.execute_query(
-                        "UPDATE joins SET user_role = %s WHERE user_id = %s AND event_id = %s",
-                        ("admin", st.session_state.user_id, event_id)
+            # One transaction: a failure at any step leaves no half-created event
+            try:
+                with db.transaction():
+                    # Check if event code already exists
+                    if db.get_event_by_code(event_code.upper()):
+                        raise TransactionRollback("Event code already exists! Please use a unique code.")
+
+                    # First, create or get organiser profile
+                    organiser = db.get_organiser_by_user_id(st.session_state.user_id)
+
+                    if not organiser:
+                        # Create organiser profile
+                        org_result = db.create_organiser(
+                            organiser_name=st.session_state.user_name,
+                            phone_number=st.session_state.user_contact,
+                            email=st.session_state.user_email,
+                            post="Event Organiser",
+                            user_id=st.session_state.user_id
+                        )
+
+                        if not org_result["success"]:
+                            raise TransactionRollback(f"Error creating organiser profile: {org_result['error']}")
+
+                        organiser_id = org_result["organiser_id"]
+                    else:
+                        organiser_id = organiser["organiser_id"]
+
+                    # Create event in database
+                    result = db.create_event(
+                        title=title,
+                        category=category,
+                        event_description=description,
+                        start_date=start_date,
+                        end_date=end_date,
+                        start_time=dt_time(9, 0),  # Default start time
+                        end_time=dt_time(17, 0),  # Default end time
+                        event_status=status,
+                        event_code=event_code.upper(),
+                        organiser_id=organiser_id,
+                        type_of_event="conference"
                     )
-                
-                st.success("✅ Event created successfully! You are the admin.")
-                time.sleep(1)
-                st.session_state.current_page = "events"
-                st.rerun()
-            else:
-                st.error(f"❌ Error creating event: {result['error']}")
 
+                    if not result["success"]:
+                        raise TransactionRollback(f"Error creating event: {result['error']}")
+
+                    event_id = result["event_id"]
+
+                    # Automatically join the event as admin
+                    join_result = db.join_event(st.session_state.user_id, event_id, role="admin")
+
+                    if not join_result["success"]:
+                        raise TransactionRollback(f"Error joining the event as admin: {join_result['error']}")
+            except TransactionRollback as e:
+                st.error(f"❌ {e}")
+                return
+
+            refresh_user_event_roles()
+
+            st.success("✅ Event created successfully! You are the admin.")
+            time.sleep(1)
+            st.session_state.current_page = "events"
+            st.rerun()
+
+@profiler.profiled
 def events_page():
     """Main events page with filtering"""
     load_design_system()
@@ -1185,12 +1403,32 @@ def events_page():
     # Get events from database based on filter
     db = init_database()
     
-    if filter_option == "All Events":
-        events = db.get_all_events()
-    elif filter_option == "My Events":
-        events = db.get_user_events(st.session_state.user_id)
-    else:
-        events = db.get_events_by_status(filter_option.lower())
+    status = None
+    only_joined = filter_option == "My Events"
+    if filter_option not in ("All Events", "My Events"):
+        status = filter_option.lower()
+    
+    # Keyset pagination: the session keeps only the cursor of every page
+    # loaded so far (starting over when the filter changes). The pages are
+    # read again on each rerun through the read cache, so counts and events
+    # created by others show up once the listing is invalidated or expires
+    if st.session_state.get("events_filter_loaded") != filter_option:
+        st.session_state.events_filter_loaded = filter_option
+        st.session_state.events_page_cursors = [None]
+    
+    # One cached query per page returns the events with their stats
+    events = []
+    next_cursor = None
+    for cursor in st.session_state.events_page_cursors:
+        page = db.get_events_page(
+            st.session_state.user_id,
+            status=status,
+            only_joined=only_joined,
+            after=cursor,
+            page_size=Config.EVENTS_PAGE_SIZE
+        )
+        events.extend(page["events"])
+        next_cursor = page["next_cursor"]
     
     # Display events
     if not events:
@@ -1204,24 +1442,19 @@ def events_page():
         return
     
     # Display event cards
+    user_event_roles = get_user_event_roles()
     for event in events:
         event_id = event["event_id"]
         
-        # Check if user is part of this event
-        is_member = db.check_user_joined_event(st.session_state.user_id, event_id)
+        # Membership and role from the session role map
+        is_member = event_id in user_event_roles
+        user_role = user_event_roles.get(event_id, "participant")
         
-        # Get user role for this event
-        user_role = "participant"
-        if is_member:
-            role_query = "SELECT user_role FROM joins WHERE user_id = %s AND event_id = %s"
-            role_result = db.fetch_query(role_query, (st.session_state.user_id, event_id))
-            if role_result:
-                user_role = role_result[0].get("user_role", "participant")
-        
-        # Get counts from database
-        announcements_count = len(db.get_event_announcements(event_id))
-        subevents_count = len(db.get_event_subevents(event_id))
-        messages_count = len(db.get_event_chat(event_id, limit=1000))
+        # Counts computed in SQL by the dashboard query
+        announcements_count = event["announcement_count"]
+        subevents_count = event["subevent_count"]
+        schedule_count = event["schedule_count"]
+        messages_count = event["message_count"]
         
         # Determine status class for accent bar
         status_class = f"event-card--{event['event_status']}"
@@ -1254,7 +1487,7 @@ def events_page():
             with col2:
                 st.metric("🎪 Subevents", subevents_count)
             with col3:
-                st.metric("📅 Schedule", 0)  # Will implement schedule later
+                st.metric("📅 Schedule", schedule_count)
             with col4:
                 st.metric("💬 Messages", messages_count)
             with col5:
@@ -1271,15 +1504,75 @@ def events_page():
         
         st.markdown('</div>', unsafe_allow_html=True)
         st.markdown("<div style='margin: 1.5rem 0;'></div>", unsafe_allow_html=True)
+    
+    # Load the next page on demand
+    if next_cursor is not None:
+        col_more1, col_more2, col_more3 = st.columns([2, 1, 2])
+        with col_more2:
+            if st.button("⬇️ Load more", use_container_width=True, key="load_more_events"):
+                st.session_state.events_page_cursors.append(next_cursor)
+                st.rerun()
 
+EVENT_CHAT_PAGE_SIZE = 20
+
+# Sections of the event details page; only the selected one is loaded and rendered
+SECTION_ANNOUNCEMENTS = "📢 Announcements"
+SECTION_SCHEDULE = "📅 Schedule"
+SECTION_SUBEVENTS = "🎪 Subevents"
+SECTION_CHAT = "💬 Event Chat"
+SECTION_PARTICIPANTS = "👥 Participants"
+SECTION_INFO = "ℹ️ General Info"
+EVENT_SECTIONS = [
+    SECTION_ANNOUNCEMENTS, SECTION_SCHEDULE, SECTION_SUBEVENTS,
+    SECTION_CHAT, SECTION_PARTICIPANTS, SECTION_INFO,
+]
+
+def load_event_details(db, event_id, section):
+    """Fetch what the details page needs for one section as a single bundle
+    
+    The event is always loaded; other reads only for the selected section.
+    They run concurrently, each on its own pooled connection, so the page
+    waits for the slowest query rather than the sum of all of them. The role
+    map and the first chat page are only fetched when the session doesn't
+    hold them yet.
+    """
+    calls = {"event": (db.get_event_by_id, (event_id,))}
+    if section == SECTION_ANNOUNCEMENTS:
+        calls["announcements"] = (db.get_event_announcements, (event_id,))
+    elif section == SECTION_SCHEDULE:
+        calls["schedules"] = (db.get_event_schedules, (event_id,))
+    elif section == SECTION_SUBEVENTS:
+        calls["subevents"] = (db.get_subevents_overview, (event_id, st.session_state.user_id))
+    elif section == SECTION_PARTICIPANTS:
+        calls["participants"] = (db.get_event_participants, (event_id,))
+    elif section == SECTION_CHAT and f"event_{event_id}" not in st.session_state.get("chat_histories", {}):
+        calls["chat"] = (db.get_event_chat, (event_id, EVENT_CHAT_PAGE_SIZE))
+    if st.session_state.get("user_event_roles") is None:
+        calls["roles"] = (db.get_user_event_roles, (st.session_state.user_id,))
+    
+    with profiler.section("prefetch"):
+        bundle = db.prefetch(calls)
+    if "roles" in bundle:
+        st.session_state.user_event_roles = bundle["roles"]
+    return bundle
+
+def toggle_subevent(subevent_id):
+    """Expand or collapse a subevent on the details page"""
+    expanded = st.session_state.setdefault("expanded_subevents", set())
+    expanded.symmetric_difference_update({subevent_id})
+
+@profiler.profiled
 def event_details_page():
     """Detailed event view with multiple sections"""
     event_id = st.session_state.get("current_event")
     
     db = init_database()
     
-    # Get event from database
-    event = db.get_event_by_id(event_id)
+    # The radio below keeps its value in session state, so the selected
+    # section is known before it is drawn
+    section = st.session_state.get("event_section", SECTION_ANNOUNCEMENTS)
+    details = load_event_details(db, event_id, section)
+    event = details["event"]
     
     if not event:
         st.error("Event not found!")
@@ -1308,527 +1601,445 @@ def event_details_page():
             st.metric("Organizer", event.get('organiser_name', 'Unknown'))
     
     # Get user role for this event
-    role_query = "SELECT user_role FROM joins WHERE user_id = %s AND event_id = %s"
-    role_result = db.fetch_query(role_query, (st.session_state.user_id, event_id))
-    user_role = role_result[0].get("user_role", "participant") if role_result else "participant"
-    
-    # Fetch related data
-    announcements = db.get_event_announcements(event_id)
-    
-    # Get schedules (with fallback for cached instances)
-    try:
-        schedules = db.get_event_schedules(event_id)
-    except AttributeError:
-        st.warning("⚠️ Schedule feature requires app restart. Please refresh the page or clear cache (press 'C' then 'Clear cache').")
-        schedules = []
-    
-    subevents = db.get_event_subevents(event_id)    
+    user_role = get_user_event_roles().get(event_id, "participant")
     
     # Display user role
     st.markdown(f"**Your Role:** {get_role_badge(user_role)}", unsafe_allow_html=True)
     st.divider()
     
-    # Tabs for different sections
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
-        "📢 Announcements", 
-        "📅 Schedule", 
-        "🎪 Subevents", 
-        "💬 Event Chat",
-        "👥 Participants",
-        "ℹ️ General Info"
-    ])
+    # Section picker: unlike st.tabs, hidden sections don't run at all
+    st.radio(
+        "Section",
+        EVENT_SECTIONS,
+        key="event_section",
+        horizontal=True,
+        label_visibility="collapsed"
+    )
     
     # Announcements Tab
-    with tab1:
-        st.header("📢 Announcements")
+    if section == SECTION_ANNOUNCEMENTS:
+        with profiler.section("Announcements tab"):
+            st.header("📢 Announcements")
         
-        # Add announcement - Only Admin can post
-        if check_permission(event_id, user_role, ["admin"]):
-            with st.expander("➕ Post New Announcement", expanded=False):
-                with st.form("add_announcement"):
-                    announcement_text = st.text_area("Announcement Message", placeholder="Share important updates with all participants...")
-                    announcement_file = st.file_uploader("📎 Attach Image/File (Optional)", 
-                                                       type=['png', 'jpg', 'jpeg', 'pdf', 'doc', 'docx'],
-                                                       key="announcement_file")
+            # Add announcement - Only Admin can post
+            if check_permission(event_id, user_role, ["admin"]):
+                with st.expander("➕ Post New Announcement", expanded=False):
+                    with st.form("add_announcement"):
+                        announcement_text = st.text_area("Announcement Message", placeholder="Share important updates with all participants...")
+                        announcement_file = st.file_uploader("📎 Attach Image/File (Optional)", 
+                                                           type=['png', 'jpg', 'jpeg', 'pdf', 'doc', 'docx'],
+                                                           key="announcement_file")
                     
-                    col_btn1, col_btn2 = st.columns([1, 4])
-                    with col_btn1:
-                        submitted = st.form_submit_button("📤 Post", use_container_width=True)
+                        col_btn1, col_btn2 = st.columns([1, 4])
+                        with col_btn1:
+                            submitted = st.form_submit_button("📤 Post", use_container_width=True)
                     
-                    if submitted and announcement_text:
-                        # Store file info if uploaded
-                        file_name = announcement_file.name if announcement_file else None
-                        file_type = announcement_file.type if announcement_file else None
+                        if submitted and announcement_text:
+                            # Store file info if uploaded
+                            file_name = announcement_file.name if announcement_file else None
+                            file_type = announcement_file.type if announcement_file else None
                         
-                        # Create announcement in database
-                        result = db.create_announcement(
-                            announcement_text=announcement_text,
-                            author_username=st.session_state.user_email,
-                            event_id=event_id,
-                            file_name=file_name,
-                            file_type=file_type
-                        )
+                            # Create announcement in database
+                            result = db.create_announcement(
+                                announcement_text=announcement_text,
+                                author_username=st.session_state.user_email,
+                                event_id=event_id,
+                                file_name=file_name,
+                                file_type=file_type
+                            )
                         
-                        if result["success"]:
-                            st.success("✅ Announcement posted successfully!")
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(f"❌ {result['error']}")
-        else:
-            st.info("ℹ️ Only Admin can post announcements.")
+                            if result["success"]:
+                                st.success("✅ Announcement posted successfully!")
+                                time.sleep(0.5)
+                                st.rerun()
+                            else:
+                                st.error(f"❌ {result['error']}")
+            else:
+                st.info("ℹ️ Only Admin can post announcements.")
         
-        st.divider()
+            st.divider()
         
-        # Display announcements from database
-        announcements = db.get_event_announcements(event_id)
+            announcements = details["announcements"]
         
-        if not announcements:
-            st.info("📭 No announcements yet.")
-        else:
-            for announcement in announcements:
-                with st.container():
-                    # Format timestamp
-                    timestamp = announcement['created_at'].strftime('%Y-%m-%d %H:%M') if hasattr(announcement['created_at'], 'strftime') else str(announcement['created_at'])[:16]
+            if not announcements:
+                st.info("📭 No announcements yet.")
+            else:
+                for announcement in announcements:
+                    with st.container():
+                        # Format timestamp
+                        timestamp = announcement['created_at'].strftime('%Y-%m-%d %H:%M') if hasattr(announcement['created_at'], 'strftime') else str(announcement['created_at'])[:16]
                     
-                    st.markdown(f"""
-                    <div class="announcement-box">
-                        <div style="display: flex; justify-content: space-between; align-items: center;">
-                            <div>
-                                <strong>👤 {announcement['author_username']}</strong>
+                        st.markdown(f"""
+                        <div class="announcement-box">
+                            <div style="display: flex; justify-content: space-between; align-items: center;">
+                                <div>
+                                    <strong>👤 {announcement['author_username']}</strong>
+                                </div>
+                                <small style="color: #8B92A8;">🕒 {timestamp}</small>
                             </div>
-                            <small style="color: #8B92A8;">🕒 {timestamp}</small>
+                            <p style="margin-top: 0.8rem; font-size: 1.05rem;">{announcement['announcement_text']}</p>
                         </div>
-                        <p style="margin-top: 0.8rem; font-size: 1.05rem;">{announcement['announcement_text']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                        """, unsafe_allow_html=True)
                     
-                    if announcement.get('file_name'):
-                        st.info(f"📎 Attachment: **{announcement['file_name']}**")
+                        if announcement.get('file_name'):
+                            st.info(f"📎 Attachment: **{announcement['file_name']}**")
                     
-                    st.write("")
+                        st.write("")
     
     # Schedule Tab
-    with tab2:
-        st.header("📅 Event Schedule")
+    if section == SECTION_SCHEDULE:
+        with profiler.section("Schedule tab"):
+            st.header("📅 Event Schedule")
         
-        # Add schedule item - Only Admin and Core can add
-        if check_permission(event_id, user_role, ["admin", "core"]):
-            with st.expander("➕ Add Schedule Item", expanded=False):
-                with st.form("add_schedule"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        schedule_date = st.date_input("📅 Date")
-                    with col2:
-                        schedule_time = st.time_input("🕐 Time")
+            # Add schedule item - Only Admin and Core can add
+            if check_permission(event_id, user_role, ["admin", "core"]):
+                with st.expander("➕ Add Schedule Item", expanded=False):
+                    with st.form("add_schedule"):
+                        col1, col2 = st.columns(2)
+                        with col1:
+                            schedule_date = st.date_input("📅 Date")
+                        with col2:
+                            schedule_time = st.time_input("🕐 Time")
                     
-                    schedule_title = st.text_input("📌 Activity Title", placeholder="e.g., Opening Ceremony, Workshop Session")
-                    schedule_desc = st.text_area("📝 Description", placeholder="Provide details about this activity...")
-                    schedule_location = st.text_input("📍 Location (Optional)", placeholder="e.g., Main Hall, Room 101")
+                        schedule_title = st.text_input("📌 Activity Title", placeholder="e.g., Opening Ceremony, Workshop Session")
+                        schedule_desc = st.text_area("📝 Description", placeholder="Provide details about this activity...")
+                        schedule_location = st.text_input("📍 Location (Optional)", placeholder="e.g., Main Hall, Room 101")
                     
-                    col_btn1, col_btn2 = st.columns([1, 4])
-                    with col_btn1:
-                        submitted = st.form_submit_button("➕ Add", use_container_width=True)
+                        col_btn1, col_btn2 = st.columns([1, 4])
+                        with col_btn1:
+                            submitted = st.form_submit_button("➕ Add", use_container_width=True)
                     
-                    if submitted and schedule_title:
-                        result = db.add_schedule(
-                            event_id=event_id,
-                            title=schedule_title,
-                            description=schedule_desc,
-                            schedule_date=schedule_date,
-                            schedule_time=schedule_time,
-                            location=schedule_location,
-                            added_by_user_id=st.session_state.user_id
-                        )
+                        if submitted and schedule_title:
+                            result = db.add_schedule(
+                                event_id=event_id,
+                                title=schedule_title,
+                                description=schedule_desc,
+                                schedule_date=schedule_date,
+                                schedule_time=schedule_time,
+                                location=schedule_location,
+                                added_by_user_id=st.session_state.user_id
+                            )
                         
-                        if result["success"]:
-                            st.success("✅ Schedule item added!")
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(f"❌ Error adding schedule: {result['error']}")
-        else:
-            st.info("ℹ️ Only Admin and Core members can add schedule items.")
+                            if result["success"]:
+                                st.success("✅ Schedule item added!")
+                                time.sleep(0.5)
+                                st.rerun()
+                            else:
+                                st.error(f"❌ Error adding schedule: {result['error']}")
+            else:
+                st.info("ℹ️ Only Admin and Core members can add schedule items.")
         
-        st.divider()
+            st.divider()
         
-        # Display schedule
-        if not schedules:
-            st.info("📭 No schedule items yet.")
-        else:
-            for idx, schedule in enumerate(schedules):
-                st.markdown(f"""
-                <div class="schedule-item">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <h3 style="margin: 0; color: #FFB84D;">📌 {schedule['title']}</h3>
-                        <span style="background: linear-gradient(135deg, #FF6B6B 0%, #FFB84D 100%); color: white; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.9rem;">
-                            🕐 {schedule['datetime']}
-                        </span>
+            # Display schedule
+            schedules = details["schedules"]
+            if not schedules:
+                st.info("📭 No schedule items yet.")
+            else:
+                for idx, schedule in enumerate(schedules):
+                    st.markdown(f"""
+                    <div class="schedule-item">
+                        <div style="display: flex; justify-content: space-between; align-items: center;">
+                            <h3 style="margin: 0; color: #FFB84D;">📌 {schedule['title']}</h3>
+                            <span style="background: linear-gradient(135deg, #FF6B6B 0%, #FFB84D 100%); color: white; padding: 0.3rem 0.8rem; border-radius: 15px; font-size: 0.9rem;">
+                                🕐 {schedule['datetime']}
+                            </span>
+                        </div>
+                        <p style="margin-top: 0.8rem; color: #2D3142;">{schedule['description']}</p>
+                        {f'<p style="margin-top: 0.5rem;"><strong>📍 Location:</strong> {schedule.get("location", "TBA")}</p>' if schedule.get("location") else ''}
+                        <small style="color: #8B92A8;">Added by: {schedule['added_by']}</small>
                     </div>
-                    <p style="margin-top: 0.8rem; color: #2D3142;">{schedule['description']}</p>
-                    {f'<p style="margin-top: 0.5rem;"><strong>📍 Location:</strong> {schedule.get("location", "TBA")}</p>' if schedule.get("location") else ''}
-                    <small style="color: #8B92A8;">Added by: {schedule['added_by']}</small>
-                </div>
-                """, unsafe_allow_html=True)
+                    """, unsafe_allow_html=True)
                 
-                if idx < len(schedules) - 1:
-                    st.write("")
+                    if idx < len(schedules) - 1:
+                        st.write("")
     
     # Subevents Tab
-    with tab3:
-        st.header("🎪 Subevents")
+    if section == SECTION_SUBEVENTS:
+        with profiler.section("Subevents tab"):
+            st.header("🎪 Subevents")
         
-        # Create subevent - Only Admin and Core can create
-        if check_permission(event_id, user_role, ["admin", "core"]):
-            with st.expander("➕ Create New Subevent", expanded=False):
-                with st.form("create_subevent"):
-                    subevent_name = st.text_input("🎪 Subevent Name", placeholder="e.g., AI Workshop, Networking Session")
-                    subevent_desc = st.text_area("📝 Description", placeholder="Describe this subevent...")
-                    subevent_capacity = st.number_input("👥 Max Participants (Optional)", min_value=0, value=0, step=1)
+            # Create subevent - Only Admin and Core can create
+            if check_permission(event_id, user_role, ["admin", "core"]):
+                with st.expander("➕ Create New Subevent", expanded=False):
+                    with st.form("create_subevent"):
+                        subevent_name = st.text_input("🎪 Subevent Name", placeholder="e.g., AI Workshop, Networking Session")
+                        subevent_desc = st.text_area("📝 Description", placeholder="Describe this subevent...")
+                        subevent_capacity = st.number_input("👥 Max Participants (Optional)", min_value=0, value=0, step=1)
                     
-                    col_btn1, col_btn2 = st.columns([1, 4])
-                    with col_btn1:
-                        submitted = st.form_submit_button("➕ Create", use_container_width=True)
+                        col_btn1, col_btn2 = st.columns([1, 4])
+                        with col_btn1:
+                            submitted = st.form_submit_button("➕ Create", use_container_width=True)
                     
-                    if submitted and subevent_name:
-                        # Create subevent in database
-                        result = db.create_subevent(
-                            sub_event_name=subevent_name,
-                            description=subevent_desc,
-                            event_id=event_id,
-                            venue_id=None
-                        )
+                        if submitted and subevent_name:
+                            # Create subevent in database
+                            result = db.create_subevent(
+                                sub_event_name=subevent_name,
+                                description=subevent_desc,
+                                event_id=event_id,
+                                venue_id=None,
+                                capacity=subevent_capacity or None
+                            )
                         
-                        if result["success"]:
-                            # Update capacity if specified
-                            if subevent_capacity > 0:
-                                db.execute_query(
-                                    "UPDATE Sub_events SET capacity = %s WHERE sub_event_id = %s",
-                                    (subevent_capacity, result["sub_event_id"])
-                                )
-                            
-                            st.success("✅ Subevent created!")
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(f"❌ {result['error']}")
-        else:
-            st.info("ℹ️ Only Admin and Core members can create subevents.")
+                            if result["success"]:
+                                st.success("✅ Subevent created!")
+                                time.sleep(0.5)
+                                st.rerun()
+                            else:
+                                st.error(f"❌ {result['error']}")
+            else:
+                st.info("ℹ️ Only Admin and Core members can create subevents.")
         
-        st.divider()
+            st.divider()
         
-        # Display subevents from database
-        subevents = db.get_event_subevents(event_id)
+            subevents = details["subevents"]
         
-        if not subevents:
-            st.info("📭 No subevents created yet.")
-        else:
-            for subevent in subevents:
-                subevent_id = subevent["sub_event_id"]
-                subevent_name = subevent["sub_event_name"]
+            if not subevents:
+                st.info("📭 No subevents created yet.")
+            else:
+                for subevent in subevents:
+                    subevent_id = subevent["sub_event_id"]
+                    subevent_name = subevent["sub_event_name"]
                 
-                # Check if user is registered for this subevent
-                is_registered = db.check_subevent_registration(st.session_state.user_id, subevent_id)
-                participants_count = db.get_subevent_participants_count(subevent_id)
+                    # Collapsed subevents render just their header; the chat is
+                    # only loaded once the user expands one
+                    is_open = subevent_id in st.session_state.get("expanded_subevents", set())
+                    st.button(
+                        f"{'▼' if is_open else '▶'} 🎪 {subevent_name}",
+                        key=f"toggle_subevent_{subevent_id}",
+                        on_click=toggle_subevent,
+                        args=(subevent_id,),
+                        use_container_width=True
+                    )
+                    if not is_open:
+                        continue
+                
+                    # Registration and counts come with the overview query
+                    is_registered = subevent["is_registered"]
+                    participants_count = subevent["participants_count"]
                 
-                with st.expander(f"🎪 {subevent_name}", expanded=False):
-                    col_sub1, col_sub2 = st.columns([3, 1])
+                    with st.container(border=True):
+                        col_sub1, col_sub2 = st.columns([3, 1])
                     
-                    with col_sub1:
-                        st.write(f"**Description:** {subevent['decription']}")  # Note: typo in schema
-                        created_at = subevent.get('created_at', '')
-                        if created_at:
-                            timestamp = created_at.strftime('%Y-%m-%d') if hasattr(created_at, 'strftime') else str(created_at)[:10]
-                            st.caption(f"Created on: {timestamp}")
+                        with col_sub1:
+                            st.write(f"**Description:** {subevent['decription']}")  # Note: typo in schema
+                            created_at = subevent.get('created_at', '')
+                            if created_at:
+                                timestamp = created_at.strftime('%Y-%m-%d') if hasattr(created_at, 'strftime') else str(created_at)[:10]
+                                st.caption(f"Created on: {timestamp}")
                         
-                        # Show capacity and participant info
-                        capacity = subevent.get("capacity")
-                        if capacity:
-                            st.write(f"👥 Participants: {participants_count}/{capacity}")
-                            if participants_count >= capacity:
-                                st.warning("⚠️ This subevent is full")
-                        else:
-                            st.write(f"👥 Participants: {participants_count}")
+                            # Show capacity and participant info
+                            capacity = subevent.get("capacity")
+                            if capacity:
+                                st.write(f"👥 Participants: {participants_count}/{capacity}")
+                                if participants_count >= capacity:
+                                    st.warning(f"⚠️ This subevent is full ({subevent['waitlist_count']} on the waitlist)")
+                            else:
+                                st.write(f"👥 Participants: {participants_count}")
+                            if subevent["is_waitlisted"]:
+                                st.info("⏳ You're on the waitlist and will be added when a place frees up")
                     
-                    with col_sub2:
-                        st.write("")
-                        # Join/Leave button
-                        if is_registered:
-                            if st.button("🚪 Leave", key=f"leave_{subevent_id}", use_container_width=True):
-                                result = db.leave_subevent(st.session_state.user_id, subevent_id)
-                                if result["success"]:
-                                    st.success("✅ Left subevent")
-                                    time.sleep(0.5)
-                                    st.rerun()
-                                else:
-                                    st.error(f"❌ {result['error']}")
-                        else:
-                            # Check capacity before allowing join
-                            can_join = True
-                            if capacity and participants_count >= capacity:
-                                can_join = False
-                            
-                            if can_join:
-                                if st.button("✅ Join", key=f"join_{subevent_id}", use_container_width=True):
-                                    result = db.join_subevent(st.session_state.user_id, subevent_id)
+                        with col_sub2:
+                            st.write("")
+                            # Join/Leave button; capacity is enforced by join_subevent
+                            if is_registered or subevent["is_waitlisted"]:
+                                leave_label = "🚪 Leave" if is_registered else "🚪 Leave waitlist"
+                                if st.button(leave_label, key=f"leave_{subevent_id}", use_container_width=True):
+                                    result = db.leave_subevent(st.session_state.user_id, subevent_id)
                                     if result["success"]:
-                                        st.success("✅ Joined subevent!")
+                                        st.success("✅ Left subevent" if is_registered else "✅ Left waitlist")
                                         time.sleep(0.5)
                                         st.rerun()
                                     else:
                                         st.error(f"❌ {result['error']}")
                             else:
-                                st.button("❌ Full", key=f"full_{subevent_id}", disabled=True, use_container_width=True)
+                                is_full = capacity and participants_count >= capacity
+                                join_label = "⏳ Join waitlist" if is_full else "✅ Join"
+                                if st.button(join_label, key=f"join_{subevent_id}", use_container_width=True):
+                                    result = db.join_subevent(st.session_state.user_id, subevent_id)
+                                    if not result["success"]:
+                                        st.error(f"❌ {result['error']}")
+                                    else:
+                                        if result["status"] == "joined":
+                                            st.success("✅ Joined subevent!")
+                                        else:
+                                            st.info(f"⏳ Subevent is full - you're #{result['position']} on the waitlist")
+                                        time.sleep(0.5)
+                                        st.rerun()
                     
-                    st.divider()
+                        st.divider()
                     
-                    # Subevent chat - Only for registered participants
-                    st.subheader("💬 Subevent Chat")
+                        # Subevent chat - Only for registered participants
+                        st.subheader("💬 Subevent Chat")
                     
-                    if not is_registered:
-                        st.info("ℹ️ Join this subevent to access the chat")
-                    else:
-                        # Chat input
-                        with st.form(f"chat_form_{subevent_id}"):
-                            col_chat1, col_chat2 = st.columns([5, 1])
-                            with col_chat1:
-                                message_text = st.text_input(
-                                    "Message", 
-                                    key=f"msg_input_{subevent_id}",
-                                    placeholder="Type your message...",
-                                    label_visibility="collapsed"
-                                )
-                            with col_chat2:
-                                send_btn = st.form_submit_button("📤 Send", use_container_width=True)
-                            
-                            if send_btn and message_text:
-                                # Send message to database
-                                result = db.send_message(
+                        if not is_registered:
+                            st.info("ℹ️ Join this subevent to access the chat")
+                        else:
+                            # Live chat fragment: polls only for messages newer than the last seen
+                            chat_room(
+                                f"subevent_{subevent_id}",
+                                load_page=lambda before_id, limit, sid=subevent_id: db.get_subevent_chat(
+                                    event_id, sid, limit=limit, before_id=before_id
+                                ),
+                                subscribe=lambda after_id, sid=subevent_id: db.subscribe_chat(
+                                    event_id, sid, after_id
+                                ),
+                                send=lambda text, sid=subevent_id, name=subevent_name: db.send_message(
                                     event_id=event_id,
                                     sender_username=st.session_state.user_email,
-                                    chat_message_text=message_text,
-                                    subevent_name=subevent_name,
-                                    idx_subevent_chat=1
-                                )
-                                
-                                if result["success"]:
-                                    st.rerun()
-                        
-                        # Display messages from database
-                        messages = db.get_subevent_chat(event_id, subevent_name, limit=10)
-                        
-                        if not messages:
-                            st.info("No messages yet. Start the conversation!")
-                        else:
-                            for message in messages:
-                                is_my_message = message["sender_username"] == st.session_state.user_email
-                                timestamp = message['created_at'].strftime('%H:%M') if hasattr(message['created_at'], 'strftime') else str(message['created_at'])[11:16]
-                                
-                                if is_my_message:
-                                    col_space, col_msg = st.columns([1, 4])
-                                    with col_msg:
-                                        st.markdown(f"""
-                                        <div class="message-bubble message-bubble--sent">
-                                            <strong>You</strong><br>
-                                            {message['chat_message_text']}<br>
-                                            <div class="message-bubble__time">{timestamp}</div>
-                                        </div>
-                                        """, unsafe_allow_html=True)
-                                else:
-                                    col_msg, col_space = st.columns([4, 1])
-                                    with col_msg:
-                                        st.markdown(f"""
-                                        <div class="message-bubble message-bubble--received">
-                                            <strong>{message['sender_username']}</strong><br>
-                                            {message['chat_message_text']}<br>
-                                            <div class="message-bubble__time">{timestamp}</div>
-                                        </div>
-                                        """, unsafe_allow_html=True)
+                                    chat_message_text=text,
+                                    subevent_name=name,
+                                    idx_subevent_chat=1,
+                                    sub_event_id=sid
+                                ),
+                                page_size=10,
+                                empty_text="No messages yet. Start the conversation!"
+                            )
     
     # Event Chat Tab
-    with tab4:
-        st.header("💬 Event Chat")
-        st.caption("General discussion for all event participants")
+    if section == SECTION_CHAT:
+        with profiler.section("Event Chat tab"):
+            st.header("💬 Event Chat")
+            st.caption("General discussion for all event participants")
         
-        # Chat input
-        with st.form("main_chat_form"):
-            col_chat1, col_chat2 = st.columns([5, 1])
-            with col_chat1:
-                message_text = st.text_input(
-                    "Message", 
-                    key="main_chat_input",
-                    placeholder="Type your message...",
-                    label_visibility="collapsed"
-                )
-            with col_chat2:
-                send_btn = st.form_submit_button("📤 Send", use_container_width=True)
-            
-            if send_btn and message_text:
-                # Send message to database
-                result = db.send_message(
+            # Live chat fragment: polls only for messages newer than the last seen
+            chat_room(
+                f"event_{event_id}",
+                load_page=lambda before_id, limit: db.get_event_chat(event_id, limit=limit, before_id=before_id),
+                subscribe=lambda after_id: db.subscribe_chat(event_id, None, after_id),
+                send=lambda text: db.send_message(
                     event_id=event_id,
                     sender_username=st.session_state.user_email,
-                    chat_message_text=message_text,
+                    chat_message_text=text,
                     subevent_name="",  # Empty for main event chat
                     idx_event_chat=1
-                )
-                
-                if result["success"]:
-                    st.rerun()
-        
-        st.divider()
-        
-        # Display messages from database
-        messages = db.get_event_chat(event_id, limit=20)
-        
-        if not messages:
-            st.info("💬 No messages yet. Start the conversation!")
-        else:
-            for message in messages:
-                is_my_message = message["sender_username"] == st.session_state.user_email
-                timestamp = message['created_at'].strftime('%H:%M') if hasattr(message['created_at'], 'strftime') else str(message['created_at'])[11:16]
-                
-                if is_my_message:
-                    col_space, col_msg = st.columns([1, 4])
-                    with col_msg:
-                        st.markdown(f"""
-                        <div class="message-bubble message-bubble--sent">
-                            <strong>You</strong><br>
-                            {message['chat_message_text']}<br>
-                            <div class="message-bubble__time">{timestamp}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-                else:
-                    col_msg, col_space = st.columns([4, 1])
-                    with col_msg:
-                        st.markdown(f"""
-                        <div class="message-bubble message-bubble--received">
-                            <strong>{message['sender_username']}</strong><br>
-                            {message['chat_message_text']}<br>
-                            <div class="message-bubble__time">{timestamp}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                ),
+                page_size=EVENT_CHAT_PAGE_SIZE,
+                empty_text="💬 No messages yet. Start the conversation!",
+                first_page=details.get("chat")
+            )
     
     # Participants Tab
-    with tab5:
-        st.header("👥 Event Participants")
-        st.caption("All members of this event organized by role")
+    if section == SECTION_PARTICIPANTS:
+        with profiler.section("Participants tab"):
+            st.header("👥 Event Participants")
+            st.caption("All members of this event organized by role")
         
-        # Get all participants
-        participants = db.get_event_participants(event_id)
+            participants = details["participants"]
         
-        if not participants:
-            st.info("📭 No participants yet.")
-        else:
-            # Group participants by role
-            admins = [p for p in participants if p['user_role'] == 'admin']
-            cores = [p for p in participants if p['user_role'] == 'core']
-            regular_participants = [p for p in participants if p['user_role'] == 'participant']
+            if not participants:
+                st.info("📭 No participants yet.")
+            else:
+                # Group participants by role
+                admins = [p for p in participants if p['user_role'] == 'admin']
+                cores = [p for p in participants if p['user_role'] == 'core']
+                regular_participants = [p for p in participants if p['user_role'] == 'participant']
             
-            # Display summary metrics
-            col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(4)
-            with col_metric1:
-                st.metric("Total Members", len(participants))
-            with col_metric2:
-                st.metric("Admins", len(admins))
-            with col_metric3:
-                st.metric("Core Team", len(cores))
-            with col_metric4:
-                st.metric("Participants", len(regular_participants))
+                # Display summary metrics
+                col_metric1, col_metric2, col_metric3, col_metric4 = st.columns(4)
+                with col_metric1:
+                    st.metric("Total Members", len(participants))
+                with col_metric2:
+                    st.metric("Admins", len(admins))
+                with col_metric3:
+                    st.metric("Core Team", len(cores))
+                with col_metric4:
+                    st.metric("Participants", len(regular_participants))
             
-            st.divider()
+                st.divider()
             
-            # Display Admins
-            if admins:
-                st.subheader("🔴 Admins")
-                for admin in admins:
-                    col_info, col_badge = st.columns([4, 1])
-                    with col_info:
-                        st.markdown(f"""
-                        <div style="background: #FFF8F3; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #FF6B6B;">
-                            <strong style="font-size: 1.1rem;">{admin['first_name']} {admin['last_name']}</strong><br>
-                            <span style="color: #5A6175;">📧 {admin['username']}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    with col_badge:
-                        st.markdown(get_role_badge('admin'), unsafe_allow_html=True)
+                # Display Admins
+                if admins:
+                    st.subheader("🔴 Admins")
+                    for admin in admins:
+                        col_info, col_badge = st.columns([4, 1])
+                        with col_info:
+                            st.markdown(f"""
+                            <div style="background: #FFF8F3; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #FF6B6B;">
+                                <strong style="font-size: 1.1rem;">{admin['first_name']} {admin['last_name']}</strong><br>
+                                <span style="color: #5A6175;">📧 {admin['username']}</span>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        with col_badge:
+                            st.markdown(get_role_badge('admin'), unsafe_allow_html=True)
                 
-                st.divider()
+                    st.divider()
             
-            # Display Core Team
-            if cores:
-                st.subheader("🟠 Core Team")
-                for core in cores:
-                    col_info, col_badge = st.columns([4, 1])
-                    with col_info:
-                        st.markdown(f"""
-                        <div style="background: #FFF8F3; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #FFB84D;">
-                            <strong style="font-size: 1.1rem;">{core['first_name']} {core['last_name']}</strong><br>
-                            <span style="color: #5A6175;">📧 {core['username']}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    with col_badge:
-                        st.markdown(get_role_badge('core'), unsafe_allow_html=True)
+                # Display Core Team
+                if cores:
+                    st.subheader("🟠 Core Team")
+                    for core in cores:
+                        col_info, col_badge = st.columns([4, 1])
+                        with col_info:
+                            st.markdown(f"""
+                            <div style="background: #FFF8F3; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #FFB84D;">
+                                <strong style="font-size: 1.1rem;">{core['first_name']} {core['last_name']}</strong><br>
+                                <span style="color: #5A6175;">📧 {core['username']}</span>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        with col_badge:
+                            st.markdown(get_role_badge('core'), unsafe_allow_html=True)
                 
-                st.divider()
+                    st.divider()
             
-            # Display Participants
-            if regular_participants:
-                st.subheader("🟢 Participants")
-                for participant in regular_participants:
-                    col_info, col_badge = st.columns([4, 1])
-                    with col_info:
-                        st.markdown(f"""
-                        <div style="background: #FFF8F3; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #4ECDC4;">
-                            <strong style="font-size: 1.1rem;">{participant['first_name']} {participant['last_name']}</strong><br>
-                            <span style="color: #5A6175;">📧 {participant['username']}</span>
-                        </div>
-                        """, unsafe_allow_html=True)
-                    with col_badge:
-                        st.markdown(get_role_badge('participant'), unsafe_allow_html=True)
+                # Display Participants
+                if regular_participants:
+                    st.subheader("🟢 Participants")
+                    for participant in regular_participants:
+                        col_info, col_badge = st.columns([4, 1])
+                        with col_info:
+                            st.markdown(f"""
+                            <div style="background: #FFF8F3; padding: 1rem; border-radius: 8px; margin-bottom: 0.5rem; border-left: 4px solid #4ECDC4;">
+                                <strong style="font-size: 1.1rem;">{participant['first_name']} {participant['last_name']}</strong><br>
+                                <span style="color: #5A6175;">📧 {participant['username']}</span>
+                            </div>
+                            """, unsafe_allow_html=True)
+                        with col_badge:
+                            st.markdown(get_role_badge('participant'), unsafe_allow_html=True)
     
     # General Info Tab
-    with tab6:
-        st.header("ℹ️ General Information")
+    if section == SECTION_INFO:
+        with profiler.section("General Info tab"):
+            st.header("ℹ️ General Information")
         
-        # Note: General info editing would require adding a field to Eventz table
-        # For now, just display event details
+            # Note: General info editing would require adding a field to Eventz table
+            # For now, just display event details
         
-        st.divider()
+            st.divider()
         
-        # Event Details Section
-        st.subheader("📋 Event Details")
+            # Event Details Section
+            st.subheader("📋 Event Details")
         
-        col_detail1, col_detail2 = st.columns(2)
-        with col_detail1:
-            st.write(f"**🎫 Event Code:** `{event['event_code']}`")
-            st.write(f"**📅 Start Date:** {event['start_date']}")
-            st.write(f"**🕐 Start Time:** {event.get('start_time', 'TBA')}")
-            st.write(f"**👤 Organizer:** {event.get('organiser_name', 'Unknown')}")
+            col_detail1, col_detail2 = st.columns(2)
+            with col_detail1:
+                st.write(f"**🎫 Event Code:** `{event['event_code']}`")
+                st.write(f"**📅 Start Date:** {event['start_date']}")
+                st.write(f"**🕐 Start Time:** {event.get('start_time', 'TBA')}")
+                st.write(f"**👤 Organizer:** {event.get('organiser_name', 'Unknown')}")
         
-        with col_detail2:
-            st.write(f"**🏷️ Status:** {event['event_status'].title()}")
-            st.write(f"**📅 End Date:** {event['end_date']}")
-            st.write(f"**🕐 End Time:** {event.get('end_time', 'TBA')}")
-            st.write(f"**🎯 Event ID:** {event['event_id']}")
+            with col_detail2:
+                st.write(f"**🏷️ Status:** {event['event_status'].title()}")
+                st.write(f"**📅 End Date:** {event['end_date']}")
+                st.write(f"**🕐 End Time:** {event.get('end_time', 'TBA')}")
+                st.write(f"**🎯 Event ID:** {event['event_id']}")
         
-        st.divider()
+            st.divider()
         
-        # Event Description
-        st.subheader("📝 Description")
-        st.markdown(f"""
-        <div style="background: #FFF8F3; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #FFB84D;">
-            <p style="font-size: 1.05rem; line-height: 1.6; color: #2D3142;">{event['event_description']}</p>
-        </div>
-        """, unsafe_allow_html=True)
+            # Event Description
+            st.subheader("📝 Description")
+            st.markdown(f"""
+            <div style="background: #FFF8F3; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #FFB84D;">
+                <p style="font-size: 1.05rem; line-height: 1.6; color: #2D3142;">{event['event_description']}</p>
+            </div>
+            """, unsafe_allow_html=True)
         
-        # Category and Type
-        st.divider()
-        col_cat1, col_cat2 = st.columns(2)
-        with col_cat1:
-            st.metric("📂 Category", event.get('category', 'General'))
-        with col_cat2:
-            st.metric("🎭 Type", event.get('type_of_event', 'Conference'))
+            # Category and Type
+            st.divider()
+            col_cat1, col_cat2 = st.columns(2)
+            with col_cat1:
+                st.metric("📂 Category", event.get('category', 'General'))
+            with col_cat2:
+                st.metric("🎭 Type", event.get('type_of_event', 'Conference'))
 
 def main():
     """Main application logic"""
@@ -1836,12 +2047,14 @@ def main():
     # Initialize session state
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
+        # A refresh starts a new session; sign back in from the URL's token
+        restore_session()
     
     if "current_page" not in st.session_state:
         st.session_state.current_page = "login"
     
     if "user_event_roles" not in st.session_state:
-        st.session_state.user_event_roles = {}
+        st.session_state.user_event_roles = None  # Loaded on first lookup
     
     if "user_events" not in st.session_state:
         st.session_state.user_events = []
@@ -1864,8 +2077,7 @@ def main():
         
         with header_col2:
             st.markdown("<div style='padding-top: 0.8rem;'></div>", unsafe_allow_html=True)
-            db = init_database()
-            my_events_count = len(db.get_user_events(st.session_state.user_id))
+            my_events_count = len(get_user_event_roles())
             st.metric("My Events", my_events_count)
         
         with header_col3:
@@ -1877,6 +2089,9 @@ def main():
         with header_col4:
             st.markdown("<div style='padding-top: 0.8rem;'></div>", unsafe_allow_html=True)
             if st.button("🚪 Logout", use_container_width=True):
+                if st.session_state.get("session_token"):
+                    get_sessions().revoke(st.session_state.session_token)
+                st.query_params.clear()
                 # Clear session state
                 for key in list(st.session_state.keys()):
                     del st.session_state[key]
@@ -1884,13 +2099,20 @@ def main():
         
         st.divider()
         
+        save_session_state()
+        
         # Show appropriate page
         if st.session_state.current_page == "events":
-            events_page()
+            run_page(events_page)
         elif st.session_state.current_page == "create_event":
             create_event_page()
         elif st.session_state.current_page == "event_details":
-            event_details_page()
+            run_page(event_details_page)
 
 if __name__ == "__main__":
-    main()
+    # Opt-in sampling profiler (PROFILE_SAMPLE_RATE); no-op when not sampled
+    with profiler.rerun(f"rerun:{st.session_state.get('current_page', 'login')}",
+                        Config.PROFILE_SAMPLE_RATE, Config.PROFILE_DIR):
+        # Identical reads within this rerun hit the database once
+        with init_database().memo.scope():
+            main()
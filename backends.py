@@ -0,0 +1,282 @@
+"""
+Storage Backends for Event Contact System
+DatabaseHelper talks to a backend for connections, pools and the few things
+that differ between databases. MySQL is the default; SQLite runs in-process
+"""
+
+from contextlib import contextmanager
+from datetime import date, datetime, time
+import functools
+import os
+import queue
+import re
+import sqlite3
+import threading
+
+from config import Config
+
+from migrate import LOCK_NAME, LOCK_TIMEOUT, MIGRATIONS_DIR
+
+try:
+    import mysql.connector as con
+    from mysql.connector import pooling
+except ImportError:  # Only the SQLite backend is usable
+    con = None
+    pooling = None
+
+
+class PoolError(Exception):
+    """No pooled connection became available in time"""
+
+
+# ==================== MYSQL ====================
+
+class MySQLBackend:
+    name = "mysql"
+    migrations_dir = MIGRATIONS_DIR
+
+    IntegrityError = con.IntegrityError if con is not None else sqlite3.IntegrityError
+    PoolError = pooling.PoolError if pooling is not None else PoolError
+
+    def __init__(self, host=None, port=None, user=None, password=None, database=None):
+        self.config = {
+            "host": host or Config.DB_HOST,
+            "user": user or Config.DB_USER,
+            "password": password or Config.DB_PASSWORD,
+            "port": port or Config.DB_PORT,
+            "database": database or Config.DB_NAME,
+            "autocommit": True,  # Plain reads see the latest commit; see DatabaseHelper.transaction
+        }
+
+    def _require_driver(self):
+        if con is None:
+            raise RuntimeError("mysql-connector-python is not installed (or set DB_BACKEND=sqlite)")
+
+    def connect(self):
+        self._require_driver()
+        return con.connect(**self.config)
+
+    def create_pool(self, size):
+        self._require_driver()
+        return pooling.MySQLConnectionPool(pool_name="event_pool", pool_size=size, **self.config)
+
+    @contextmanager
+    def migration_lock(self, cursor):
+        """Hold a named lock so concurrent app processes migrate only once"""
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS acquired", (LOCK_NAME, LOCK_TIMEOUT))
+        if not cursor.fetchone()["acquired"]:
+            raise RuntimeError("Timed out waiting for another process to finish migrating")
+        try:
+            yield
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s) AS released", (LOCK_NAME,))
+            cursor.fetchone()
+
+    def is_duplicate_key(self, error):
+        """True if an IntegrityError is a UNIQUE/PRIMARY KEY clash (not e.g. a foreign key)"""
+        return getattr(error, "errno", None) == 1062
+
+    def full_scans(self, cursor, query, params):
+        """Tables the query plan reads in full (EXPLAIN type ALL)"""
+        cursor.execute("EXPLAIN " + query, params)
+        return [row.get("table") for row in cursor.fetchall() if row.get("type") == "ALL"]
+
+
+# ==================== SQLITE ====================
+
+# MySQL spellings used by DatabaseHelper and the tools, rewritten for SQLite
+_REWRITES = [
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bRAND\(\)", re.I), "RANDOM()"),
+    (re.compile(r"\bNOW\(\)", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    (re.compile(r"^\s*SHOW\s+TABLES\s*$", re.I),
+     "SELECT name AS Tables_in_event FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"),
+]
+_CONCAT = re.compile(r"\bCONCAT\(([^()]*)\)", re.I)
+_INSERT = re.compile(r"^\s*INSERT\b", re.I)
+
+
+@functools.lru_cache(maxsize=1024)
+def translate(query):
+    """Rewrite a MySQL-flavoured query for SQLite (cached per query text)"""
+    query = _CONCAT.sub(lambda match: "(" + " || ".join(part.strip() for part in match.group(1).split(",")) + ")", query)
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(time, time.isoformat)
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+
+class SQLiteCursor:
+    """mysql.connector-style cursor over sqlite3 (%s params, dict rows)"""
+
+    def __init__(self, connection, dictionary=False):
+        self._cursor = connection.cursor()
+        if dictionary:
+            self._cursor.row_factory = _dict_row
+        self.lastrowid = None
+        self.rowcount = -1
+
+    def execute(self, query, params=None):
+        self._cursor.execute(translate(query), tuple(params or ()))
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = self._cursor.lastrowid
+        if self.rowcount > 1 and _INSERT.match(query):
+            # Like MySQL, report the first id of a multi-row INSERT; writers
+            # are serialised, so the ids are consecutive
+            self.lastrowid = self.lastrowid - self.rowcount + 1
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(translate(query), [tuple(params) for params in seq_params])
+        self.rowcount = self._cursor.rowcount
+        self.lastrowid = None
+
+    @property
+    def with_rows(self):
+        return self._cursor.description is not None
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """sqlite3 connection with the parts of the mysql.connector API we use"""
+
+    def __init__(self, path, pool=None):
+        self._conn = sqlite3.connect(
+            path,
+            timeout=Config.SQLITE_BUSY_TIMEOUT,
+            check_same_thread=False,  # Pools hand a connection to one thread at a time
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=512,    # Prepared statements reused per connection
+            isolation_level=None,     # Autocommit; transactions start with start_transaction()
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._pool = pool
+        self._open = True
+
+    def cursor(self, dictionary=False, **kwargs):
+        return SQLiteCursor(self._conn, dictionary)
+
+    def start_transaction(self, **kwargs):
+        """Take the write lock up front, like a locking read would in MySQL"""
+        if self._conn.in_transaction:
+            self._conn.commit()
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def is_connected(self):
+        return self._open
+
+    def close(self):
+        """Return to the pool (uncommitted work is rolled back), or close"""
+        if self._pool is not None:
+            self._conn.rollback()
+            self._pool.put(self)
+        else:
+            self._open = False
+            self._conn.close()
+
+
+class SQLitePool:
+    """Connections are opened on demand and reused; DatabaseHelper caps how
+    many are checked out at once"""
+
+    def __init__(self, path):
+        self.path = path
+        self._idle = queue.LifoQueue()
+
+    def get_connection(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return SQLiteConnection(self.path, pool=self)
+
+    def put(self, connection):
+        self._idle.put(connection)
+
+
+class SQLiteBackend:
+    name = "sqlite"
+    migrations_dir = os.path.join(MIGRATIONS_DIR, "sqlite")
+    IntegrityError = sqlite3.IntegrityError
+    PoolError = PoolError
+
+    def __init__(self, path=None):
+        self.path = path or Config.SQLITE_PATH
+        self._lock = threading.Lock()
+
+    def connect(self):
+        return SQLiteConnection(self.path)
+
+    def create_pool(self, size):
+        return SQLitePool(self.path)
+
+    @contextmanager
+    def migration_lock(self, cursor):
+        """SQLite has no named locks; serialise this process's migrations and
+        rely on the schema files being idempotent across processes"""
+        with self._lock:
+            yield
+
+    def is_duplicate_key(self, error):
+        """True if an IntegrityError is a UNIQUE/PRIMARY KEY clash (not e.g. a foreign key)"""
+        return getattr(error, "sqlite_errorcode", None) in (
+            sqlite3.SQLITE_CONSTRAINT_UNIQUE, sqlite3.SQLITE_CONSTRAINT_PRIMARYKEY
+        )
+
+    def full_scans(self, cursor, query, params):
+        """Tables the query plan scans without an index"""
+        cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+        scans = []
+        for row in cursor.fetchall():
+            detail = row["detail"] if isinstance(row, dict) else row[-1]
+            match = re.match(r"SCAN (\w+)", detail)
+            if match and "INDEX" not in detail and match.group(1) != "CONSTANT":
+                scans.append(match.group(1))
+        return scans
+
+
+def get_backend(name=None):
+    """Backend for DB_BACKEND ("mysql" or "sqlite")"""
+    name = (name or Config.DB_BACKEND).lower()
+    if name == "sqlite":
+        return SQLiteBackend()
+    if name == "mysql":
+        return MySQLBackend()
+    raise ValueError(f"Unknown DB_BACKEND: {name}")
@@ -0,0 +1,5 @@
+"""
+Benchmarks for Event Contact System
+Seeding tool and timing harnesses; run them as modules, e.g.
+python -m benchmarks.seed and python -m benchmarks.bench_db
+"""
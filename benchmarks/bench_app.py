@@ -0,0 +1,181 @@
+"""
+End-to-end rerun benchmark
+Drives app.py headless with streamlit.testing's AppTest: N virtual users log
+in, list events, open an event, go through its tabs and send chat messages,
+against a seeded database (see benchmarks.seed)
+
+Usage:
+    python -m benchmarks.bench_app --users 1
+    python -m benchmarks.bench_app --users 10 --sessions 5 --messages 3
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+from benchmarks.common import print_table, save_results, summarize
+from benchmarks.seed import PASSWORD, username
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Widget that picks the event details section, when the page has one
+SECTION_WIDGET_KEY = "event_section"
+
+
+class StepFailed(Exception):
+    pass
+
+
+class VirtualUser:
+    """One browser session walking through the app"""
+
+    def __init__(self, email, rng, timeout, record):
+        self.email = email
+        self.rng = rng
+        self.timeout = timeout
+        self.record = record
+        self.at = None
+
+    def step(self, name, action):
+        """Run action() (which reruns the app) and record its latency"""
+        start = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - start
+        failed = bool(self.at.exception)
+        self.record(name, elapsed, failed)
+        if failed:
+            raise StepFailed(f"{name}: {self.at.exception[0].value}")
+
+    def _button(self, label=None, key=None, form=None):
+        for button in self.at.button:
+            if form is not None and getattr(button, "form_id", None) != form:
+                continue
+            if (label is not None and button.label == label) or (key is not None and button.key == key):
+                return button
+        raise StepFailed(f"No button {label or key!r} on {self.at.session_state['current_page']!r}")
+
+    def run_session(self, messages):
+        from streamlit.testing.v1 import AppTest
+
+        self.at = AppTest.from_file(APP_PATH, default_timeout=self.timeout)
+        self.step("open_app", self.at.run)
+
+        def login():
+            self.at.text_input[0].input(self.email)
+            self.at.text_input[1].input(PASSWORD)
+            self._button(label="Login").click().run()
+
+        self.step("login", login)
+        if not self.at.session_state["logged_in"]:
+            raise StepFailed(f"login failed for {self.email}")
+
+        self.step("list_events", self.at.run)
+
+        open_buttons = [button for button in self.at.button if (button.key or "").startswith("view_")]
+        if not open_buttons:
+            raise StepFailed(f"{self.email} has no events to open")
+        self.step("open_event", lambda: self.rng.choice(open_buttons).click().run())
+
+        sections = [widget for widget in self.at.radio if widget.key == SECTION_WIDGET_KEY]
+        if sections:
+            for option in sections[0].options:
+                self.step("switch_tab", lambda: self.at.radio(key=SECTION_WIDGET_KEY).set_value(option).run())
+        else:
+            # st.tabs renders every tab on each rerun, so a rerun covers them all
+            self.step("switch_tab", self.at.run)
+
+        event_id = self.at.session_state["current_event"]
+        if sections:
+            chat = [option for option in sections[0].options if "Chat" in option and "Event" in option]
+            if chat:
+                self.step("switch_tab", lambda: self.at.radio(key=SECTION_WIDGET_KEY).set_value(chat[0]).run())
+        for n in range(messages):
+            def send():
+                self.at.text_input(key=f"msg_input_event_{event_id}").input(f"Load test message {n}")
+                self._button(label="📤 Send", form=f"chat_form_event_{event_id}").click().run()
+            self.step("send_message", send)
+
+        self.step("back_to_events", lambda: self._button(label="← Back to Events").click().run())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark full app reruns with AppTest")
+    parser.add_argument("--users", type=int, default=4, help="concurrent virtual users")
+    parser.add_argument("--sessions", type=int, default=3, help="sessions per virtual user")
+    parser.add_argument("--messages", type=int, default=2, help="chat messages sent per session")
+    parser.add_argument("--seeded-users", type=int, default=1000, help="log in as one of the first N seeded users")
+    parser.add_argument("--prefix", default="bench_", help="username prefix used by benchmarks.seed")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per rerun")
+    parser.add_argument("--out", help="result file (default benchmarks/results/bench_app-<time>.json)")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+
+    latencies = {}
+    failures = {}
+    errors = []
+    lock = threading.Lock()
+
+    def record(name, elapsed, failed):
+        with lock:
+            latencies.setdefault(name, []).append(elapsed)
+            failures[name] = failures.get(name, 0) + failed
+
+    def virtual_user(index):
+        rng = random.Random(args.seed + index)
+        for _ in range(args.sessions):
+            email = username(args.prefix, rng.randrange(args.seeded_users))
+            try:
+                VirtualUser(email, rng, args.timeout, record).run_session(args.messages)
+            except Exception as e:
+                with lock:
+                    errors.append(f"user {index} ({email}): {e}")
+
+    from db_helper import get_db
+    db = get_db()
+    queries_before = db.query_stats()["queries"]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        list(pool.map(virtual_user, range(args.users)))
+    wall_time = time.perf_counter() - start
+
+    reruns = sum(len(values) for values in latencies.values())
+    results = {"steps": {
+        name: summarize(values, failures[name], wall_time=wall_time)
+        for name, values in latencies.items()
+    }}
+    results["total"] = {"all_reruns": summarize(
+        [value for values in latencies.values() for value in values],
+        sum(failures.values()), wall_time=wall_time
+    )}
+    print_table(f"{args.users} virtual users x {args.sessions} sessions", results["steps"])
+    print_table("All reruns", results["total"])
+    for error in errors[:10]:
+        print(f"❌ {error}")
+
+    queries = db.query_stats()["queries"] - queries_before
+    meta = {
+        "users": args.users,
+        "sessions": args.sessions,
+        "messages": args.messages,
+        "wall_time_s": round(wall_time, 3),
+        "reruns": reruns,
+        "reruns_per_s": round(reruns / wall_time, 2) if wall_time else 0.0,
+        "db_queries": queries,
+        "db_queries_per_rerun": round(queries / reruns, 2) if reruns else 0.0,
+        "failed_sessions": len(errors),
+        "cache": db.cache_stats()["total"],
+        "pool": db.pool_stats(),
+    }
+    print(f"\n{reruns} reruns in {wall_time:.1f}s ({meta['reruns_per_s']}/s), "
+          f"{meta['db_queries_per_rerun']} DB queries per rerun, {len(errors)} failed sessions")
+    save_results("bench_app", meta, results, args.out)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+DatabaseHelper benchmark
+Times every read and write method at p50/p95/p99, single-client and with
+concurrent clients, against a seeded database (see benchmarks.seed)
+
+Usage:
+    python -m benchmarks.bench_db
+    python -m benchmarks.bench_db --iterations 500 --concurrency 16 --only get_events_dashboard
+    python -m benchmarks.bench_db --compare before.json after.json
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import argparse
+import itertools
+import random
+import secrets
+import sys
+import threading
+import time
+
+from benchmarks.common import compare, open_db, print_table, save_results, summarize
+from benchmarks.seed import PASSWORD
+from config import Config
+
+# Methods that are not worth timing on their own
+NOT_BENCHMARKED = {"execute_query"}
+
+# Live sessions the session reads and updates pick from
+SESSIONS = 100
+
+
+def load_sample(db, size=1000):
+    """Real ids from the seeded data for the operations to pick from"""
+    def column(query, name):
+        return [row[name] for row in db.fetch_query(query, (size,))]
+
+    sample = {
+        "event_ids": column("SELECT event_id FROM eventz ORDER BY RAND() LIMIT %s", "event_id"),
+        "members": [(row["user_id"], row["event_id"]) for row in db.fetch_query(
+            "SELECT user_id, event_id FROM joins ORDER BY RAND() LIMIT %s", (size,))],
+        "usernames": column("SELECT username FROM users ORDER BY RAND() LIMIT %s", "username"),
+        "event_codes": column("SELECT event_code FROM eventz ORDER BY RAND() LIMIT %s", "event_code"),
+        "subevents": [(row["event_id"], row["sub_event_id"]) for row in db.fetch_query(
+            "SELECT event_id, sub_event_id FROM Have ORDER BY RAND() LIMIT %s", (size,))],
+        "organiser_users": column("SELECT user_id FROM organiser ORDER BY RAND() LIMIT %s", "user_id"),
+        "schedule_ids": column("SELECT schedule_id FROM Event_Schedule ORDER BY RAND() LIMIT %s", "schedule_id"),
+    }
+    rows = db.fetch_query("SELECT MAX(chat_id) AS max_id FROM chat_messages")
+    sample["recent_chat_id"] = max(((rows[0]["max_id"] if rows else 0) or 0) - 1000, 0)
+    missing = [name for name, values in sample.items() if isinstance(values, list) and not values]
+    if missing:
+        raise RuntimeError(f"No seeded rows for {', '.join(missing)}; run python -m benchmarks.seed first")
+    return sample
+
+
+def build_operations(db, sample, deletions=0):
+    """{name: (kind, op(rng))} covering DatabaseHelper's public methods"""
+    page = Config.EVENTS_PAGE_SIZE
+    unique = itertools.count()
+    run_id = int(time.time())
+    organiser_user = sample["organiser_users"][0]
+
+    def event(rng):
+        return rng.choice(sample["event_ids"])
+
+    def member(rng):
+        return rng.choice(sample["members"])
+
+    def subevent(rng):
+        return rng.choice(sample["subevents"])
+
+    def status(rng):
+        return rng.choice(["ongoing", "upcoming", "completed"])
+
+    # Items for delete_schedule and delete_session are created up front so only
+    # the delete is timed
+    setup_rng = random.Random(0)
+    deletable = [
+        db.add_schedule(event(setup_rng), "Temp", "To be deleted", "2025-01-01", "10:00:00", "Room",
+                        member(setup_rng)[0])["schedule_id"]
+        for _ in range(deletions)
+    ]
+
+    def new_session(rng):
+        session_id = secrets.token_hex(16)
+        expires = datetime.now() + timedelta(hours=1)
+        db.create_session(session_id, member(rng)[0], expires)
+        return session_id
+
+    sessions = [new_session(setup_rng) for _ in range(SESSIONS)]
+    revocable = [new_session(setup_rng) for _ in range(deletions)]
+
+    def workflow(rng):
+        """Two writes committed together, as the app's multi-step forms do"""
+        with db.transaction():
+            event_id = event(rng)
+            db.create_subevent("Bench Track", "Created by bench_db", event_id, capacity=50)
+            return db.create_announcement("Bench announcement", "bench", event_id)
+
+    reads = {
+        "login_user": lambda rng: db.login_user(rng.choice(sample["usernames"]), PASSWORD),
+        "get_user_by_id": lambda rng: db.get_user_by_id(member(rng)[0]),
+        "get_event_by_id": lambda rng: db.get_event_by_id(event(rng)),
+        "get_event_by_code": lambda rng: db.get_event_by_code(rng.choice(sample["event_codes"])),
+        "get_all_events": lambda rng: db.get_all_events(limit=page),
+        "get_events_by_status": lambda rng: db.get_events_by_status(status(rng), limit=page),
+        "get_user_events": lambda rng: db.get_user_events(member(rng)[0], limit=page),
+        "get_events_dashboard": lambda rng: db.get_events_dashboard(member(rng)[0], limit=page + 1),
+        "get_events_page": lambda rng: db.get_events_page(member(rng)[0], status=status(rng), page_size=page),
+        "check_user_joined_event": lambda rng: db.check_user_joined_event(*member(rng)),
+        "get_user_event_roles": lambda rng: db.get_user_event_roles(member(rng)[0]),
+        "get_event_participants": lambda rng: db.get_event_participants(event(rng)),
+        "get_event_announcements": lambda rng: db.get_event_announcements(event(rng)),
+        "get_room_chat": lambda rng: db.get_room_chat(*subevent(rng)),
+        "get_room_chat_since": lambda rng: db.get_room_chat_since(*subevent(rng), sample["recent_chat_id"]),
+        "get_event_chat": lambda rng: db.get_event_chat(event(rng), limit=50),
+        "get_subevent_chat": lambda rng: db.get_subevent_chat(*subevent(rng), limit=50),
+        "get_event_chat_since": lambda rng: db.get_event_chat_since(event(rng), sample["recent_chat_id"]),
+        "get_subevent_chat_since": lambda rng: db.get_subevent_chat_since(*subevent(rng), sample["recent_chat_id"]),
+        "get_event_subevents": lambda rng: db.get_event_subevents(event(rng)),
+        "get_subevents_overview": lambda rng: db.get_subevents_overview(event(rng), member(rng)[0]),
+        "check_subevent_registration": lambda rng: db.check_subevent_registration(member(rng)[0], subevent(rng)[1]),
+        "get_subevent_participants_count": lambda rng: db.get_subevent_participants_count(subevent(rng)[1]),
+        "get_event_schedules": lambda rng: db.get_event_schedules(event(rng)),
+        "get_organiser_by_user_id": lambda rng: db.get_organiser_by_user_id(organiser_user),
+        "get_session": lambda rng: db.get_session(rng.choice(sessions)),
+        "fetch_query": lambda rng: db.fetch_query("SELECT event_id FROM eventz WHERE event_id = %s", (event(rng),)),
+    }
+    writes = {
+        "register_user": lambda rng: db.register_user(
+            "Bench", "Writer", "+15550000000", f"bench_w{run_id}_{next(unique)}@example.com", PASSWORD),
+        "create_organiser": lambda rng: db.create_organiser(
+            "Bench Organiser", "+15550000000", "org@example.com", "Manager", member(rng)[0]),
+        "create_event": lambda rng: db.create_event(
+            "Bench Write Event", "Technology", "Created by bench_db", "2025-01-01", "2025-01-02",
+            "09:00:00", "17:00:00", "upcoming", f"W{run_id % 100000}{next(unique)}", None),
+        "join_event": lambda rng: db.join_event(member(rng)[0], event(rng)),
+        "create_announcement": lambda rng: db.create_announcement("Bench announcement", "bench", event(rng)),
+        "send_message": lambda rng: db.send_message(event(rng), "bench", "Bench message", idx_event_chat=1),
+        "create_subevent": lambda rng: db.create_subevent("Bench Track", "Created by bench_db", event(rng)),
+        "transaction": workflow,
+        "join_subevent": lambda rng: db.join_subevent(member(rng)[0], subevent(rng)[1]),
+        "leave_subevent": lambda rng: db.leave_subevent(member(rng)[0], subevent(rng)[1]),
+        "add_schedule": lambda rng: db.add_schedule(
+            event(rng), "Bench Session", "Created by bench_db", "2025-01-01", "10:00:00", "Room 1", member(rng)[0]),
+        "update_schedule": lambda rng: db.update_schedule(
+            rng.choice(sample["schedule_ids"]), "Bench Session", "Updated", "2025-01-01", "11:00:00", "Room 2"),
+        "delete_schedule": lambda rng: db.delete_schedule(deletable.pop()),
+        "create_session": lambda rng: db.create_session(
+            secrets.token_hex(16), member(rng)[0], datetime.now() + timedelta(hours=1)),
+        "update_session_state": lambda rng: db.update_session_state(
+            rng.choice(sessions), "event_details", event(rng)),
+        "delete_session": lambda rng: db.delete_session(revocable.pop()),
+    }
+    operations = {name: ("read", op) for name, op in reads.items()}
+    operations.update({name: ("write", op) for name, op in writes.items()})
+    return operations
+
+
+def uncovered_methods(operations):
+    """Instrumented DatabaseHelper methods without a benchmark"""
+    from db_helper import DatabaseHelper
+
+    methods = {
+        name for name, value in vars(DatabaseHelper).items()
+        if not name.startswith("_") and not isinstance(value, staticmethod) and hasattr(value, "__wrapped__")
+    }
+    return sorted(methods - set(operations) - NOT_BENCHMARKED)
+
+
+def _failed(result):
+    return isinstance(result, dict) and result.get("success") is False
+
+
+def run_single(operation, iterations, warmup, seed):
+    rng = random.Random(seed)
+    for _ in range(warmup):
+        operation(rng)
+    latencies, errors = [], 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            failed = _failed(operation(rng))
+        except Exception:
+            failed = True
+        latencies.append(time.perf_counter() - start)
+        errors += failed
+    return summarize(latencies, errors)
+
+
+def run_concurrent(operation, iterations, concurrency, seed):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    per_worker = max(1, iterations // concurrency)
+
+    def worker(index):
+        rng = random.Random(seed + index)
+        local, failures = [], 0
+        for _ in range(per_worker):
+            start = time.perf_counter()
+            try:
+                failures += _failed(operation(rng))
+            except Exception:
+                failures += 1
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+            errors[0] += failures
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(latencies, errors[0], wall_time=time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DatabaseHelper methods")
+    parser.add_argument("--iterations", type=int, default=200, help="calls per method and mode")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads (0 = single-client only)")
+    parser.add_argument("--cache", action="store_true", help="keep the read cache on (off = measure the DB)")
+    parser.add_argument("--reads-only", action="store_true")
+    parser.add_argument("--only", nargs="+", help="benchmark just these methods")
+    parser.add_argument("--out", help="result file (default benchmarks/results/bench_db-<time>.json)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    db = open_db(pool_size=max(args.concurrency, 1))
+    if db is None:
+        return 1
+    db.cache.enabled = args.cache
+
+    runs = 2 if args.concurrency > 0 else 1
+    deletions = (args.iterations + args.warmup) * runs
+    if args.reads_only or (args.only and not {"delete_schedule", "delete_session"} & set(args.only)):
+        deletions = 0
+    operations = build_operations(db, load_sample(db), deletions)
+    missing = uncovered_methods(operations)
+    if missing:
+        print(f"⚠️  No benchmark for: {', '.join(missing)}")
+    if args.only:
+        operations = {name: spec for name, spec in operations.items() if name in args.only}
+    if args.reads_only:
+        operations = {name: spec for name, spec in operations.items() if spec[0] == "read"}
+
+    results = {"single": {}}
+    for name, (kind, operation) in operations.items():
+        results["single"][name] = dict(run_single(operation, args.iterations, args.warmup, args.seed), kind=kind)
+    print_table("Single client", results["single"])
+
+    if args.concurrency > 0:
+        results["concurrent"] = {}
+        for name, (kind, operation) in operations.items():
+            summary = run_concurrent(operation, args.iterations, args.concurrency, args.seed)
+            results["concurrent"][name] = dict(summary, kind=kind)
+        print_table(f"{args.concurrency} concurrent clients", results["concurrent"])
+
+    meta = {
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "cache": args.cache,
+        "pool_size": db.pool_stats()["pool_size"],
+        "pool": db.pool_stats(),
+        "dataset": {table: db.fetch_query(f"SELECT COUNT(*) AS n FROM {table}")[0]["n"]
+                    for table in ("users", "eventz", "joins", "chat_messages", "sub_events")},
+    }
+    save_results("bench_db", meta, results, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Login benchmark
+Runs bursts of concurrent logins (username lookup + scrypt verify) through
+DatabaseHelper.login_user with password worker pools of different sizes, and
+reports logins/sec overall and per core. Needs seeded users (see
+benchmarks.seed)
+
+Usage:
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login --workers 1 2 4 8 --concurrency 64 --logins 400 --log2n 15
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.common import open_db, print_table, save_results, summarize
+from benchmarks.seed import PASSWORD, username
+from config import Config
+from passwords import PasswordHasher
+
+
+def burst(db, emails, logins, concurrency):
+    """Log in logins times from concurrency client threads; return (latencies, errors, wall)"""
+    latencies = [0.0] * logins
+    errors = []
+
+    def run(index):
+        start = time.perf_counter()
+        result = db.login_user(emails[index % len(emails)], PASSWORD)
+        latencies[index] = time.perf_counter() - start
+        if not result["success"]:
+            errors.append(result["error"])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, range(logins)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark login throughput per password worker")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, cores}),
+                        help="password pool sizes to compare")
+    parser.add_argument("--concurrency", type=int, default=32, help="client threads logging in at once")
+    parser.add_argument("--logins", type=int, default=200, help="logins per pool size")
+    parser.add_argument("--log2n", type=int, default=Config.PASSWORD_SCRYPT_LOG2N, help="scrypt cost (N = 2**log2n)")
+    parser.add_argument("--seeded-users", type=int, default=50, help="log in as the first N seeded users")
+    parser.add_argument("--prefix", default="bench_", help="username prefix used by benchmarks.seed")
+    parser.add_argument("--out", help="result file (default benchmarks/results/bench_login-<time>.json)")
+    args = parser.parse_args(argv)
+
+    db = open_db(pool_size=min(args.concurrency, 32))
+    if db is None:
+        return 1
+    emails = [username(args.prefix, index) for index in range(args.seeded_users)]
+
+    results = {}
+    per_core = {}
+    for workers in args.workers:
+        db.passwords.close()
+        db.passwords = PasswordHasher(
+            log2_n=args.log2n, r=Config.PASSWORD_SCRYPT_R, p=Config.PASSWORD_SCRYPT_P,
+            workers=workers, queue_size=args.concurrency
+        )
+        # Warm-up: one login per user also upgrades legacy or other-cost hashes
+        _, errors, _ = burst(db, emails, len(emails), args.concurrency)
+        if len(errors) == len(emails):
+            print(f"❌ No seeded user could log in ({errors[0]}); run python -m benchmarks.seed first")
+            return 1
+
+        latencies, errors, wall = burst(db, emails, args.logins, args.concurrency)
+        name = f"login ({workers} worker{'s' if workers != 1 else ''})"
+        results[name] = summarize(latencies, len(errors), wall_time=wall)
+        per_core[name] = round(results[name]["throughput_per_s"] / min(workers, cores), 2)
+
+    print_table(f"Logins (scrypt N=2^{args.log2n}, {args.concurrency} clients, {cores} cores)", results)
+    print()
+    for name, rate in per_core.items():
+        print(f"{name:<32} {rate:>9.1f} logins/s per core")
+
+    meta = {
+        "cores": cores,
+        "log2n": args.log2n,
+        "concurrency": args.concurrency,
+        "logins": args.logins,
+        "seeded_users": args.seeded_users,
+        "per_core": per_core,
+        "passwords": db.passwords.stats(),
+    }
+    save_results("bench_login", meta, {"logins": results}, args.out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
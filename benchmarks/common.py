@@ -0,0 +1,104 @@
+"""
+Shared helpers for the benchmark scripts: latency summaries and JSON results
+"""
+
+from datetime import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors=0, wall_time=None):
+    """p50/p95/p99 etc. in milliseconds for a list of latencies in seconds"""
+    values = sorted(latencies)
+    summary = {
+        "n": len(values),
+        "errors": errors,
+        "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+        "min_ms": values[0] * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000 if values else 0.0,
+    }
+    if wall_time:
+        summary["throughput_per_s"] = len(values) / wall_time
+    return {key: round(value, 4) if isinstance(value, float) else value for key, value in summary.items()}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def save_results(name, meta, results, path=None):
+    """Write {"meta", "results"} to path (default benchmarks/results/<name>-<time>.json)"""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    document = {
+        "meta": dict(meta, benchmark=name, commit=_git_commit(), python=platform.python_version(),
+                     created_at=datetime.now().isoformat(timespec="seconds")),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(document, results_file, indent=2, default=str)
+    print(f"\n📄 Results saved to {path}")
+    return path
+
+
+def compare(before_path, after_path, metric="p95_ms"):
+    """Print metric changes between two result files, per mode and operation"""
+    with open(before_path, encoding="utf-8") as before_file:
+        before = json.load(before_file)["results"]
+    with open(after_path, encoding="utf-8") as after_file:
+        after = json.load(after_file)["results"]
+
+    print(f"{'operation':<45} {'before':>10} {'after':>10} {'change':>8}   ({metric})")
+    for mode in after:
+        for operation, summary in after[mode].items():
+            old = before.get(mode, {}).get(operation)
+            if not old or metric not in summary or metric not in old:
+                continue
+            change = (summary[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+            print(f"{mode + ':' + operation:<45} {old[metric]:>10.3f} {summary[metric]:>10.3f} {change:>+7.1f}%")
+
+
+def print_table(title, results):
+    """Print one mode's summaries as a table"""
+    print(f"\n{title}")
+    print(f"{'operation':<32} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'err':>5}")
+    for operation, summary in results.items():
+        throughput = summary.get("throughput_per_s")
+        throughput = f"{throughput:>9.1f}" if throughput is not None else f"{'':>9}"
+        print(f"{operation:<32} {summary['n']:>6} {summary['p50_ms']:>9.3f} {summary['p95_ms']:>9.3f} "
+              f"{summary['p99_ms']:>9.3f} {throughput} {summary['errors']:>5}")
+
+
+def open_db(pool_size=0):
+    """Connect a DatabaseHelper for benchmarking and bring its schema up to date"""
+    from db_helper import DatabaseHelper
+    from migrate import apply_pending
+
+    db = DatabaseHelper(pool_size=pool_size)
+    if not db.is_connected():
+        print("❌ Could not connect to the database")
+        return None
+    apply_pending(db)
+    return db
@@ -0,0 +1,225 @@
+"""
+Synthetic data generator for benchmarks
+Bulk-inserts users, events, joins, announcements, subevents, schedules and
+chat messages at a configurable scale
+
+Usage:
+    python -m benchmarks.seed                      # small dataset
+    python -m benchmarks.seed --scale production   # 100k users, 5k events, 1M joins, 5M messages
+    python -m benchmarks.seed --users 20000 --messages 500000
+"""
+
+from datetime import date, timedelta
+import argparse
+import random
+import sys
+
+from benchmarks.common import open_db
+
+SCALES = {
+    "small": {
+        "users": 1000, "events": 100, "joins": 10000, "messages": 50000,
+        "subevents_per_event": 5, "announcements_per_event": 10, "schedules_per_event": 10,
+        "subevent_participants": 20,
+    },
+    "production": {
+        "users": 100000, "events": 5000, "joins": 1000000, "messages": 5000000,
+        "subevents_per_event": 8, "announcements_per_event": 20, "schedules_per_event": 15,
+        "subevent_participants": 50,
+    },
+}
+
+STATUSES = ["ongoing", "upcoming", "completed"]
+CATEGORIES = ["Technology", "Music", "Sports", "Business", "Education", "Arts"]
+PASSWORD = "benchpass123"
+
+
+def username(prefix, index):
+    return f"{prefix}{index}@example.com"
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def insert_rows(db, table, columns, rows, batch_size, total=None):
+    """Insert rows in executemany batches, one transaction per batch"""
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    count = 0
+    for chunk in _chunks(rows, batch_size):
+        with db.transaction(), db._connection() as (conn, cursor):
+            cursor.executemany(query, chunk)
+        count += len(chunk)
+        if total:
+            print(f"\r   {table}: {count:,}/{total:,}", end="", flush=True)
+    print(f"\r   ✅ {table}: {count:,} rows" + " " * 20)
+    return count
+
+
+def max_id(db, table, column):
+    rows = db.fetch_query(f"SELECT MAX({column}) AS max_id FROM {table}")
+    return (rows[0]["max_id"] if rows else None) or 0
+
+
+def new_ids(db, table, column, after):
+    """Ids inserted after `after`, in insertion order (single writer)"""
+    rows = db.fetch_query(f"SELECT {column} AS id FROM {table} WHERE {column} > %s ORDER BY {column}", (after,))
+    return [row["id"] for row in rows]
+
+
+def seed(db, users, events, joins, messages, subevents_per_event, announcements_per_event,
+         schedules_per_event, subevent_participants, batch_size=5000, prefix="bench_", rng_seed=42):
+    """Generate a dataset and return the row counts per table"""
+    rng = random.Random(rng_seed)
+    counts = {}
+    # One scrypt hash shared by every seeded user (hashing each would take
+    # longer than the rest of the seed)
+    password_hash = db.passwords.hash(PASSWORD)
+    print(f"🌱 Seeding with prefix '{prefix}' (login password: {PASSWORD})")
+
+    # Users
+    start = max_id(db, "users", "user_ID")
+    counts["users"] = insert_rows(db, "users", ["first_name", "last_name", "mobile_no", "username", "rpassword", "rrole"], (
+        (f"User{i}", "Bench", f"+1555{i:07d}", username(prefix, i), password_hash, "participant")
+        for i in range(users)
+    ), batch_size, users)
+    user_ids = new_ids(db, "users", "user_ID", start)
+    usernames = [username(prefix, i) for i in range(users)]
+
+    # Organisers (one per 50 events) and events
+    organiser_count = max(1, events // 50)
+    start = max_id(db, "organiser", "organiser_id")
+    counts["organiser"] = insert_rows(db, "organiser", ["organiser_name", "phone_number", "email", "post", "user_id"], (
+        (f"Organiser {i}", f"+1666{i:07d}", usernames[i % users], "Event Manager", user_ids[i % users])
+        for i in range(organiser_count)
+    ), batch_size)
+    organiser_ids = new_ids(db, "organiser", "organiser_id", start)
+
+    start = max_id(db, "eventz", "event_id")
+    first_day = date.today() - timedelta(days=365)
+    counts["eventz"] = insert_rows(db, "eventz", [
+        "title", "category", "event_description", "start_date", "end_date", "start_time",
+        "end_time", "event_status", "event_code", "organiser_id", "type_of_event"
+    ], (
+        (f"Bench Event {i}", rng.choice(CATEGORIES), f"Synthetic event number {i} for benchmarks.",
+         first_day + timedelta(days=i % 730), first_day + timedelta(days=i % 730 + 2),
+         "09:00:00", "17:00:00", rng.choice(STATUSES), f"{prefix.upper()[:4]}{i:06d}",
+         organiser_ids[i % organiser_count], "conference")
+        for i in range(events)
+    ), batch_size, events)
+    event_ids = new_ids(db, "eventz", "event_id", start)
+
+    # Joins: every user joins about the same number of distinct events
+    per_user, extra = divmod(min(joins, users * events), users)
+
+    def join_rows():
+        for index, user_id in enumerate(user_ids):
+            count = per_user + (1 if index < extra else 0)
+            for event_id in rng.sample(event_ids, count):
+                roll = rng.random()
+                role = "admin" if roll < 0.02 else "core" if roll < 0.10 else "participant"
+                yield (user_id, event_id, role)
+
+    counts["joins"] = insert_rows(db, "joins", ["user_id", "event_id", "user_role"], join_rows(), batch_size, joins)
+
+    # Announcements and their event links
+    total = events * announcements_per_event
+    start = max_id(db, "announcements", "announcement_id")
+    counts["announcements"] = insert_rows(db, "announcements", ["announcement_text", "author_username"], (
+        (f"Announcement {n} for event {i}", rng.choice(usernames))
+        for i in range(events) for n in range(announcements_per_event)
+    ), batch_size, total)
+    announcement_ids = new_ids(db, "announcements", "announcement_id", start)
+    counts["Containz"] = insert_rows(db, "Containz", ["event_id", "announcement_id"], (
+        (event_ids[position // announcements_per_event], announcement_id)
+        for position, announcement_id in enumerate(announcement_ids)
+    ), batch_size, total)
+
+    # Subevents, their event links and participants
+    total = events * subevents_per_event
+    start = max_id(db, "sub_events", "sub_event_id")
+    counts["sub_events"] = insert_rows(db, "sub_events", ["sub_event_name", "decription", "capacity"], (
+        (f"Track {n}", f"Track {n} of event {i}", rng.choice([None, 50, 100, 500]))
+        for i in range(events) for n in range(subevents_per_event)
+    ), batch_size, total)
+    subevent_ids = new_ids(db, "sub_events", "sub_event_id", start)
+    subevent_event = {
+        subevent_id: event_ids[position // subevents_per_event]
+        for position, subevent_id in enumerate(subevent_ids)
+    }
+    counts["Have"] = insert_rows(db, "Have", ["event_id", "sub_event_id"], (
+        (event_id, subevent_id) for subevent_id, event_id in subevent_event.items()
+    ), batch_size, total)
+    counts["Subevent_Participants"] = insert_rows(db, "Subevent_Participants", ["user_id", "sub_event_id"], (
+        (user_id, subevent_id)
+        for subevent_id in subevent_ids
+        for user_id in rng.sample(user_ids, min(subevent_participants, users))
+    ), batch_size, total * min(subevent_participants, users))
+
+    # Schedules
+    total = events * schedules_per_event
+    counts["Event_Schedule"] = insert_rows(db, "Event_Schedule", [
+        "event_id", "title", "description", "schedule_date", "schedule_time", "location", "added_by_user_id"
+    ], (
+        (event_id, f"Session {n}", "Synthetic schedule item", first_day + timedelta(days=position % 730),
+         f"{9 + n % 9:02d}:00:00", f"Room {n % 10}", rng.choice(user_ids))
+        for position, event_id in enumerate(event_ids) for n in range(schedules_per_event)
+    ), batch_size, total)
+
+    # Chat: 40% main event chat, the rest spread across the event's subevents
+    subevents_by_event = {}
+    for subevent_id, event_id in subevent_event.items():
+        subevents_by_event.setdefault(event_id, []).append(subevent_id)
+
+    def message_rows():
+        for n in range(messages):
+            event_id = rng.choice(event_ids)
+            rooms = subevents_by_event.get(event_id)
+            if rooms and rng.random() >= 0.4:
+                sub_event_id = rng.choice(rooms)
+                yield (event_id, sub_event_id, "Track", rng.choice(usernames), 0, 1, f"Subevent message {n}")
+            else:
+                yield (event_id, None, "", rng.choice(usernames), 1, 0, f"Event message {n}")
+
+    counts["chat_messages"] = insert_rows(db, "chat_messages", [
+        "event_id", "sub_event_id", "subevent_name", "sender_username",
+        "idx_event_chat", "idx_subevent_chat", "chat_message_text"
+    ], message_rows(), batch_size, messages)
+
+    db.cache.clear()
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed the database with synthetic benchmark data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for field in SCALES["small"]:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, dest=field,
+                            help=f"override the scale's {field}")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--prefix", default="bench_", help="username prefix (must be unused)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    volumes = dict(SCALES[args.scale])
+    for field in volumes:
+        if getattr(args, field) is not None:
+            volumes[field] = getattr(args, field)
+
+    db = open_db()
+    if db is None:
+        return 1
+    counts = seed(db, batch_size=args.batch_size, prefix=args.prefix, rng_seed=args.seed, **volumes)
+    print(f"\n✅ Seeded {sum(counts.values()):,} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""
+Subevent capacity stress test
+Many clients hit Join on one small subevent at the same instant, then some
+participants leave at once. Fails if the subevent is ever overbooked, a user
+is both registered and waitlisted, or the waitlist is not promoted in FIFO
+order. Needs seeded users (see benchmarks.seed)
+
+Usage:
+    python -m benchmarks.stress_subevent
+    python -m benchmarks.stress_subevent --users 500 --capacity 50 --concurrency 64 --leaves 20
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import sys
+import threading
+import time
+
+from benchmarks.common import open_db, print_table, save_results, summarize
+
+
+def create_target(db, capacity):
+    """A fresh event with one subevent of the given capacity"""
+    run_id = int(time.time())
+    event = db.create_event(
+        "Stress Event", "Technology", "Created by stress_subevent", "2025-01-01", "2025-01-02",
+        "09:00:00", "17:00:00", "upcoming", f"STRESS{run_id}", None
+    )
+    subevent = db.create_subevent("Stress Workshop", "Capacity stress test", event["event_id"], capacity=capacity)
+    return event["event_id"], subevent["sub_event_id"]
+
+
+def hammer(calls, concurrency):
+    """Run calls (zero-arg functions) together behind a barrier; return (results, latencies, wall)"""
+    barrier = threading.Barrier(min(concurrency, len(calls)))
+    results = [None] * len(calls)
+    latencies = [0.0] * len(calls)
+
+    def run(index):
+        if index < barrier.parties:
+            barrier.wait()  # Release the first wave at the same instant
+        start = time.perf_counter()
+        try:
+            results[index] = calls[index]()
+        except Exception as e:
+            results[index] = {"success": False, "error": str(e)}
+        latencies[index] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(run, range(len(calls))))
+    return results, latencies, time.perf_counter() - start
+
+
+def snapshot(db, sub_event_id):
+    participants = [row["user_id"] for row in db.fetch_query(
+        "SELECT user_id FROM Subevent_Participants WHERE sub_event_id = %s", (sub_event_id,))]
+    waitlist = [row["user_id"] for row in db.fetch_query(
+        "SELECT user_id FROM Subevent_Waitlist WHERE sub_event_id = %s ORDER BY waitlist_id", (sub_event_id,))]
+    return participants, waitlist
+
+
+def check(participants, waitlist, capacity, expected_total):
+    problems = []
+    if len(participants) > capacity:
+        problems.append(f"overbooked: {len(participants)} participants for capacity {capacity}")
+    if len(set(participants)) != len(participants) or len(set(waitlist)) != len(waitlist):
+        problems.append("duplicate registrations")
+    if set(participants) & set(waitlist):
+        problems.append("users both registered and waitlisted")
+    if len(participants) + len(waitlist) != expected_total:
+        problems.append(f"{len(participants) + len(waitlist)} users registered or waitlisted, expected {expected_total}")
+    if waitlist and len(participants) < capacity:
+        problems.append("free places left while users are waitlisted")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent join/leave stress test for subevent capacity")
+    parser.add_argument("--users", type=int, default=200, help="distinct users clicking Join")
+    parser.add_argument("--capacity", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=32, help="client threads (and pool size)")
+    parser.add_argument("--leaves", type=int, default=10, help="participants leaving at once afterwards")
+    parser.add_argument("--out", help="result file (default benchmarks/results/stress_subevent-<time>.json)")
+    args = parser.parse_args(argv)
+
+    db = open_db(pool_size=args.concurrency)
+    if db is None:
+        return 1
+    db.cache.enabled = False
+    user_ids = [row["user_ID"] for row in db.fetch_query(
+        "SELECT user_ID FROM users ORDER BY user_ID LIMIT %s", (args.users,))]
+    if len(user_ids) < args.users:
+        print(f"❌ Only {len(user_ids)} users in the database; run python -m benchmarks.seed first")
+        return 1
+
+    event_id, sub_event_id = create_target(db, args.capacity)
+    print(f"🎯 Subevent {sub_event_id} (capacity {args.capacity}): "
+          f"{args.users} joins over {args.concurrency} threads")
+
+    # Phase 1: everyone joins at once
+    results, join_latencies, join_wall = hammer(
+        [lambda user_id=user_id: db.join_subevent(user_id, sub_event_id) for user_id in user_ids],
+        args.concurrency
+    )
+    join_errors = [result["error"] for result in results if not result["success"]]
+    joined = sum(1 for result in results if result["success"] and result["status"] == "joined")
+    participants, waitlist = snapshot(db, sub_event_id)
+    problems = check(participants, waitlist, args.capacity, args.users - len(join_errors))
+    if joined != len(participants):
+        problems.append(f"{joined} joins reported but {len(participants)} participants stored")
+
+    # Phase 2: some participants leave at once; the waitlist head must move up
+    leavers = participants[:args.leaves]
+    expected_promoted = waitlist[:len(leavers)]
+    results, leave_latencies, leave_wall = hammer(
+        [lambda user_id=user_id: db.leave_subevent(user_id, sub_event_id) for user_id in leavers],
+        args.concurrency
+    )
+    leave_errors = [result["error"] for result in results if not result["success"]]
+    promoted = [user_id for result in results if result["success"] for user_id in result["promoted"]]
+    participants, waitlist = snapshot(db, sub_event_id)
+    problems += check(participants, waitlist, args.capacity, args.users - len(join_errors) - len(leavers))
+    if sorted(promoted) != sorted(expected_promoted):
+        problems.append("waitlist was not promoted in FIFO order")
+
+    results = {"operations": {
+        "join_subevent": summarize(join_latencies, len(join_errors), wall_time=join_wall),
+        "leave_subevent": summarize(leave_latencies, len(leave_errors), wall_time=leave_wall),
+    }}
+    print_table("Concurrent joins and leaves", results["operations"])
+    for error in sorted(set(join_errors + leave_errors))[:5]:
+        print(f"⚠️  {error}")
+
+    meta = {
+        "users": args.users,
+        "capacity": args.capacity,
+        "concurrency": args.concurrency,
+        "leaves": len(leavers),
+        "event_id": event_id,
+        "sub_event_id": sub_event_id,
+        "participants": len(participants),
+        "waitlist": len(waitlist),
+        "promoted": len(promoted),
+        "problems": problems,
+        "pool": db.pool_stats(),
+    }
+    save_results("stress_subevent", meta, results, args.out)
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        return 1
+    print(f"✅ No overbooking: {len(participants)}/{args.capacity} participants, "
+          f"{len(waitlist)} waitlisted, {len(promoted)} promoted in order")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
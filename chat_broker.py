@@ -0,0 +1,166 @@
+"""
+Chat Broker Module for Event Contact System
+In-process pub/sub for chat rooms, so sessions watching the same room share
+new messages instead of each polling MySQL
+"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+import bisect
+import threading
+import time
+
+
+class _Room:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ids = []          # Sorted chat_ids in the buffer
+        self.messages = {}     # chat_id -> message row
+        self.primed = False
+        self.floor = 0         # Every message above floor is in the buffer
+        self.watermark = 0     # Every message up to here has been delivered to the buffer
+        self.synced_at = 0.0
+        self.in_flight = 0
+
+
+class ChatBroker:
+    def __init__(self, buffer_size=500, refresh_interval=2.0, max_rooms=1000):
+        """Create a broker
+
+        Rooms are keyed by (event_id, room). Each room keeps its last
+        buffer_size messages. With refresh_interval set, at most one DB read
+        per room per interval picks up messages written by other processes;
+        with refresh_interval=None every write is assumed to come through
+        this process and the DB is only read to prime a room.
+        """
+        self.buffer_size = buffer_size
+        self.refresh_interval = refresh_interval
+        self.max_rooms = max_rooms
+        self._lock = threading.Lock()
+        self._rooms = OrderedDict()
+        self._stats = {"publishes": 0, "fetches": 0, "db_reads": 0, "direct_reads": 0}
+
+    def _room(self, key):
+        with self._lock:
+            room = self._rooms.get(key)
+            if room is None:
+                room = self._rooms[key] = _Room()
+                while len(self._rooms) > self.max_rooms:
+                    self._rooms.popitem(last=False)
+            else:
+                self._rooms.move_to_end(key)
+            return room
+
+    def _count(self, field, amount=1):
+        with self._lock:
+            self._stats[field] += amount
+
+    def _add(self, room, messages):
+        """Merge messages into a room's buffer (caller holds room.lock)"""
+        for message in messages:
+            chat_id = message["chat_id"]
+            if chat_id in room.messages or chat_id <= room.floor:
+                continue
+            bisect.insort(room.ids, chat_id)
+            room.messages[chat_id] = message
+        while len(room.ids) > self.buffer_size:
+            evicted = room.ids.pop(0)
+            del room.messages[evicted]
+            room.floor = evicted
+            room.watermark = max(room.watermark, room.floor)
+
+    # ==================== PUBLISHING ====================
+
+    @contextmanager
+    def writing(self, key):
+        """Wrap a message insert so readers don't skip ids still being written
+
+        The watermark only moves once no insert for the room is in flight
+        (whether it would move on a publish or on a DB refresh), so a message
+        committed late with a lower id is never jumped over.
+        """
+        room = self._room(key)
+        with room.lock:
+            room.in_flight += 1
+        try:
+            yield
+        finally:
+            with room.lock:
+                room.in_flight -= 1
+                if room.in_flight == 0 and room.primed and self.refresh_interval is None and room.ids:
+                    room.watermark = max(room.watermark, room.ids[-1])
+
+    def publish(self, key, message):
+        """Push a freshly written message to everyone watching the room"""
+        room = self._room(key)
+        with room.lock:
+            if room.primed:
+                self._add(room, [message])
+        self._count("publishes")
+
+    # ==================== SUBSCRIBING ====================
+
+    def fetch(self, key, after_id, load_since):
+        """Return (messages above after_id, new cursor) for a room
+
+        load_since(after_id) reads newer messages from the DB; it is called
+        at most once per refresh interval for the whole room.
+        """
+        room = self._room(key)
+        self._count("fetches")
+        with room.lock:
+            due = self.refresh_interval is not None and time.monotonic() - room.synced_at >= self.refresh_interval
+            if not room.primed or due:
+                start = room.watermark if room.primed else after_id
+                if not room.primed:
+                    room.floor = start
+                rows = load_since(start)
+                self._count("db_reads")
+                self._add(room, rows)
+                room.watermark = max(room.watermark, start)
+                if rows and room.in_flight == 0:
+                    # An insert still in flight may commit with a lower id
+                    # than the rows just read; only move past them once none is
+                    room.watermark = max(room.watermark, rows[-1]["chat_id"])
+                room.synced_at = time.monotonic()
+                room.primed = True
+
+            if after_id >= room.floor:
+                index = bisect.bisect_right(room.ids, after_id)
+                messages = [room.messages[chat_id] for chat_id in room.ids[index:]]
+                return messages, max(after_id, room.watermark)
+
+        # The subscriber is behind the buffer: read its gap directly
+        self._count("direct_reads")
+        rows = load_since(after_id)
+        return rows, rows[-1]["chat_id"] if rows else after_id
+
+    def subscribe(self, key, after_id, load_since):
+        """Start watching a room from after_id"""
+        return Subscription(self, key, after_id, load_since)
+
+    def stats(self):
+        """Return broker counters (publishes, fetches, DB reads, open rooms)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["rooms"] = len(self._rooms)
+        return stats
+
+
+class Subscription:
+    """One session's view of a room; poll() returns only unseen messages"""
+
+    def __init__(self, broker, key, after_id, load_since):
+        self.broker = broker
+        self.key = key
+        self.cursor = after_id
+        self.load_since = load_since
+        self._delivered = set()  # Ids above the cursor already returned
+
+    def poll(self):
+        messages, cursor = self.broker.fetch(self.key, self.cursor, self.load_since)
+        fresh = [message for message in messages if message["chat_id"] not in self._delivered]
+        self._delivered.update(message["chat_id"] for message in fresh)
+        self.cursor = cursor
+        self._delivered = {chat_id for chat_id in self._delivered if chat_id > cursor}
+        return fresh
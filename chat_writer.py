@@ -0,0 +1,139 @@
+"""
+Chat Writer Module for Event Contact System
+Optional write-behind queue: chat messages are accepted into memory and a
+background thread writes them in batches with one commit per batch
+"""
+
+import atexit
+import itertools
+import queue
+import threading
+import time
+
+
+class ChatWriteBehind:
+    def __init__(self, write_batch, flush_interval=0.2, max_batch=200, queue_size=5000,
+                 put_timeout=1.0, max_retries=3):
+        """Start the background flusher
+
+        write_batch(messages) inserts a list of message dicts in one
+        transaction. A batch is written once it reaches max_batch messages or
+        flush_interval seconds after its first message arrived, whichever
+        comes first. When queue_size messages are waiting, submit() blocks up
+        to put_timeout seconds and then rejects the message. A batch that
+        still fails after max_retries attempts is written one message at a
+        time, and only the messages that fail on their own are dropped.
+        """
+        self.write_batch = write_batch
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._ids = itertools.count(1)
+        self._stop = threading.Event()
+        self._stats_lock = threading.Lock()
+        self._stats = {"accepted": 0, "rejected": 0, "written": 0, "batches": 0, "failed": 0}
+        self._pending = 0
+        self._idle = threading.Condition(self._stats_lock)
+        self._thread = threading.Thread(target=self._run, name="chat-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _count(self, field, amount=1):
+        with self._stats_lock:
+            self._stats[field] += amount
+
+    def _done(self, written, failed=0, rejected=0):
+        """Settle messages that left the queue and wake flush() waiters"""
+        with self._idle:
+            self._stats["written"] += written
+            self._stats["failed"] += failed
+            self._stats["rejected"] += rejected
+            if written:
+                self._stats["batches"] += 1
+            self._pending -= written + failed + rejected
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def submit(self, message):
+        """Queue a message and return a provisional id right away"""
+        provisional_id = f"pending-{next(self._ids)}"
+        with self._stats_lock:
+            self._pending += 1
+        try:
+            self._queue.put(dict(message, provisional_id=provisional_id), timeout=self.put_timeout)
+        except queue.Full:
+            self._done(0, rejected=1)
+            return {"success": False, "error": "Chat is busy, please try again"}
+        self._count("accepted")
+        return {"success": True, "chat_id": None, "provisional_id": provisional_id, "queued": True}
+
+    def _next_batch(self):
+        """Wait for a first message, then gather more until the batch is due"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                self.write_batch(batch)
+                self._done(len(batch))
+                return
+            except Exception as e:
+                print(f"Chat write-behind error (attempt {attempt}): {e}")
+                time.sleep(self.flush_interval * attempt)
+        if len(batch) > 1:
+            self._write_one_by_one(batch)
+        else:
+            self._done(0, failed=1)
+
+    def _write_one_by_one(self, batch):
+        """Write a failed batch row by row, so one bad message (e.g. for a
+        deleted event) doesn't drop everyone else's"""
+        written = failed = 0
+        for message in batch:
+            try:
+                self.write_batch([message])
+                written += 1
+            except Exception as e:
+                print(f"Chat write-behind dropped message {message['provisional_id']}: {e}")
+                failed += 1
+        self._done(written, failed=failed)
+
+    def _run(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written"""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def close(self):
+        """Stop accepting work and write out what is still queued"""
+        if not self._stop.is_set():
+            self._stop.set()
+            self._thread.join()
+
+    def stats(self):
+        """Return queue depth and write counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
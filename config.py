@@ -6,3 +6,60 @@ class Config:
   DB_PORT = os.getenv("DB_PORT")
   DB_USER = os.getenv("DB_USER")
   DB_PASSWORD = os.getenv("DB_PASSWORD")
+  DB_NAME = os.getenv("DB_NAME", "event")
+  # Storage backend: "mysql" (server above) or "sqlite" (embedded, one file)
+  DB_BACKEND = os.getenv("DB_BACKEND", "mysql")
+  SQLITE_PATH = os.getenv("SQLITE_PATH", "event.db")
+  SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "10"))
+  # Password hashing: scrypt cost (N = 2**PASSWORD_SCRYPT_LOG2N, ~16 MB per
+  # hash at 14 with r=8), worker threads (0 = one per core) and how many
+  # hashes may queue for a worker before sign-ins are turned away
+  PASSWORD_SCRYPT_LOG2N = int(os.getenv("PASSWORD_SCRYPT_LOG2N", "14"))
+  PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+  PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+  PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "0"))
+  PASSWORD_QUEUE_SIZE = int(os.getenv("PASSWORD_QUEUE_SIZE", "64"))
+  # Login sessions: HMAC key for the tokens in the page URL (set it, or
+  # sessions end when the app restarts), session lifetime, and how long a
+  # restored session is served from memory before re-reading the table (at
+  # most 60; a logout reaches other app processes within that time)
+  SESSION_SECRET = os.getenv("SESSION_SECRET", "")
+  SESSION_TTL_HOURS = float(os.getenv("SESSION_TTL_HOURS", "12"))
+  SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "30"))
+  SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "10000"))
+  # Connection pool (0 = single shared connection)
+  DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+  DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+  # Apply pending migrations/ when the app first connects
+  DB_AUTO_MIGRATE = os.getenv("DB_AUTO_MIGRATE", "1") == "1"
+  # Query instrumentation: log DatabaseHelper calls slower than this (ms,
+  # 0 = off), show the per-rerun query panel, and raise when a page goes
+  # over its query budget
+  DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+  QUERY_DEBUG = os.getenv("QUERY_DEBUG", "0") == "1"
+  QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "0") == "1"
+  # Render profiler: fraction of reruns to profile (0 = off, 1 = every rerun)
+  # and where the speedscope / collapsed-stack files are written
+  PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+  PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+  # Read cache in DatabaseHelper (TTL and stale window in seconds)
+  CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") == "1"
+  CACHE_TTL = float(os.getenv("CACHE_TTL", "30"))
+  CACHE_STALE_TTL = float(os.getenv("CACHE_STALE_TTL", "0"))
+  CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", "64"))
+  # Events listed per page on the dashboard
+  EVENTS_PAGE_SIZE = int(os.getenv("EVENTS_PAGE_SIZE", "20"))
+  # Live chat: fragment tick and adaptive poll interval bounds (seconds)
+  CHAT_TICK_SECONDS = float(os.getenv("CHAT_TICK_SECONDS", "2"))
+  CHAT_POLL_MIN_SECONDS = float(os.getenv("CHAT_POLL_MIN_SECONDS", "2"))
+  CHAT_POLL_MAX_SECONDS = float(os.getenv("CHAT_POLL_MAX_SECONDS", "30"))
+  # Chat broker: messages buffered per room, and seconds between DB reads per
+  # room (0 = single process, never re-read the DB)
+  CHAT_BUFFER_SIZE = int(os.getenv("CHAT_BUFFER_SIZE", "500"))
+  CHAT_DB_REFRESH_SECONDS = float(os.getenv("CHAT_DB_REFRESH_SECONDS", "2"))
+  # Chat write-behind: queue messages and insert them in batches
+  CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "0") == "1"
+  CHAT_FLUSH_INTERVAL = float(os.getenv("CHAT_FLUSH_INTERVAL", "0.2"))
+  CHAT_MAX_BATCH = int(os.getenv("CHAT_MAX_BATCH", "200"))
+  CHAT_QUEUE_SIZE = int(os.getenv("CHAT_QUEUE_SIZE", "5000"))
+  CHAT_QUEUE_TIMEOUT = float(os.getenv("CHAT_QUEUE_TIMEOUT", "1"))
@@ -0,0 +1,51 @@
+"""
+Shared pytest fixtures: a DatabaseHelper on a fresh, migrated SQLite file
+and factories for the users and events the tests need
+"""
+
+import itertools
+
+import pytest
+
+from backends import SQLiteBackend
+from config import Config
+from db_helper import DatabaseHelper
+from migrate import apply_pending
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """DatabaseHelper on an empty, migrated SQLite database"""
+    # A tiny scrypt cost keeps registration fast
+    monkeypatch.setattr(Config, "PASSWORD_SCRYPT_LOG2N", 4)
+    monkeypatch.setattr(Config, "CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "CHAT_WRITE_BEHIND", False)
+    helper = DatabaseHelper(backend=SQLiteBackend(str(tmp_path / "event.db")))
+    apply_pending(helper)
+    yield helper
+    helper.close()
+
+
+@pytest.fixture
+def make_user(db):
+    """make_user() registers a user and returns their id"""
+    numbers = itertools.count(1)
+
+    def make():
+        number = next(numbers)
+        result = db.register_user("Test", f"User{number}", "+15550000000", f"user{number}@example.com", "secret")
+        return result["user_id"]
+    return make
+
+
+@pytest.fixture
+def make_event(db):
+    """make_event(start_date, status) creates an event and returns its id"""
+    numbers = itertools.count(1)
+
+    def make(start_date="2025-01-01", status="upcoming"):
+        number = next(numbers)
+        result = db.create_event(f"Event {number}", "Technology", "Test", start_date, start_date,
+                                 "09:00:00", "17:00:00", status, f"TEST{number}", None)
+        return result["event_id"]
+    return make
@@ -1,96 +1,395 @@
 """
 Database Helper Module for Event Contact System
-Handles all MySQL database operations using mysql.connector
+Handles all database operations through a storage backend (MySQL via
+mysql.connector by default, or embedded SQLite; see backends.py)
 """
 
-import mysql.connector as con
+from backends import get_backend
 from config import Config
+from query_cache import QueryCache, LISTING, part
+from chat_broker import ChatBroker
+from chat_writer import ChatWriteBehind
+from migrate import apply_pending
+from passwords import PasswordHasher
+from query_log import QueryLog, instrumented
+from rerun_memo import RerunMemo, memoized
+import profiler
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
 from datetime import datetime
-import hashlib
+import threading
+import time
+
+
+_ALL_EVENTS = object()  # Pending invalidation meaning "the whole cache"
+
+
+class TransactionRollback(Exception):
+    """Raise inside DatabaseHelper.transaction() to roll it back"""
 
 
 class DatabaseHelper:
-    def __init__(self):
-        """Initialize database connection"""
-        try:
-            self.mydb = con.connect(
-                host=Config.DB_HOST,
-                user=Config.DB_USER,
-                password=Config.DB_PASSWORD,
-                port=Config.DB_PORT,
-                database="event"  # Your database name
+    def __init__(self, pool_size=0, pool_timeout=None, backend=None):
+        """Initialize database connection
+
+        With pool_size > 0 a connection pool is created and every call checks
+        out its own connection and cursor, so concurrent sessions run their
+        queries in parallel. pool_size=0 keeps the single shared connection.
+        backend defaults to the one picked by DB_BACKEND.
+        """
+        self.backend = backend or get_backend()
+        self.mydb = None
+        self.mycursor = None
+        self.pool = None
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout if pool_timeout is not None else Config.DB_POOL_TIMEOUT
+        self._lock = threading.RLock()
+        self._pool_slots = None
+        self._prefetcher = None
+        self._tx = threading.local()  # This thread's open transaction, if any
+        self._stats_lock = threading.Lock()
+        self._pool_stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "exhausted": 0,
+            "in_use": 0,
+        }
+        self.query_log = QueryLog(
+            slow_ms=Config.DB_SLOW_QUERY_MS,
+            enforce_budgets=Config.QUERY_BUDGET_ENFORCE
+        )
+        self.memo = RerunMemo()
+        self.passwords = PasswordHasher(
+            log2_n=Config.PASSWORD_SCRYPT_LOG2N,
+            r=Config.PASSWORD_SCRYPT_R,
+            p=Config.PASSWORD_SCRYPT_P,
+            workers=Config.PASSWORD_WORKERS or None,
+            queue_size=Config.PASSWORD_QUEUE_SIZE
+        )
+        self.cache = QueryCache(
+            ttl=Config.CACHE_TTL,
+            max_bytes=Config.CACHE_MAX_MB * 1024 * 1024,
+            stale_ttl=Config.CACHE_STALE_TTL,
+            enabled=Config.CACHE_ENABLED
+        )
+        self.chat_broker = ChatBroker(
+            buffer_size=Config.CHAT_BUFFER_SIZE,
+            refresh_interval=Config.CHAT_DB_REFRESH_SECONDS or None
+        )
+        self.chat_writer = None
+        if Config.CHAT_WRITE_BEHIND:
+            self.chat_writer = ChatWriteBehind(
+                self._insert_message_batch,
+                flush_interval=Config.CHAT_FLUSH_INTERVAL,
+                max_batch=Config.CHAT_MAX_BATCH,
+                queue_size=Config.CHAT_QUEUE_SIZE,
+                put_timeout=Config.CHAT_QUEUE_TIMEOUT
             )
-            self.mycursor = self.mydb.cursor(dictionary=True)
+
+        try:
+            if pool_size > 0:
+                self.pool = self.backend.create_pool(pool_size)
+                self._pool_slots = threading.BoundedSemaphore(pool_size)
+                self._prefetcher = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="db-prefetch")
+            else:
+                self.mydb = self.backend.connect()
+                self.mycursor = self.mydb.cursor(dictionary=True)
             print("✅ Database connected successfully!")
         except Exception as e:
             print(f"❌ Database connection error: {e}")
+            self.pool = None
             self.mydb = None
             self.mycursor = None
 
     def close(self):
         """Close database connection"""
+        if self.chat_writer is not None:
+            # Write out queued chat messages while the connections are still open
+            self.chat_writer.close()
+        if self._prefetcher:
+            self._prefetcher.shutdown(wait=False)
+        self.passwords.close()
         if self.mycursor:
             self.mycursor.close()
         if self.mydb:
             self.mydb.close()
 
+    def is_connected(self):
+        """Check whether the database is reachable"""
+        if self.pool is not None:
+            try:
+                with self._connection() as (conn, cursor):
+                    return conn.is_connected()
+            except Exception:
+                return False
+        return bool(self.mydb and self.mydb.is_connected())
+
+    # ==================== CONNECTION HANDLING ====================
+
+    def _checkout(self):
+        """Take a connection from the pool, waiting up to pool_timeout seconds"""
+        start = time.perf_counter()
+        waited = not self._pool_slots.acquire(blocking=False)
+        if waited and not self._pool_slots.acquire(timeout=self.pool_timeout):
+            with self._stats_lock:
+                self._pool_stats["exhausted"] += 1
+            raise self.backend.PoolError("Connection pool exhausted")
+
+        wait_time = time.perf_counter() - start
+        with self._stats_lock:
+            self._pool_stats["checkouts"] += 1
+            self._pool_stats["in_use"] += 1
+            if waited:
+                self._pool_stats["waits"] += 1
+                self._pool_stats["wait_time_total"] += wait_time
+                self._pool_stats["wait_time_max"] = max(self._pool_stats["wait_time_max"], wait_time)
+
+        try:
+            return self.pool.get_connection()
+        except Exception:
+            self._release()
+            raise
+
+    def _release(self):
+        """Give a pool slot back"""
+        with self._stats_lock:
+            self._pool_stats["in_use"] -= 1
+        self._pool_slots.release()
+
+    @contextmanager
+    def _acquire(self):
+        """Check out a (connection, cursor) pair; see _connection"""
+        if self.pool is None:
+            if self.mydb is None:
+                raise RuntimeError("Database not connected")
+            with self._lock:
+                yield self.mydb, self.mycursor
+            return
+
+        conn = self._checkout()
+        try:
+            cursor = conn.cursor(dictionary=True)
+            try:
+                yield conn, cursor
+            finally:
+                cursor.close()
+        finally:
+            conn.close()  # Returns the connection to the pool
+            self._release()
+
+    @contextmanager
+    def _connection(self):
+        """Yield a (connection, cursor) pair for one unit of work
+
+        In pooled mode the cursor is private to this call and the connection
+        goes back to the pool afterwards. Without a pool, the shared
+        connection is used and calls are serialised on a lock. Inside
+        transaction() the transaction's connection is used. Connections run
+        in autocommit mode, so plain reads never see a stale snapshot. Each
+        unit of work counts as one query in the query log.
+        """
+        tx = getattr(self._tx, "state", None)
+        if tx is not None:
+            self.query_log.query()
+            yield tx["conn"], tx["cursor"]
+            return
+
+        with self._acquire() as (conn, cursor):
+            self.query_log.query()
+            yield conn, cursor
+
+    @contextmanager
+    def transaction(self):
+        """Run every DatabaseHelper call in the block as one transaction
+
+        The block's writes are committed together when it ends, or rolled
+        back if it raises (raise TransactionRollback to abort with a message).
+        Calls in the block share one connection (and keep it checked out),
+        nested transaction() blocks join the outer one, and reads in it skip
+        the cache and the rerun memo. Cache entries for the events written
+        are dropped once it ends.
+        """
+        if getattr(self._tx, "state", None) is not None:
+            yield
+            return
+
+        # Reads memoized before the transaction may be stale once it writes
+        self.memo.clear()
+        with self._acquire() as (conn, cursor), self.cache.bypass(), self.memo.attach(None):
+            conn.start_transaction()
+            tx = self._tx.state = {"conn": conn, "cursor": cursor, "events": set()}
+            try:
+                yield
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self._tx.state = None
+                if _ALL_EVENTS in tx["events"]:
+                    self.cache.clear()
+                else:
+                    for event_id, listing, parts in tx["events"]:
+                        self.cache.invalidate(event_id, listing, parts)
+
+    @contextmanager
+    def _write(self):
+        """(connection, cursor) for a multi-statement write: one transaction"""
+        with self.transaction(), self._connection() as (conn, cursor):
+            yield conn, cursor
+
+    def prefetch(self, calls):
+        """Run independent reads concurrently and return {name: result}
+
+        calls maps a name to (method, args). With a pool every read gets its
+        own pooled connection, so the batch takes about as long as its slowest
+        read; on the single shared connection they run one after another.
+        The reads count toward the calling thread's query scope and profile
+        and fill its rerun memo. Inside a transaction they run inline on the
+        transaction's connection, so they see its uncommitted writes and
+        don't need more pool connections.
+        """
+        in_transaction = getattr(self._tx, "state", None) is not None
+        if self._prefetcher is None or len(calls) < 2 or in_transaction:
+            return {name: method(*args) for name, (method, args) in calls.items()}
+
+        scope = self.query_log.current_scope()
+        memo = self.memo.current()
+        profile = profiler.active()
+
+        def run(method, args):
+            with self.query_log.attach(scope), self.memo.attach(memo), profiler.attach(profile):
+                return method(*args)
+
+        futures = {
+            name: self._prefetcher.submit(run, method, args)
+            for name, (method, args) in calls.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+    def pool_stats(self):
+        """Return pool usage metrics (checkouts, waits, wait times, exhaustion)"""
+        with self._stats_lock:
+            stats = dict(self._pool_stats)
+        stats["pool_size"] = self.pool_size if self.pool is not None else 0
+        stats["wait_time_avg"] = stats["wait_time_total"] / stats["waits"] if stats["waits"] else 0.0
+        return stats
+
+    def cache_stats(self):
+        """Return read cache hit ratios and the number of DB reads saved"""
+        return self.cache.stats()
+
+    def query_stats(self):
+        """Return per-method call counts, rows and timings"""
+        return self.query_log.stats()
+
+    def memo_stats(self):
+        """Return rerun memo hits, misses and clears"""
+        return self.memo.stats()
+
+    def _invalidate(self, event_id=None, listing=True, parts=None):
+        """After a write: drop the rerun memo and the affected cache entries
+
+        listing=False keeps the event listings (dashboard, all events) for
+        writes that don't change what they show, such as chat messages.
+        parts (e.g. ("messages",)) limits it to those parts of the event.
+        Inside a transaction the cache entries are dropped when it ends.
+        """
+        self.memo.clear()
+        tx = getattr(self._tx, "state", None)
+        if tx is not None:
+            tx["events"].add((event_id, listing, tuple(parts) if parts else None))
+        else:
+            self.cache.invalidate(event_id, listing, parts)
+
+    def _invalidate_all(self):
+        """After an arbitrary write: drop the rerun memo and the whole cache"""
+        self.memo.clear()
+        tx = getattr(self._tx, "state", None)
+        if tx is not None:
+            tx["events"].add(_ALL_EVENTS)
+        else:
+            self.cache.clear()
+
     # ==================== USER OPERATIONS ====================
 
+    @instrumented
     def register_user(self, first_name, last_name, mobile_no, username, password, role="participant"):
         """Register a new user"""
         try:
-            # Hash password for security
-            hashed_password = hashlib.sha256(password.encode()).hexdigest()
-            
+            # Salted scrypt hash, computed on the password worker pool
+            hashed_password = self.passwords.hash(password)
+
             query = """
             INSERT INTO users (first_name, last_name, mobile_no, username, rpassword, rrole)
             VALUES (%s, %s, %s, %s, %s, %s)
             """
             values = (first_name, last_name, mobile_no, username, hashed_password, role)
-            
-            self.mycursor.execute(query, values)
-            self.mydb.commit()
-            
-            return {"success": True, "user_id": self.mycursor.lastrowid}
-        except con.IntegrityError:
+
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, values)
+                self.memo.clear()
+                return {"success": True, "user_id": cursor.lastrowid}
+        except self.backend.IntegrityError:
             return {"success": False, "error": "Username already exists"}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
     def login_user(self, username, password):
-        """Authenticate user login"""
+        """Authenticate user login
+
+        The user is looked up by username and the password checked against
+        the stored hash in constant time. Legacy SHA-256 hashes (and hashes
+        made with an older cost) are replaced on a successful login.
+        """
         try:
-            hashed_password = hashlib.sha256(password.encode()).hexdigest()
-            
             query = """
-            SELECT user_ID, first_name, last_name, mobile_no, username, rrole
+            SELECT user_ID, first_name, last_name, mobile_no, username, rrole, rpassword
             FROM users
-            WHERE username = %s AND rpassword = %s
+            WHERE username = %s
             """
-            
-            self.mycursor.execute(query, (username, hashed_password))
-            user = self.mycursor.fetchone()
-            
-            if user:
-                return {"success": True, "user": user}
-            else:
+
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (username,))
+                user = cursor.fetchone()
+
+            stored = user.pop("rpassword") if user else None
+            if not self.passwords.verify(password, stored):
                 return {"success": False, "error": "Invalid credentials"}
+
+            if self.passwords.needs_rehash(stored):
+                # Hash before checking out a connection, so the slow part
+                # doesn't hold one (or the shared connection's lock)
+                new_hash = self.passwords.hash(password)
+                with self._connection() as (conn, cursor):
+                    cursor.execute(
+                        "UPDATE users SET rpassword = %s WHERE user_ID = %s",
+                        (new_hash, user["user_ID"])
+                    )
+            return {"success": True, "user": user}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def get_user_by_id(self, user_id):
         """Get user details by ID"""
         try:
             query = "SELECT * FROM users WHERE user_ID = %s"
-            self.mycursor.execute(query, (user_id,))
-            return self.mycursor.fetchone()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error: {e}")
             return None
 
     # ==================== EVENT OPERATIONS ====================
 
-    def create_event(self, title, category, event_description, start_date, end_date, 
+    @instrumented
+    def create_event(self, title, category, event_description, start_date, end_date,
                      start_time, end_time, event_status, event_code, organiser_id, type_of_event="conference"):
         """Create a new event"""
         try:
@@ -101,114 +400,284 @@ class DatabaseHelper:
             """
             values = (title, category, event_description, start_date, end_date,
                      start_time, end_time, event_status, event_code, organiser_id, type_of_event)
-            
-            self.mycursor.execute(query, values)
-            self.mydb.commit()
-            
-            return {"success": True, "event_id": self.mycursor.lastrowid}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
 
-    def get_all_events(self):
-        """Get all events"""
-        try:
-            query = """
-            SELECT e.*, o.organiser_name
-            FROM eventz e
-            LEFT JOIN organiser o ON e.organiser_id = o.organiser_id
-            ORDER BY e.start_date DESC
-            """
-            self.mycursor.execute(query)
-            return self.mycursor.fetchall()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, values)
+                event_id = cursor.lastrowid
+            self._invalidate()
+            return {"success": True, "event_id": event_id}
         except Exception as e:
-            print(f"Error: {e}")
-            return []
+            return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def get_event_by_id(self, event_id):
         """Get event details by ID"""
-        try:
+        def load():
             query = """
             SELECT e.*, o.organiser_name, o.email as organiser_email
             FROM eventz e
             LEFT JOIN organiser o ON e.organiser_id = o.organiser_id
             WHERE e.event_id = %s
             """
-            self.mycursor.execute(query, (event_id,))
-            return self.mycursor.fetchone()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (event_id,))
+                return cursor.fetchone()
+
+        try:
+            return self.cache.get_or_load("event", (event_id,), event_id, load)
         except Exception as e:
             print(f"Error: {e}")
             return None
 
+    @instrumented
+    @memoized
     def get_event_by_code(self, event_code):
         """Get event by event code"""
         try:
             query = "SELECT * FROM eventz WHERE event_code = %s"
-            self.mycursor.execute(query, (event_code,))
-            return self.mycursor.fetchone()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (event_code,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error: {e}")
             return None
 
-    def get_events_by_status(self, status):
-        """Get events filtered by status"""
+    # Event listings are ordered newest first on (start_date, event_id) and
+    # support keyset pagination: pass the last row's cursor as `after`.
+
+    def _keyset_clause(self, conditions, params, after, limit):
+        """Add the keyset condition and return the ORDER BY / LIMIT suffix"""
+        if after is not None:
+            start_date, event_id = after
+            conditions.append("(e.start_date < %s OR (e.start_date = %s AND e.event_id < %s))")
+            params.extend([start_date, start_date, event_id])
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        suffix = " ORDER BY e.start_date DESC, e.event_id DESC"
+        if limit is not None:
+            suffix += " LIMIT %s"
+            params.append(limit)
+        return where + suffix
+
+    @staticmethod
+    def event_cursor(event):
+        """Cursor pointing just past an event row"""
+        return (event["start_date"], event["event_id"])
+
+    @instrumented
+    @memoized
+    def get_all_events(self, after=None, limit=None):
+        """Get all events (optionally one keyset page)"""
+        def load():
+            query = """
+            SELECT e.*, o.organiser_name
+            FROM eventz e
+            LEFT JOIN organiser o ON e.organiser_id = o.organiser_id
+            """
+            params = []
+            query += self._keyset_clause([], params, after, limit)
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
+
+        try:
+            return self.cache.get_or_load("all_events", (after, limit), LISTING, load)
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
+
+    @instrumented
+    @memoized
+    def get_events_by_status(self, status, after=None, limit=None):
+        """Get events filtered by status (optionally one keyset page)"""
         try:
             query = """
             SELECT e.*, o.organiser_name
             FROM eventz e
             LEFT JOIN organiser o ON e.organiser_id = o.organiser_id
-            WHERE e.event_status = %s
-            ORDER BY e.start_date DESC
             """
-            self.mycursor.execute(query, (status,))
-            return self.mycursor.fetchall()
+            params = [status]
+            query += self._keyset_clause(["e.event_status = %s"], params, after, limit)
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error: {e}")
             return []
 
-    def get_user_events(self, user_id):
-        """Get all events a user has joined"""
+    @instrumented
+    @memoized
+    def get_user_events(self, user_id, after=None, limit=None):
+        """Get all events a user has joined (optionally one keyset page)"""
         try:
             query = """
             SELECT e.*, o.organiser_name
             FROM eventz e
             INNER JOIN joins j ON e.event_id = j.event_id
             LEFT JOIN organiser o ON e.organiser_id = o.organiser_id
-            WHERE j.user_id = %s
-            ORDER BY e.start_date DESC
             """
-            self.mycursor.execute(query, (user_id,))
-            return self.mycursor.fetchall()
+            params = [user_id]
+            query += self._keyset_clause(["j.user_id = %s"], params, after, limit)
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error: {e}")
             return []
 
+    @instrumented
+    @memoized
+    def get_events_dashboard(self, user_id, status=None, only_joined=False, after=None, limit=None):
+        """Get events with their stats and the user's role in one query
+
+        Each row carries announcement_count, subevent_count, schedule_count
+        and message_count (main chat), plus user_role (None if not joined).
+        Message counts are cached per event, apart from the listing, so chat
+        traffic doesn't invalidate the listing for everyone.
+        """
+        def load():
+            query = """
+            SELECT e.*, o.organiser_name, j.user_role,
+                (SELECT COUNT(*) FROM Containz c WHERE c.event_id = e.event_id) AS announcement_count,
+                (SELECT COUNT(*) FROM Have h WHERE h.event_id = e.event_id) AS subevent_count,
+                (SELECT COUNT(*) FROM Event_Schedule es WHERE es.event_id = e.event_id) AS schedule_count
+            FROM eventz e
+            LEFT JOIN organiser o ON e.organiser_id = o.organiser_id
+            LEFT JOIN joins j ON j.event_id = e.event_id AND j.user_id = %s
+            """
+            conditions = []
+            params = [user_id]
+            if status:
+                conditions.append("e.event_status = %s")
+                params.append(status)
+            if only_joined:
+                conditions.append("j.user_id IS NOT NULL")
+            query += self._keyset_clause(conditions, params, after, limit)
+
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
+
+        try:
+            key = (user_id, status, only_joined, after, limit)
+            events = self.cache.get_or_load("events_dashboard", key, LISTING, load)
+            counts = self._message_counts([event["event_id"] for event in events])
+            return [dict(event, message_count=counts[event["event_id"]]) for event in events]
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
+
+    def _message_counts(self, event_ids):
+        """{event_id: main chat message count}, cached per event as its "messages" part"""
+        scopes = {part("messages", event_id): event_id for event_id in event_ids}
+
+        def load(missing):
+            missing_ids = [scopes[scope] for scope in missing]
+            placeholders = ", ".join(["%s"] * len(missing_ids))
+            query = f"""
+            SELECT event_id, COUNT(*) AS message_count
+            FROM chat_messages
+            WHERE event_id IN ({placeholders}) AND sub_event_id IS NULL
+            GROUP BY event_id
+            """
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(missing_ids))
+                counts = {row["event_id"]: row["message_count"] for row in cursor.fetchall()}
+            return {part("messages", event_id): counts.get(event_id, 0) for event_id in missing_ids}
+
+        if not event_ids:
+            return {}
+        counts = self.cache.get_or_load_many("event_message_count", list(scopes), load)
+        return {event_id: counts[scope] for scope, event_id in scopes.items()}
+
+    @instrumented
+    @memoized
+    def get_events_page(self, user_id, status=None, only_joined=False, after=None, page_size=20):
+        """Get one dashboard page plus the cursor for the next one
+
+        Returns {"events": [...], "next_cursor": cursor or None}.
+        """
+        rows = self.get_events_dashboard(user_id, status, only_joined, after, page_size + 1)
+        events = rows[:page_size]
+        next_cursor = self.event_cursor(events[-1]) if len(rows) > page_size else None
+        return {"events": events, "next_cursor": next_cursor}
+
     # ==================== JOIN EVENT OPERATIONS ====================
 
-    def join_event(self, user_id, event_id):
-        """User joins an event"""
+    @instrumented
+    def join_event(self, user_id, event_id, role="participant"):
+        """User joins an event with a role, in one statement
+
+        Idempotent: joining an event the user is already in changes nothing.
+        Returns "joined": True only when the user was newly added. Other
+        failures (such as an event that no longer exists) are errors.
+        """
         try:
-            query = "INSERT INTO joins (user_id, event_id) VALUES (%s, %s)"
-            self.mycursor.execute(query, (user_id, event_id))
-            self.mydb.commit()
-            return {"success": True}
-        except con.IntegrityError:
-            return {"success": False, "error": "Already joined this event"}
+            query = "INSERT INTO joins (user_id, event_id, user_role) VALUES (%s, %s, %s)"
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id, event_id, role))
+            self._invalidate(event_id)
+            return {"success": True, "joined": True}
+        except self.backend.IntegrityError as e:
+            if self.backend.is_duplicate_key(e):
+                return {"success": True, "joined": False}
+            return {"success": False, "error": str(e)}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def check_user_joined_event(self, user_id, event_id):
         """Check if user has joined an event"""
         try:
             query = "SELECT * FROM joins WHERE user_id = %s AND event_id = %s"
-            self.mycursor.execute(query, (user_id, event_id))
-            return self.mycursor.fetchone() is not None
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id, event_id))
+                return cursor.fetchone() is not None
         except Exception as e:
             print(f"Error: {e}")
             return False
 
+    @instrumented
+    @memoized
+    def get_event_participants(self, event_id):
+        """Get every member of an event with their role"""
+        def load():
+            query = """
+            SELECT u.user_ID AS user_id, u.first_name, u.last_name, u.username, j.user_role
+            FROM joins j
+            INNER JOIN users u ON u.user_ID = j.user_id
+            WHERE j.event_id = %s
+            ORDER BY u.first_name, u.last_name
+            """
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (event_id,))
+                return cursor.fetchall()
+
+        try:
+            return self.cache.get_or_load("event_participants", (event_id,), event_id, load)
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
+
+    @instrumented
+    @memoized
+    def get_user_event_roles(self, user_id):
+        """Get a {event_id: user_role} map of every event a user has joined"""
+        try:
+            query = "SELECT event_id, user_role FROM joins WHERE user_id = %s"
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id,))
+                rows = cursor.fetchall()
+            return {row["event_id"]: row["user_role"] or "participant" for row in rows}
+        except Exception as e:
+            print(f"Error: {e}")
+            return {}
+
     # ==================== ANNOUNCEMENT OPERATIONS ====================
 
-    def create_announcement(self, announcement_text, author_username, event_id, 
+    @instrumented
+    def create_announcement(self, announcement_text, author_username, event_id,
                            file_name=None, file_type=None, venue_id=None):
         """Create a new announcement"""
         try:
@@ -218,22 +687,24 @@ class DatabaseHelper:
             VALUES (%s, %s, %s, %s, %s)
             """
             values = (announcement_text, author_username, file_name, file_type, venue_id)
-            
-            self.mycursor.execute(query, values)
-            announcement_id = self.mycursor.lastrowid
-            
-            # Link announcement to event
-            link_query = "INSERT INTO Containz (event_id, announcement_id) VALUES (%s, %s)"
-            self.mycursor.execute(link_query, (event_id, announcement_id))
-            
-            self.mydb.commit()
+
+            with self._write() as (conn, cursor):
+                cursor.execute(query, values)
+                announcement_id = cursor.lastrowid
+
+                # Link announcement to event
+                link_query = "INSERT INTO Containz (event_id, announcement_id) VALUES (%s, %s)"
+                cursor.execute(link_query, (event_id, announcement_id))
+            self._invalidate(event_id)
             return {"success": True, "announcement_id": announcement_id}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def get_event_announcements(self, event_id):
         """Get all announcements for an event"""
-        try:
+        def load():
             query = """
             SELECT a.*
             FROM announcements a
@@ -241,90 +712,194 @@ class DatabaseHelper:
             WHERE c.event_id = %s
             ORDER BY a.created_at DESC
             """
-            self.mycursor.execute(query, (event_id,))
-            return self.mycursor.fetchall()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (event_id,))
+                return cursor.fetchall()
+
+        try:
+            return self.cache.get_or_load("event_announcements", (event_id,), event_id, load)
         except Exception as e:
             print(f"Error: {e}")
             return []
 
     # ==================== CHAT OPERATIONS ====================
 
-    def send_message(self, event_id, sender_username, chat_message_text, 
-                    subevent_name="", idx_event_chat=0, idx_subevent_chat=0):
-        """Send a chat message"""
+    # Chat rooms are keyed by (event_id, sub_event_id); sub_event_id None is
+    # the main event chat. subevent_name is only stored as a label.
+
+    @instrumented
+    def send_message(self, event_id, sender_username, chat_message_text,
+                    subevent_name="", idx_event_chat=0, idx_subevent_chat=0, sub_event_id=None):
+        """Send a chat message
+
+        In write-behind mode the message is queued and the result carries a
+        provisional_id instead of a chat_id.
+        """
+        message = {
+            "event_id": event_id,
+            "sub_event_id": sub_event_id,
+            "subevent_name": subevent_name,
+            "sender_username": sender_username,
+            "idx_event_chat": idx_event_chat,
+            "idx_subevent_chat": idx_subevent_chat,
+            "chat_message_text": chat_message_text,
+        }
+        if self.chat_writer is not None:
+            return self.chat_writer.submit(message)
+
         try:
-            query = """
-            INSERT INTO chat_messages (event_id, subevent_name, sender_username, 
-                                      idx_event_chat, idx_subevent_chat, chat_message_text)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            values = (event_id, subevent_name, sender_username, 
-                     idx_event_chat, idx_subevent_chat, chat_message_text)
-            
-            self.mycursor.execute(query, values)
-            self.mydb.commit()
-            
-            return {"success": True, "chat_id": self.mycursor.lastrowid}
+            chat_id = self._insert_message_batch([message])[0]
+            return {"success": True, "chat_id": chat_id}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
-    def get_event_chat(self, event_id, limit=50):
-        """Get event chat messages (main event chat)"""
+    def _insert_message_batch(self, messages):
+        """Insert chat messages in one transaction (one commit)
+
+        Publishes the stored rows to the chat broker and returns their ids.
+        """
+        rooms = {(message["event_id"], message["sub_event_id"]) for message in messages}
+        query = """
+        INSERT INTO chat_messages (event_id, sub_event_id, subevent_name, sender_username,
+                                  idx_event_chat, idx_subevent_chat, chat_message_text)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        """
+
+        with ExitStack() as stack:
+            for room in rooms:
+                stack.enter_context(self.chat_broker.writing(room))
+
+            # One INSERT per row: the ids of a multi-row INSERT need not be
+            # consecutive (InnoDB interleaved auto-increment locking,
+            # auto_increment_increment > 1), so each row's own id is read back
+            chat_ids = []
+            with self._write() as (conn, cursor):
+                for message in messages:
+                    cursor.execute(query, (
+                        message["event_id"], message["sub_event_id"], message["subevent_name"],
+                        message["sender_username"], message["idx_event_chat"],
+                        message["idx_subevent_chat"], message["chat_message_text"]
+                    ))
+                    chat_ids.append(cursor.lastrowid)
+
+            # Hand the new rows to sessions watching these rooms
+            created_at = datetime.now()
+            for chat_id, message in zip(chat_ids, messages):
+                row = {key: value for key, value in message.items() if key != "provisional_id"}
+                row.update(chat_id=chat_id, created_at=created_at)
+                self.chat_broker.publish((row["event_id"], row["sub_event_id"]), row)
+
+        # Only the message counts change; the event's other entries stay cached
+        for event_id in {message["event_id"] for message in messages}:
+            self._invalidate(event_id, listing=False, parts=("messages",))
+        return chat_ids
+
+    def chat_writer_stats(self):
+        """Return write-behind queue metrics (None when the mode is off)"""
+        return self.chat_writer.stats() if self.chat_writer is not None else None
+
+    def _room_condition(self, event_id, sub_event_id):
+        """WHERE clause and params selecting one chat room"""
+        if sub_event_id is None:
+            return "event_id = %s AND sub_event_id IS NULL", [event_id]
+        return "event_id = %s AND sub_event_id = %s", [event_id, sub_event_id]
+
+    # Chat reads walk backwards by chat_id: pass the oldest chat_id already
+    # shown as `before_id` to get the page before it.
+
+    @instrumented
+    def get_room_chat(self, event_id, sub_event_id=None, limit=50, before_id=None):
+        """Get one page of a chat room, oldest first"""
         try:
-            query = """
-            SELECT * FROM chat_messages
-            WHERE event_id = %s AND subevent_name = ''
-            ORDER BY created_at DESC
-            LIMIT %s
-            """
-            self.mycursor.execute(query, (event_id, limit))
-            messages = self.mycursor.fetchall()
+            condition, params = self._room_condition(event_id, sub_event_id)
+            query = f"SELECT * FROM chat_messages WHERE {condition}"
+            if before_id is not None:
+                query += " AND chat_id < %s"
+                params.append(before_id)
+            query += " ORDER BY chat_id DESC LIMIT %s"
+            params.append(limit)
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(params))
+                messages = cursor.fetchall()
             return list(reversed(messages))  # Return in chronological order
         except Exception as e:
             print(f"Error: {e}")
             return []
 
-    def get_subevent_chat(self, event_id, subevent_name, limit=50):
-        """Get subevent chat messages"""
+    @instrumented
+    def get_room_chat_since(self, event_id, sub_event_id, after_id, limit=100):
+        """Get chat room messages newer than after_id (oldest first)"""
         try:
-            query = """
+            condition, params = self._room_condition(event_id, sub_event_id)
+            query = f"""
             SELECT * FROM chat_messages
-            WHERE event_id = %s AND subevent_name = %s
-            ORDER BY created_at DESC
+            WHERE {condition} AND chat_id > %s
+            ORDER BY chat_id ASC
             LIMIT %s
             """
-            self.mycursor.execute(query, (event_id, subevent_name, limit))
-            messages = self.mycursor.fetchall()
-            return list(reversed(messages))
+            params.extend([after_id, limit])
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error: {e}")
             return []
 
+    @instrumented
+    def get_event_chat(self, event_id, limit=50, before_id=None):
+        """Get event chat messages (main event chat)"""
+        return self.get_room_chat(event_id, None, limit, before_id)
+
+    @instrumented
+    def get_subevent_chat(self, event_id, sub_event_id, limit=50, before_id=None):
+        """Get subevent chat messages"""
+        return self.get_room_chat(event_id, sub_event_id, limit, before_id)
+
+    @instrumented
+    def get_event_chat_since(self, event_id, after_id, limit=100):
+        """Get main event chat messages newer than after_id (oldest first)"""
+        return self.get_room_chat_since(event_id, None, after_id, limit)
+
+    @instrumented
+    def get_subevent_chat_since(self, event_id, sub_event_id, after_id, limit=100):
+        """Get subevent chat messages newer than after_id (oldest first)"""
+        return self.get_room_chat_since(event_id, sub_event_id, after_id, limit)
+
+    def subscribe_chat(self, event_id, sub_event_id, after_id):
+        """Watch a chat room through the in-process broker"""
+        return self.chat_broker.subscribe(
+            (event_id, sub_event_id), after_id,
+            lambda since_id: self.get_room_chat_since(event_id, sub_event_id, since_id)
+        )
+
     # ==================== SUBEVENT OPERATIONS ====================
 
-    def create_subevent(self, sub_event_name, description, event_id, venue_id=None):
-        """Create a new subevent"""
+    @instrumented
+    def create_subevent(self, sub_event_name, description, event_id, venue_id=None, capacity=None):
+        """Create a new subevent (capacity None or 0 = unlimited)"""
         try:
             # Insert subevent
             query = """
-            INSERT INTO sub_events (sub_event_name, decription, venue_id)
-            VALUES (%s, %s, %s)
+            INSERT INTO sub_events (sub_event_name, decription, venue_id, capacity)
+            VALUES (%s, %s, %s, %s)
             """
-            self.mycursor.execute(query, (sub_event_name, description, venue_id))
-            sub_event_id = self.mycursor.lastrowid
-            
-            # Link subevent to event
-            link_query = "INSERT INTO Have (event_id, sub_event_id) VALUES (%s, %s)"
-            self.mycursor.execute(link_query, (event_id, sub_event_id))
-            
-            self.mydb.commit()
+            with self._write() as (conn, cursor):
+                cursor.execute(query, (sub_event_name, description, venue_id, capacity or None))
+                sub_event_id = cursor.lastrowid
+
+                # Link subevent to event
+                link_query = "INSERT INTO Have (event_id, sub_event_id) VALUES (%s, %s)"
+                cursor.execute(link_query, (event_id, sub_event_id))
+            self._invalidate(event_id)
             return {"success": True, "sub_event_id": sub_event_id}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def get_event_subevents(self, event_id):
         """Get all subevents for an event"""
-        try:
+        def load():
             query = """
             SELECT s.*
             FROM sub_events s
@@ -332,14 +907,198 @@ class DatabaseHelper:
             WHERE h.event_id = %s
             ORDER BY s.created_at DESC
             """
-            self.mycursor.execute(query, (event_id,))
-            return self.mycursor.fetchall()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (event_id,))
+                return cursor.fetchall()
+
+        try:
+            return self.cache.get_or_load("event_subevents", (event_id,), event_id, load)
         except Exception as e:
             print(f"Error: {e}")
             return []
 
+    @instrumented
+    @memoized
+    def get_subevents_overview(self, event_id, user_id):
+        """Get an event's subevents with participant and waitlist counts, and
+        whether user_id is registered or waitlisted
+
+        One grouped query for the whole list, instead of a registration check
+        and a count per subevent.
+        """
+        def load():
+            query = """
+            SELECT s.*,
+                   COUNT(sp.user_id) AS participants_count,
+                   MAX(CASE WHEN sp.user_id = %s THEN 1 ELSE 0 END) AS is_registered,
+                   (SELECT COUNT(*) FROM Subevent_Waitlist w
+                    WHERE w.sub_event_id = s.sub_event_id) AS waitlist_count,
+                   (SELECT COUNT(*) FROM Subevent_Waitlist w
+                    WHERE w.sub_event_id = s.sub_event_id AND w.user_id = %s) AS is_waitlisted
+            FROM Have h
+            INNER JOIN sub_events s ON s.sub_event_id = h.sub_event_id
+            LEFT JOIN Subevent_Participants sp ON sp.sub_event_id = h.sub_event_id
+            WHERE h.event_id = %s
+            GROUP BY s.sub_event_id
+            ORDER BY s.created_at DESC
+            """
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id, user_id, event_id))
+                subevents = cursor.fetchall()
+            for subevent in subevents:
+                subevent["is_registered"] = bool(subevent["is_registered"])
+                subevent["is_waitlisted"] = bool(subevent["is_waitlisted"])
+            return subevents
+
+        try:
+            return self.cache.get_or_load("subevents_overview", (event_id, user_id), part("subevents", event_id), load)
+        except Exception as e:
+            print(f"Error: {e}")
+            return []
+
+    @instrumented
+    def check_subevent_registration(self, user_id, sub_event_id):
+        """Check if user is registered for a subevent"""
+        try:
+            query = "SELECT 1 FROM Subevent_Participants WHERE user_id = %s AND sub_event_id = %s"
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id, sub_event_id))
+                return cursor.fetchone() is not None
+        except Exception as e:
+            print(f"Error: {e}")
+            return False
+
+    @instrumented
+    def get_subevent_participants_count(self, sub_event_id):
+        """Get the number of users registered for a subevent"""
+        try:
+            query = "SELECT COUNT(*) AS participants FROM Subevent_Participants WHERE sub_event_id = %s"
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (sub_event_id,))
+                return cursor.fetchone()["participants"]
+        except Exception as e:
+            print(f"Error: {e}")
+            return 0
+
+    @instrumented
+    def join_subevent(self, user_id, sub_event_id):
+        """Register a user for a subevent, or put them on its waitlist when full
+
+        The subevent row is locked for the check and the insert, so concurrent
+        joins can't overbook it. Returns status "joined" or "waitlisted" (with
+        the 1-based waitlist position).
+        """
+        try:
+            with self._write() as (conn, cursor):
+                subevent = self._lock_subevent(cursor, sub_event_id)
+                if subevent is None:
+                    return {"success": False, "error": "Subevent not found"}
+
+                cursor.execute(
+                    "SELECT 1 FROM Subevent_Participants WHERE user_id = %s AND sub_event_id = %s",
+                    (user_id, sub_event_id)
+                )
+                if cursor.fetchone() is not None:
+                    return {"success": False, "error": "Already registered for this subevent"}
+
+                capacity = subevent["capacity"]
+                if not capacity or self._participant_count(cursor, sub_event_id) < capacity:
+                    cursor.execute(
+                        "INSERT INTO Subevent_Participants (user_id, sub_event_id) VALUES (%s, %s)",
+                        (user_id, sub_event_id)
+                    )
+                    result = {"success": True, "status": "joined"}
+                else:
+                    cursor.execute(
+                        "INSERT INTO Subevent_Waitlist (user_id, sub_event_id) VALUES (%s, %s)",
+                        (user_id, sub_event_id)
+                    )
+                    cursor.execute(
+                        "SELECT COUNT(*) AS position FROM Subevent_Waitlist "
+                        "WHERE sub_event_id = %s AND waitlist_id <= %s",
+                        (sub_event_id, cursor.lastrowid)
+                    )
+                    result = {"success": True, "status": "waitlisted", "position": cursor.fetchone()["position"]}
+            self._invalidate(subevent["event_id"], listing=False, parts=("subevents",))
+            return result
+        except self.backend.IntegrityError:
+            return {"success": False, "error": "Already on the waitlist for this subevent"}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @instrumented
+    def leave_subevent(self, user_id, sub_event_id):
+        """Remove a user from a subevent (or its waitlist)
+
+        Freed places go to the waitlist in FIFO order, in the same
+        transaction. Returns the promoted user ids.
+        """
+        try:
+            with self._write() as (conn, cursor):
+                subevent = self._lock_subevent(cursor, sub_event_id)
+                if subevent is None:
+                    return {"success": False, "error": "Subevent not found"}
+
+                cursor.execute(
+                    "DELETE FROM Subevent_Participants WHERE user_id = %s AND sub_event_id = %s",
+                    (user_id, sub_event_id)
+                )
+                left = cursor.rowcount
+                cursor.execute(
+                    "DELETE FROM Subevent_Waitlist WHERE user_id = %s AND sub_event_id = %s",
+                    (user_id, sub_event_id)
+                )
+                promoted = self._promote_waitlist(cursor, sub_event_id, subevent["capacity"]) if left else []
+            self._invalidate(subevent["event_id"], listing=False, parts=("subevents",))
+            return {"success": True, "promoted": promoted}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def _lock_subevent(self, cursor, sub_event_id):
+        """Lock a subevent's row until commit; joins and leaves on it queue here"""
+        cursor.execute("""
+        SELECT s.capacity, h.event_id
+        FROM sub_events s
+        LEFT JOIN Have h ON h.sub_event_id = s.sub_event_id
+        WHERE s.sub_event_id = %s
+        FOR UPDATE
+        """, (sub_event_id,))
+        return cursor.fetchone()
+
+    def _participant_count(self, cursor, sub_event_id):
+        cursor.execute(
+            "SELECT COUNT(*) AS participants FROM Subevent_Participants WHERE sub_event_id = %s",
+            (sub_event_id,)
+        )
+        return cursor.fetchone()["participants"]
+
+    def _promote_waitlist(self, cursor, sub_event_id, capacity):
+        """Move waitlisted users into free places, oldest first"""
+        free = capacity - self._participant_count(cursor, sub_event_id) if capacity else None
+        query = "SELECT waitlist_id, user_id FROM Subevent_Waitlist WHERE sub_event_id = %s ORDER BY waitlist_id"
+        params = [sub_event_id]
+        if free is not None:
+            if free <= 0:
+                return []
+            query += " LIMIT %s"
+            params.append(free)
+        cursor.execute(query, tuple(params))
+        waiting = cursor.fetchall()
+        if not waiting:
+            return []
+        cursor.executemany(
+            "INSERT INTO Subevent_Participants (user_id, sub_event_id) VALUES (%s, %s)",
+            [(row["user_id"], sub_event_id) for row in waiting]
+        )
+        cursor.executemany(
+            "DELETE FROM Subevent_Waitlist WHERE waitlist_id = %s",
+            [(row["waitlist_id"],) for row in waiting]
+        )
+        return [row["user_id"] for row in waiting]
+
     # ==================== SCHEDULE OPERATIONS ====================
 
+    @instrumented
     def add_schedule(self, event_id, title, description, schedule_date, schedule_time, location, added_by_user_id):
         """Add a schedule item to an event"""
         try:
@@ -348,19 +1107,22 @@ class DatabaseHelper:
             VALUES (%s, %s, %s, %s, %s, %s, %s)
             """
             values = (event_id, title, description, schedule_date, schedule_time, location, added_by_user_id)
-            
-            self.mycursor.execute(query, values)
-            self.mydb.commit()
-            
-            return {"success": True, "schedule_id": self.mycursor.lastrowid}
+
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, values)
+                schedule_id = cursor.lastrowid
+            self._invalidate(event_id)
+            return {"success": True, "schedule_id": schedule_id}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def get_event_schedules(self, event_id):
         """Get all schedule items for an event, ordered by date and time"""
-        try:
+        def load():
             query = """
-            SELECT 
+            SELECT
                 es.*,
                 u.first_name,
                 u.last_name,
@@ -371,41 +1133,113 @@ class DatabaseHelper:
             WHERE es.event_id = %s
             ORDER BY es.schedule_date ASC, es.schedule_time ASC
             """
-            self.mycursor.execute(query, (event_id,))
-            return self.mycursor.fetchall()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (event_id,))
+                return cursor.fetchall()
+
+        try:
+            return self.cache.get_or_load("event_schedules", (event_id,), event_id, load)
         except Exception as e:
             print(f"Error fetching schedules: {e}")
             return []
 
+    @instrumented
     def delete_schedule(self, schedule_id):
         """Delete a schedule item"""
         try:
             query = "DELETE FROM Event_Schedule WHERE schedule_id = %s"
-            self.mycursor.execute(query, (schedule_id,))
-            self.mydb.commit()
+            with self._connection() as (conn, cursor):
+                event_id = self._schedule_event_id(cursor, schedule_id)
+                cursor.execute(query, (schedule_id,))
+            self._invalidate(event_id)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
     def update_schedule(self, schedule_id, title, description, schedule_date, schedule_time, location):
         """Update a schedule item"""
         try:
             query = """
-            UPDATE Event_Schedule 
+            UPDATE Event_Schedule
             SET title = %s, description = %s, schedule_date = %s, schedule_time = %s, location = %s
             WHERE schedule_id = %s
             """
             values = (title, description, schedule_date, schedule_time, location, schedule_id)
-            
-            self.mycursor.execute(query, values)
-            self.mydb.commit()
-            
+
+            with self._connection() as (conn, cursor):
+                event_id = self._schedule_event_id(cursor, schedule_id)
+                cursor.execute(query, values)
+            self._invalidate(event_id, listing=False)
+
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    def _schedule_event_id(self, cursor, schedule_id):
+        """Look up which event a schedule item belongs to"""
+        cursor.execute("SELECT event_id FROM Event_Schedule WHERE schedule_id = %s", (schedule_id,))
+        row = cursor.fetchone()
+        return row["event_id"] if row else None
+
+    # ==================== SESSION OPERATIONS ====================
+
+    @instrumented
+    def create_session(self, session_id, user_id, expires_at, current_page="events"):
+        """Store a new login session, dropping expired ones in the same commit"""
+        try:
+            with self._write() as (conn, cursor):
+                cursor.execute("DELETE FROM User_Sessions WHERE expires_at < %s", (datetime.now(),))
+                cursor.execute("""
+                INSERT INTO User_Sessions (session_id, user_id, current_page, expires_at)
+                VALUES (%s, %s, %s, %s)
+                """, (session_id, user_id, current_page, expires_at))
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @instrumented
+    def get_session(self, session_id):
+        """Get an unexpired session with its user's details"""
+        try:
+            query = """
+            SELECT u.user_ID, u.first_name, u.last_name, u.mobile_no, u.username, u.rrole,
+                   s.current_page, s.current_event, s.expires_at
+            FROM User_Sessions s
+            INNER JOIN users u ON u.user_ID = s.user_id
+            WHERE s.session_id = %s AND s.expires_at > %s
+            """
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (session_id, datetime.now()))
+                return cursor.fetchone()
+        except Exception as e:
+            print(f"Error: {e}")
+            return None
+
+    @instrumented
+    def update_session_state(self, session_id, current_page, current_event=None):
+        """Remember the page (and event) a session is on"""
+        try:
+            query = "UPDATE User_Sessions SET current_page = %s, current_event = %s WHERE session_id = %s"
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (current_page, current_event, session_id))
+            return {"success": True}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    @instrumented
+    def delete_session(self, session_id):
+        """End a session (logout)"""
+        try:
+            with self._connection() as (conn, cursor):
+                cursor.execute("DELETE FROM User_Sessions WHERE session_id = %s", (session_id,))
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     # ==================== ORGANISER OPERATIONS ====================
 
+    @instrumented
     def create_organiser(self, organiser_name, phone_number, email, post, user_id):
         """Create an organiser profile"""
         try:
@@ -414,48 +1248,55 @@ class DatabaseHelper:
             VALUES (%s, %s, %s, %s, %s)
             """
             values = (organiser_name, phone_number, email, post, user_id)
-            
-            self.mycursor.execute(query, values)
-            self.mydb.commit()
-            
-            return {"success": True, "organiser_id": self.mycursor.lastrowid}
+
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, values)
+                self.memo.clear()
+                return {"success": True, "organiser_id": cursor.lastrowid}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def get_organiser_by_user_id(self, user_id):
         """Get organiser details by user ID"""
         try:
             query = "SELECT * FROM organiser WHERE user_id = %s"
-            self.mycursor.execute(query, (user_id,))
-            return self.mycursor.fetchone()
+            with self._connection() as (conn, cursor):
+                cursor.execute(query, (user_id,))
+                return cursor.fetchone()
         except Exception as e:
             print(f"Error: {e}")
             return None
 
     # ==================== UTILITY FUNCTIONS ====================
 
+    @instrumented
     def execute_query(self, query, params=None):
-        """Execute a custom query"""
+        """Execute a custom query (clears the whole read cache)"""
         try:
-            if params:
-                self.mycursor.execute(query, params)
-            else:
-                self.mycursor.execute(query)
-            
-            self.mydb.commit()
+            with self._connection() as (conn, cursor):
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+            self._invalidate_all()
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @instrumented
+    @memoized
     def fetch_query(self, query, params=None):
         """Fetch results from a custom query"""
         try:
-            if params:
-                self.mycursor.execute(query, params)
-            else:
-                self.mycursor.execute(query)
-            
-            return self.mycursor.fetchall()
+            with self._connection() as (conn, cursor):
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+
+                return cursor.fetchall()
         except Exception as e:
             print(f"Error: {e}")
             return []
@@ -463,10 +1304,14 @@ class DatabaseHelper:
 
 # Singleton instance
 _db_instance = None
+_db_instance_lock = threading.Lock()
 
 def get_db():
     """Get database helper instance (singleton pattern)"""
     global _db_instance
-    if _db_instance is None:
-        _db_instance = DatabaseHelper()
+    with _db_instance_lock:
+        if _db_instance is None:
+            _db_instance = DatabaseHelper(pool_size=Config.DB_POOL_SIZE)
+            if Config.DB_AUTO_MIGRATE and _db_instance.is_connected():
+                apply_pending(_db_instance)
     return _db_instance
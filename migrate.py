@@ -0,0 +1,289 @@
+"""
+Schema Migrations for Event Contact System
+Applies the numbered SQL files for the configured backend (migrations/ for
+MySQL, migrations/sqlite/ for SQLite) in order, records each applied version
+in schema_migrations, and checks DatabaseHelper's queries with EXPLAIN
+
+Usage:
+    python migrate.py            # apply pending migrations
+    python migrate.py status     # list applied and pending migrations
+    python migrate.py explain    # fail if any hot query does a full table scan
+"""
+
+from contextlib import contextmanager
+import argparse
+import os
+import re
+import sys
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Errors that mean a statement was already applied (e.g. by the old hand-run
+# scripts), so re-running a migration is safe
+ALREADY_APPLIED_ERRORS = {
+    1050: "table already exists",
+    1060: "duplicate column",
+    1061: "duplicate index",
+    1091: "index or column already dropped",
+}
+
+LOCK_NAME = "event_schema_migrations"
+LOCK_TIMEOUT = 60
+
+
+# ==================== LOADING ====================
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Return [(version, name, path)] for every NNNN_name.sql file, in order"""
+    migrations = []
+    for file_name in sorted(os.listdir(directory)):
+        match = re.match(r"^(\d+)_(\w+)\.sql$", file_name)
+        if match:
+            migrations.append((match.group(1), match.group(2), os.path.join(directory, file_name)))
+    return migrations
+
+
+def split_statements(sql):
+    """Split a migration file into statements (one per trailing semicolon)"""
+    statements = []
+    current = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("--"):
+            continue
+        current.append(line)
+        if stripped.endswith(";"):
+            statements.append("\n".join(current).strip().rstrip(";"))
+            current = []
+    if current:
+        statements.append("\n".join(current).strip())
+    return statements
+
+
+# ==================== APPLYING ====================
+
+def _ensure_table(cursor):
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(20) PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+
+def _applied_versions(cursor):
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row["version"] for row in cursor.fetchall()}
+
+
+def _run_statement(cursor, statement):
+    try:
+        cursor.execute(statement)
+        if cursor.with_rows:
+            cursor.fetchall()
+    except Exception as e:
+        if getattr(e, "errno", None) not in ALREADY_APPLIED_ERRORS:
+            raise
+        print(f"   skipped ({ALREADY_APPLIED_ERRORS[e.errno]}): {statement.splitlines()[0]}")
+
+
+def apply_pending(db, directory=None):
+    """Apply every migration not yet recorded in schema_migrations
+
+    Migrations come from the backend's directory (migrations/ for MySQL,
+    migrations/sqlite/ for SQLite) unless one is given. MySQL commits DDL
+    implicitly, so each migration is recorded right after its last
+    statement; a migration that fails halfway is re-run in full next time,
+    which the ALREADY_APPLIED_ERRORS handling makes safe.
+    """
+    directory = directory or db.backend.migrations_dir
+    applied = []
+    try:
+        with db._connection() as (conn, cursor):
+            _ensure_table(cursor)
+            with db.backend.migration_lock(cursor):
+                done = _applied_versions(cursor)
+                for version, name, path in load_migrations(directory):
+                    if version in done:
+                        continue
+                    print(f"⏳ Applying migration {version}_{name}...")
+                    with open(path, encoding="utf-8") as sql_file:
+                        for statement in split_statements(sql_file.read()):
+                            _run_statement(cursor, statement)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                        (version, name)
+                    )
+                    conn.commit()
+                    applied.append(version)
+        return {"success": True, "applied": applied}
+    except Exception as e:
+        print(f"❌ Migration error: {e}")
+        return {"success": False, "error": str(e), "applied": applied}
+    finally:
+        if applied:
+            db.cache.clear()
+
+
+def status(db, directory=None):
+    """Return [{"version", "name", "applied"}] for every migration file"""
+    directory = directory or db.backend.migrations_dir
+    with db._connection() as (conn, cursor):
+        _ensure_table(cursor)
+        done = _applied_versions(cursor)
+    return [
+        {"version": version, "name": name, "applied": version in done}
+        for version, name, _ in load_migrations(directory)
+    ]
+
+
+# ==================== EXPLAIN CHECK ====================
+
+class _RecordingCursor:
+    """Cursor wrapper that remembers every SELECT it runs"""
+
+    def __init__(self, cursor, queries):
+        self._cursor = cursor
+        self._queries = queries
+
+    def execute(self, query, params=None):
+        if query.lstrip().upper().startswith("SELECT"):
+            self._queries.append((query, params))
+        return self._cursor.execute(query, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+def capture_queries(db, call):
+    """Run call() with the cache off and return the SELECTs it sent"""
+    queries = []
+    connection = db._connection
+    cache_enabled = db.cache.enabled
+
+    @contextmanager
+    def recording_connection():
+        with connection() as (conn, cursor):
+            yield conn, _RecordingCursor(cursor, queries)
+
+    db._connection = recording_connection
+    db.cache.enabled = False
+    try:
+        call()
+    finally:
+        del db._connection  # Back to the class method
+        db.cache.enabled = cache_enabled
+    return queries
+
+
+def _sample(db):
+    """Pick real ids from the seeded data to drive the hot queries with"""
+    def first(query):
+        rows = db.fetch_query(query)
+        return rows[0] if rows else {}
+
+    event = first("SELECT event_id, event_code, event_status FROM eventz ORDER BY event_id LIMIT 1")
+    member = first("SELECT user_id, event_id FROM joins ORDER BY event_id LIMIT 1")
+    user = first("SELECT user_ID, username FROM users ORDER BY user_ID LIMIT 1")
+    subevent = first("SELECT event_id, sub_event_id FROM Have ORDER BY event_id LIMIT 1")
+    session = first("SELECT session_id FROM User_Sessions LIMIT 1")
+    return {
+        "event_id": event.get("event_id", 1),
+        "event_code": event.get("event_code", ""),
+        "status": event.get("event_status", "upcoming"),
+        "user_id": member.get("user_id", user.get("user_ID", 1)),
+        "username": user.get("username", ""),
+        "sub_event_id": subevent.get("sub_event_id", 1),
+        "session_id": session.get("session_id", "0" * 32),
+    }
+
+
+def hot_calls(db, sample):
+    """(label, call) pairs covering the queries the app runs per page load"""
+    from config import Config
+
+    page = Config.EVENTS_PAGE_SIZE + 1
+    event_id = sample["event_id"]
+    user_id = sample["user_id"]
+    return [
+        ("login_user", lambda: db.login_user(sample["username"], "")),
+        ("get_session", lambda: db.get_session(sample["session_id"])),
+        ("get_user_by_id", lambda: db.get_user_by_id(user_id)),
+        ("get_event_by_id", lambda: db.get_event_by_id(event_id)),
+        ("get_event_by_code", lambda: db.get_event_by_code(sample["event_code"])),
+        ("get_all_events", lambda: db.get_all_events(limit=page)),
+        ("get_events_by_status", lambda: db.get_events_by_status(sample["status"], limit=page)),
+        ("get_user_events", lambda: db.get_user_events(user_id, limit=page)),
+        ("get_events_dashboard", lambda: db.get_events_dashboard(user_id, limit=page)),
+        ("get_events_dashboard(status)", lambda: db.get_events_dashboard(user_id, sample["status"], limit=page)),
+        ("get_events_dashboard(joined)", lambda: db.get_events_dashboard(user_id, only_joined=True, limit=page)),
+        ("check_user_joined_event", lambda: db.check_user_joined_event(user_id, event_id)),
+        ("get_user_event_roles", lambda: db.get_user_event_roles(user_id)),
+        ("get_event_participants", lambda: db.get_event_participants(event_id)),
+        ("get_event_announcements", lambda: db.get_event_announcements(event_id)),
+        ("get_event_chat", lambda: db.get_event_chat(event_id)),
+        ("get_event_chat_since", lambda: db.get_event_chat_since(event_id, 0)),
+        ("get_subevent_chat", lambda: db.get_subevent_chat(event_id, sample["sub_event_id"])),
+        ("get_event_subevents", lambda: db.get_event_subevents(event_id)),
+        ("get_subevents_overview", lambda: db.get_subevents_overview(event_id, user_id)),
+        ("check_subevent_registration", lambda: db.check_subevent_registration(user_id, sample["sub_event_id"])),
+        ("get_subevent_participants_count", lambda: db.get_subevent_participants_count(sample["sub_event_id"])),
+        ("get_event_schedules", lambda: db.get_event_schedules(event_id)),
+        ("get_organiser_by_user_id", lambda: db.get_organiser_by_user_id(user_id)),
+    ]
+
+
+def explain_queries(db):
+    """EXPLAIN every hot query and return the plans that scan a whole table
+
+    Run it against a seeded database: on near-empty tables MySQL prefers a
+    full scan even when a usable index exists.
+    """
+    problems = []
+    for label, call in hot_calls(db, _sample(db)):
+        for query, params in capture_queries(db, call):
+            with db._connection() as (conn, cursor):
+                tables = db.backend.full_scans(cursor, query, params)
+            for table in tables:
+                problems.append({"method": label, "table": table, "query": " ".join(query.split())})
+    return problems
+
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    from db_helper import DatabaseHelper
+
+    parser = argparse.ArgumentParser(description="Event Contact System schema migrations")
+    parser.add_argument("command", nargs="?", default="migrate", choices=["migrate", "status", "explain"])
+    args = parser.parse_args(argv)
+
+    db = DatabaseHelper()
+    if not db.is_connected():
+        return 1
+
+    if args.command == "status":
+        for migration in status(db):
+            mark = "✅" if migration["applied"] else "⏳"
+            print(f"{mark} {migration['version']}_{migration['name']}")
+        return 0
+
+    if args.command == "explain":
+        problems = explain_queries(db)
+        for problem in problems:
+            print(f"❌ {problem['method']}: full scan of {problem['table']}\n   {problem['query']}")
+        if problems:
+            return 1
+        print("✅ No hot query scans a whole table")
+        return 0
+
+    result = apply_pending(db)
+    if result["success"]:
+        print(f"✅ {len(result['applied'])} migration(s) applied")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+-- Base schema for Event Contact System
+-- Creates the original tables on a fresh database; existing tables are left alone
+
+CREATE TABLE IF NOT EXISTS Users (
+    user_ID INT AUTO_INCREMENT PRIMARY KEY,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(100),
+    mobile_no VARCHAR(20),
+    username VARCHAR(200) NOT NULL UNIQUE,
+    rpassword VARCHAR(64) NOT NULL,
+    rrole VARCHAR(20) DEFAULT 'participant'
+);
+
+CREATE TABLE IF NOT EXISTS Organiser (
+    organiser_id INT AUTO_INCREMENT PRIMARY KEY,
+    organiser_name VARCHAR(200) NOT NULL,
+    phone_number VARCHAR(20),
+    email VARCHAR(200),
+    post VARCHAR(100),
+    user_id INT,
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Venue (
+    venue_id INT AUTO_INCREMENT PRIMARY KEY,
+    venue_name VARCHAR(200) NOT NULL,
+    address VARCHAR(255),
+    capacity INT
+);
+
+CREATE TABLE IF NOT EXISTS Eventz (
+    event_id INT AUTO_INCREMENT PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    category VARCHAR(100),
+    event_description TEXT,
+    start_date DATE,
+    end_date DATE,
+    start_time TIME,
+    end_time TIME,
+    event_status VARCHAR(20),
+    event_code INT,
+    organiser_id INT,
+    type_of_event VARCHAR(50),
+    FOREIGN KEY (organiser_id) REFERENCES Organiser(organiser_id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Speaker (
+    speaker_id INT AUTO_INCREMENT PRIMARY KEY,
+    speaker_name VARCHAR(200) NOT NULL,
+    email VARCHAR(200),
+    event_id INT,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Registration (
+    user_id INT,
+    event_id INT,
+    registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, event_id),
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Joins (
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Announcements (
+    announcement_id INT AUTO_INCREMENT PRIMARY KEY,
+    announcement_text TEXT NOT NULL,
+    author_username VARCHAR(200),
+    file_name VARCHAR(255),
+    file_type VARCHAR(100),
+    venue_id INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (venue_id) REFERENCES Venue(venue_id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Containz (
+    event_id INT NOT NULL,
+    announcement_id INT NOT NULL,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE,
+    FOREIGN KEY (announcement_id) REFERENCES Announcements(announcement_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Sub_events (
+    sub_event_id INT AUTO_INCREMENT PRIMARY KEY,
+    sub_event_name VARCHAR(200) NOT NULL,
+    decription TEXT,
+    venue_id INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (venue_id) REFERENCES Venue(venue_id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Have (
+    event_id INT NOT NULL,
+    sub_event_id INT NOT NULL,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE,
+    FOREIGN KEY (sub_event_id) REFERENCES Sub_events(sub_event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Chat_Messages (
+    chat_id INT AUTO_INCREMENT PRIMARY KEY,
+    event_id INT NOT NULL,
+    subevent_name VARCHAR(200) DEFAULT '',
+    sender_username VARCHAR(200) NOT NULL,
+    idx_event_chat TINYINT DEFAULT 0,
+    idx_subevent_chat TINYINT DEFAULT 0,
+    chat_message_text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
@@ -1,7 +1,5 @@
 -- Add Schedule table for Event Contact System
--- Run this to add schedule functionality
-
-USE event;
+-- (formerly add_schedule_table.sql)
 
 -- Create Schedule table
 CREATE TABLE IF NOT EXISTS Event_Schedule (
@@ -21,5 +19,3 @@ CREATE TABLE IF NOT EXISTS Event_Schedule (
 -- Add index for better performance
 CREATE INDEX idx_event_schedule ON Event_Schedule(event_id);
 CREATE INDEX idx_schedule_datetime ON Event_Schedule(schedule_date, schedule_time);
-
-SELECT 'Schedule table created successfully!' AS Status;
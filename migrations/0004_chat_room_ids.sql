@@ -0,0 +1,24 @@
+-- Key chat rooms by sub_event_id for Event Contact System
+-- Moves subevent chat off the free-text subevent_name column
+
+-- 1. Room column: NULL = main event chat, otherwise the subevent's id
+ALTER TABLE Chat_Messages ADD COLUMN sub_event_id INT NULL;
+
+-- 2. Backfill subevent rooms by matching the old name within the same event
+UPDATE Chat_Messages cm
+INNER JOIN Have h ON h.event_id = cm.event_id
+INNER JOIN Sub_events s ON s.sub_event_id = h.sub_event_id AND s.sub_event_name = cm.subevent_name
+SET cm.sub_event_id = s.sub_event_id
+WHERE cm.subevent_name <> '';
+
+-- 3. Messages whose name matches no subevent were already unreachable; park them
+--    in room 0 (no subevent has that id) so they stay out of the main chat
+UPDATE Chat_Messages SET sub_event_id = 0
+WHERE sub_event_id IS NULL AND subevent_name <> '';
+
+-- 4. Every room read is a range scan on (event_id, sub_event_id) ordered by chat_id
+CREATE INDEX idx_chat_room ON Chat_Messages(event_id, sub_event_id, chat_id);
+
+-- 5. The single-column indexes are covered by idx_chat_room (or no longer used)
+DROP INDEX idx_subevent_name ON Chat_Messages;
+DROP INDEX idx_event_id_chat ON Chat_Messages;
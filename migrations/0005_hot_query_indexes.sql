@@ -0,0 +1,26 @@
+-- Indexes for the queries DatabaseHelper runs on every page load
+-- Each one is checked by `python migrate.py explain`
+
+-- Dashboard and event listings: keyset pages on (start_date, event_id),
+-- optionally filtered by status
+CREATE INDEX idx_eventz_listing ON Eventz(start_date, event_id);
+CREATE INDEX idx_eventz_status_listing ON Eventz(event_status, start_date, event_id);
+DROP INDEX idx_event_status ON Eventz;
+
+-- The user's role per event (dashboard join, role map, membership checks);
+-- includes user_role so those reads never touch the table rows
+CREATE INDEX idx_joins_user_event ON Joins(user_id, event_id, user_role);
+
+-- Per-event counts and lists through the link tables
+CREATE INDEX idx_containz_event ON Containz(event_id, announcement_id);
+CREATE INDEX idx_have_event ON Have(event_id, sub_event_id);
+
+-- Announcement feed is ordered newest first
+CREATE INDEX idx_announcements_created ON Announcements(created_at);
+
+-- Schedule reads filter by event and sort by date and time
+CREATE INDEX idx_schedule_event_datetime ON Event_Schedule(event_id, schedule_date, schedule_time);
+DROP INDEX idx_event_schedule ON Event_Schedule;
+
+-- Organiser profile lookup by user
+CREATE INDEX idx_organiser_user ON Organiser(user_id);
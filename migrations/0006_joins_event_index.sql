@@ -0,0 +1,4 @@
+-- Member list per event (details page participants tab)
+-- idx_joins_user_event leads with user_id, so event lookups need their own index
+
+CREATE INDEX idx_joins_event ON Joins(event_id, user_role, user_id);
@@ -0,0 +1,5 @@
+-- Subevent overview: participants are grouped per subevent, and joins/leaves
+-- look up a subevent's event through Have
+
+CREATE INDEX idx_subevent_participants_subevent ON Subevent_Participants(sub_event_id, user_id);
+CREATE INDEX idx_have_subevent ON Have(sub_event_id, event_id);
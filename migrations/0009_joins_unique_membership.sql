@@ -0,0 +1,34 @@
+-- One Joins row per user and event, so joining is a single idempotent
+-- INSERT. Duplicate rows (possible before the key existed) collapse into the
+-- one with the highest role ('organiser' is the legacy name for 'admin');
+-- that row is kept as it is, role included.
+
+CREATE TEMPORARY TABLE joins_dedup AS
+SELECT user_id, event_id, user_role
+FROM (
+    SELECT user_id, event_id, user_role,
+           ROW_NUMBER() OVER (
+               PARTITION BY user_id, event_id
+               ORDER BY CASE LOWER(user_role)
+                   WHEN 'admin' THEN 1 WHEN 'organiser' THEN 1
+                   WHEN 'core' THEN 2 WHEN 'participant' THEN 3 ELSE 4
+               END
+           ) AS position,
+           COUNT(*) OVER (PARTITION BY user_id, event_id) AS copies
+    FROM Joins
+) ranked
+WHERE position = 1 AND copies > 1;
+
+START TRANSACTION;
+
+DELETE j FROM Joins j
+INNER JOIN joins_dedup d ON d.user_id = j.user_id AND d.event_id = j.event_id;
+
+INSERT INTO Joins (user_id, event_id, user_role)
+SELECT user_id, event_id, user_role FROM joins_dedup;
+
+COMMIT;
+
+DROP TEMPORARY TABLE joins_dedup;
+
+CREATE UNIQUE INDEX uq_joins_user_event ON Joins(user_id, event_id);
@@ -0,0 +1,4 @@
+-- Salted scrypt hashes ("scrypt$<log2 N>$<r>$<p>$<salt>$<key>") are longer
+-- than the 64-character SHA-256 hex digests the column was sized for
+
+ALTER TABLE Users MODIFY rpassword VARCHAR(255) NOT NULL;
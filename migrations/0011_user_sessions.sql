@@ -0,0 +1,14 @@
+-- Login sessions behind the signed tokens in the app URL, so a page refresh
+-- restores the user (and the page they were on) without a password check
+
+CREATE TABLE IF NOT EXISTS User_Sessions (
+    session_id CHAR(32) PRIMARY KEY,
+    user_id INT NOT NULL,
+    current_page VARCHAR(50) DEFAULT 'events',
+    current_event INT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at DATETIME NOT NULL,
+    INDEX idx_sessions_expires (expires_at),
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (current_event) REFERENCES Eventz(event_id) ON DELETE SET NULL
+);
@@ -0,0 +1,159 @@
+-- SQLite schema for Event Contact System
+-- The state MySQL reaches after migrations 0001-0005 (base schema,
+-- schema_adjustments.sql, add_schedule_table.sql, chat room ids and the hot
+-- query indexes). Later migrations are numbered after it in both directories.
+
+CREATE TABLE IF NOT EXISTS Users (
+    user_ID INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name VARCHAR(100) NOT NULL,
+    last_name VARCHAR(100),
+    mobile_no VARCHAR(20),
+    username VARCHAR(200) NOT NULL UNIQUE,
+    rpassword VARCHAR(64) NOT NULL,
+    rrole VARCHAR(20) DEFAULT 'participant'
+);
+
+CREATE TABLE IF NOT EXISTS Organiser (
+    organiser_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    organiser_name VARCHAR(200) NOT NULL,
+    phone_number VARCHAR(20),
+    email VARCHAR(200),
+    post VARCHAR(100),
+    user_id INT,
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Venue (
+    venue_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venue_name VARCHAR(200) NOT NULL,
+    address VARCHAR(255),
+    capacity INT
+);
+
+-- Times are stored as 'HH:MM:SS' text, as MySQL returns them
+CREATE TABLE IF NOT EXISTS Eventz (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255) NOT NULL,
+    category VARCHAR(100),
+    event_description TEXT,
+    start_date DATE,
+    end_date DATE,
+    start_time TEXT,
+    end_time TEXT,
+    event_status VARCHAR(20),
+    event_code VARCHAR(50),
+    organiser_id INT,
+    type_of_event VARCHAR(50),
+    FOREIGN KEY (organiser_id) REFERENCES Organiser(organiser_id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Speaker (
+    speaker_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    speaker_name VARCHAR(200) NOT NULL,
+    email VARCHAR(200),
+    event_id INT,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Registration (
+    user_id INT,
+    event_id INT,
+    registered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, event_id),
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Joins (
+    user_id INT NOT NULL,
+    event_id INT NOT NULL,
+    user_role VARCHAR(20) DEFAULT 'participant',
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Announcements (
+    announcement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    announcement_text TEXT NOT NULL,
+    author_username VARCHAR(200),
+    file_name VARCHAR(255),
+    file_type VARCHAR(100),
+    venue_id INT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (venue_id) REFERENCES Venue(venue_id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Containz (
+    event_id INT NOT NULL,
+    announcement_id INT NOT NULL,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE,
+    FOREIGN KEY (announcement_id) REFERENCES Announcements(announcement_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Sub_events (
+    sub_event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sub_event_name VARCHAR(200) NOT NULL,
+    decription TEXT,
+    venue_id INT,
+    capacity INT DEFAULT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (venue_id) REFERENCES Venue(venue_id) ON DELETE SET NULL
+);
+
+CREATE TABLE IF NOT EXISTS Have (
+    event_id INT NOT NULL,
+    sub_event_id INT NOT NULL,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE,
+    FOREIGN KEY (sub_event_id) REFERENCES Sub_events(sub_event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Subevent_Participants (
+    user_id INT,
+    sub_event_id INT,
+    joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, sub_event_id),
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (sub_event_id) REFERENCES Sub_events(sub_event_id) ON DELETE CASCADE
+);
+
+-- sub_event_id: NULL = main event chat, otherwise the subevent's room
+CREATE TABLE IF NOT EXISTS Chat_Messages (
+    chat_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INT NOT NULL,
+    sub_event_id INT NULL,
+    subevent_name VARCHAR(200) DEFAULT '',
+    sender_username VARCHAR(200) NOT NULL,
+    idx_event_chat TINYINT DEFAULT 0,
+    idx_subevent_chat TINYINT DEFAULT 0,
+    chat_message_text TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS Event_Schedule (
+    schedule_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id INT NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    schedule_date DATE NOT NULL,
+    schedule_time TEXT NOT NULL,
+    location VARCHAR(255),
+    added_by_user_id INT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (event_id) REFERENCES Eventz(event_id) ON DELETE CASCADE,
+    FOREIGN KEY (added_by_user_id) REFERENCES Users(user_ID) ON DELETE CASCADE
+);
+
+-- Indexes (same names and columns as the MySQL migrations)
+CREATE INDEX IF NOT EXISTS idx_event_code ON Eventz(event_code);
+CREATE INDEX IF NOT EXISTS idx_username ON Users(username);
+CREATE INDEX IF NOT EXISTS idx_eventz_listing ON Eventz(start_date, event_id);
+CREATE INDEX IF NOT EXISTS idx_eventz_status_listing ON Eventz(event_status, start_date, event_id);
+CREATE INDEX IF NOT EXISTS idx_joins_user_event ON Joins(user_id, event_id, user_role);
+CREATE INDEX IF NOT EXISTS idx_containz_event ON Containz(event_id, announcement_id);
+CREATE INDEX IF NOT EXISTS idx_have_event ON Have(event_id, sub_event_id);
+CREATE INDEX IF NOT EXISTS idx_announcements_created ON Announcements(created_at);
+CREATE INDEX IF NOT EXISTS idx_schedule_datetime ON Event_Schedule(schedule_date, schedule_time);
+CREATE INDEX IF NOT EXISTS idx_schedule_event_datetime ON Event_Schedule(event_id, schedule_date, schedule_time);
+CREATE INDEX IF NOT EXISTS idx_chat_room ON Chat_Messages(event_id, sub_event_id, chat_id);
+CREATE INDEX IF NOT EXISTS idx_organiser_user ON Organiser(user_id);
@@ -0,0 +1,3 @@
+-- Member list per event (details page participants tab)
+
+CREATE INDEX IF NOT EXISTS idx_joins_event ON Joins(event_id, user_role, user_id);
@@ -0,0 +1,12 @@
+-- Waitlist for full subevents
+-- Users queue in waitlist_id order and are promoted when a participant leaves
+
+CREATE TABLE IF NOT EXISTS Subevent_Waitlist (
+    waitlist_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INT NOT NULL,
+    sub_event_id INT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (sub_event_id, user_id),
+    FOREIGN KEY (user_id) REFERENCES Users(user_ID) ON DELETE CASCADE,
+    FOREIGN KEY (sub_event_id) REFERENCES Sub_events(sub_event_id) ON DELETE CASCADE
+);
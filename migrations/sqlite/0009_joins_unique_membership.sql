@@ -0,0 +1,20 @@
+-- One Joins row per user and event, so joining is a single idempotent
+-- INSERT. Duplicate rows (possible before the key existed) collapse into the
+-- one with the highest role ('organiser' is the legacy name for 'admin');
+-- that row is kept as it is, role included.
+
+DELETE FROM Joins WHERE rowid IN (
+    SELECT rowid FROM (
+        SELECT rowid, ROW_NUMBER() OVER (
+            PARTITION BY user_id, event_id
+            ORDER BY CASE LOWER(user_role)
+                WHEN 'admin' THEN 1 WHEN 'organiser' THEN 1
+                WHEN 'core' THEN 2 WHEN 'participant' THEN 3 ELSE 4
+            END, rowid
+        ) AS position
+        FROM Joins
+    )
+    WHERE position > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_joins_user_event ON Joins(user_id, event_id);
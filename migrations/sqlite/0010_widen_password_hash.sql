@@ -0,0 +1,3 @@
+-- Salted scrypt hashes are longer than the 64-character SHA-256 digests
+-- rpassword was sized for. SQLite does not enforce VARCHAR lengths, so
+-- there is nothing to change; the file keeps the numbering in step with MySQL.
@@ -0,0 +1,132 @@
+"""
+Password Hashing Module for Event Contact System
+Salted scrypt hashes with a configurable cost. Hashing runs on a bounded
+worker pool, so a burst of logins uses at most that many cores and queues
+the rest instead of tying up every Streamlit script thread. Legacy unsalted
+SHA-256 hashes still verify and are flagged for rehashing
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+LEGACY_SHA256_LENGTH = 64
+
+
+class PasswordPoolBusy(Exception):
+    """Too many hashes queued; the caller should ask the user to retry"""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+class PasswordHasher:
+    def __init__(self, log2_n=14, r=8, p=1, workers=None, queue_size=None, timeout=10.0):
+        """Create a hasher and its worker pool
+
+        The scrypt cost is N = 2**log2_n with block size r and parallelism p;
+        each hash needs about 128 * N * r bytes of memory. workers defaults to
+        the number of cores. Up to queue_size more hashes (default: workers * 8)
+        wait for a worker; beyond that, callers wait up to timeout seconds for
+        a slot and then get PasswordPoolBusy. Creating a hasher costs one hash,
+        for the dummy that unknown usernames are checked against.
+        """
+        self.log2_n = log2_n
+        self.r = r
+        self.p = p
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        queue_size = queue_size if queue_size is not None else self.workers * 8
+        self._slots = threading.BoundedSemaphore(self.workers + queue_size)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password")
+        self._stats_lock = threading.Lock()
+        self._stats = {"hashes": 0, "verifies": 0, "legacy": 0, "busy": 0, "hash_time_total": 0.0}
+        # Built here rather than on first use so concurrent logins can't race for it
+        self._dummy = self._encode(_b64(os.urandom(SALT_BYTES)))
+
+    # ==================== HASHING ====================
+
+    def _scrypt(self, password, salt, log2_n, r, p):
+        start = time.perf_counter()
+        key = hashlib.scrypt(
+            password.encode(), salt=salt, n=2 ** log2_n, r=r, p=p,
+            maxmem=256 * 2 ** log2_n * r * p, dklen=KEY_BYTES
+        )
+        with self._stats_lock:
+            self._stats["hashes"] += 1
+            self._stats["hash_time_total"] += time.perf_counter() - start
+        return key
+
+    def _run(self, function, *args):
+        """Run function on the worker pool and wait for its result"""
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._stats_lock:
+                self._stats["busy"] += 1
+            raise PasswordPoolBusy("Too many sign-ins at once, please try again")
+        try:
+            return self._pool.submit(function, *args).result()
+        finally:
+            self._slots.release()
+
+    def _encode(self, password):
+        salt = os.urandom(SALT_BYTES)
+        key = self._scrypt(password, salt, self.log2_n, self.r, self.p)
+        return f"{SCHEME}${self.log2_n}${self.r}${self.p}${_b64(salt)}${_b64(key)}"
+
+    def hash(self, password):
+        """Return a salted hash string to store in users.rpassword"""
+        return self._run(self._encode, password)
+
+    # ==================== VERIFYING ====================
+
+    def _check(self, password, stored):
+        if stored is None:
+            # Unknown user: spend the same time as a real check
+            self._check(password, self._dummy)
+            return False
+        if len(stored) == LEGACY_SHA256_LENGTH and "$" not in stored:
+            with self._stats_lock:
+                self._stats["legacy"] += 1
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored)
+        try:
+            scheme, log2_n, r, p, salt, key = stored.split("$")
+            if scheme != SCHEME:
+                return False
+            expected = base64.b64decode(key)
+            actual = self._scrypt(password, base64.b64decode(salt), int(log2_n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(actual, expected)
+
+    def verify(self, password, stored):
+        """Check password against a stored hash in constant time
+
+        stored may be None (unknown user); the check still costs one hash so
+        response times don't reveal which usernames exist.
+        """
+        with self._stats_lock:
+            self._stats["verifies"] += 1
+        return self._run(self._check, password, stored)
+
+    def needs_rehash(self, stored):
+        """True for legacy SHA-256 hashes and hashes made with another cost"""
+        return not (stored or "").startswith(f"{SCHEME}${self.log2_n}${self.r}${self.p}$")
+
+    def stats(self):
+        """Return hash counts, legacy verifies, busy rejections and timings"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["workers"] = self.workers
+        stats["hash_time_avg"] = stats["hash_time_total"] / stats["hashes"] if stats["hashes"] else 0.0
+        return stats
+
+    def close(self):
+        self._pool.shutdown(wait=False)
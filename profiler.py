@@ -0,0 +1,281 @@
+"""
+Profiler Module for Event Contact System
+Opt-in render profiler: records a timing tree for a sampled rerun, split into
+Python, DB and Streamlit element time, and exports it for speedscope and
+flamegraph tools
+"""
+
+from contextlib import contextmanager
+import functools
+import json
+import os
+import random
+import threading
+import time
+
+# Streamlit calls timed as element emission
+ST_ELEMENTS = (
+    "markdown", "columns", "write", "metric", "button", "header", "subheader",
+    "title", "caption", "divider", "expander", "tabs", "form", "text_input",
+    "text_area", "selectbox", "dataframe", "info", "success", "warning", "error",
+)
+
+_local = threading.local()
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+
+class _Node:
+    __slots__ = ("name", "kind", "total", "calls", "children")
+
+    def __init__(self, name, kind="section"):
+        self.name = name
+        self.kind = kind        # "section", "db" or "st"
+        self.total = 0.0
+        self.calls = 0
+        self.children = {}      # Repeated calls with the same name are merged
+
+    def child(self, name, kind="section"):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = _Node(name, kind)
+        return node
+
+    @property
+    def self_time(self):
+        return max(self.total - sum(child.total for child in self.children.values()), 0.0)
+
+    def split(self):
+        """(python, db, st) seconds spent in this subtree"""
+        if self.kind == "db":
+            return 0.0, self.total, 0.0
+        if self.kind == "st":
+            return 0.0, 0.0, self.total
+        python, db, st = self.self_time, 0.0, 0.0
+        for child in self.children.values():
+            child_python, child_db, child_st = child.split()
+            python += child_python
+            db += child_db
+            st += child_st
+        return python, db, st
+
+    def to_dict(self):
+        python, db, st = self.split()
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 3),
+            "python_ms": round(python * 1000, 3),
+            "db_ms": round(db * 1000, 3),
+            "st_ms": round(st * 1000, 3),
+            "children": [child.to_dict() for child in self.children.values()],
+        }
+
+
+class Profile:
+    """Timing tree of one rerun"""
+
+    def __init__(self, name):
+        self.root = _Node(name)
+        self._stack = [(self.root, time.perf_counter())]
+        self._in_element = False
+        self._lock = threading.Lock()  # add() is also called from prefetch workers
+
+    @contextmanager
+    def section(self, name, kind="section"):
+        node = self._stack[-1][0].child(name, kind)
+        self._stack.append((node, time.perf_counter()))
+        try:
+            yield node
+        finally:
+            _, start = self._stack.pop()
+            node.total += time.perf_counter() - start
+            node.calls += 1
+
+    def add(self, name, kind, elapsed):
+        """Record a leaf that already finished (e.g. a DB call)"""
+        with self._lock:
+            node = self._stack[-1][0].child(name, kind)
+            node.total += elapsed
+            node.calls += 1
+
+    def finish(self):
+        self.root.total = time.perf_counter() - self._stack[0][1]
+        self.root.calls = 1
+
+    def tree(self):
+        return self.root.to_dict()
+
+    # ==================== EXPORTS ====================
+
+    def _stacks(self):
+        """Yield (frame names root first, self seconds) for every node"""
+        def walk(node, path):
+            path = path + [node.name]
+            yield path, node.self_time
+            for child in node.children.values():
+                yield from walk(child, path)
+        yield from walk(self.root, [])
+
+    def collapsed(self):
+        """Folded stacks for flamegraph.pl / inferno (microsecond weights)"""
+        lines = []
+        for path, seconds in self._stacks():
+            weight = int(seconds * 1_000_000)
+            if weight > 0:
+                lines.append(";".join(name.replace(";", ",") for name in path) + f" {weight}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self):
+        """Sampled-profile document for https://www.speedscope.app"""
+        frames = []
+        index = {}
+        samples = []
+        weights = []
+        for path, seconds in self._stacks():
+            if seconds <= 0:
+                continue
+            stack = []
+            for name in path:
+                if name not in index:
+                    index[name] = len(frames)
+                    frames.append({"name": name})
+                stack.append(index[name])
+            samples.append(stack)
+            weights.append(round(seconds * 1000, 3))
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.root.name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }],
+            "name": self.root.name,
+            "exporter": "event-contact-system profiler",
+        }
+
+    def save(self, directory):
+        """Write <time>-<name>.speedscope.json and append to reruns.collapsed"""
+        os.makedirs(directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in self.root.name)
+        path = os.path.join(directory, f"{stamp}-{int(self.root.total * 1000)}ms-{safe_name}.speedscope.json")
+        with open(path, "w", encoding="utf-8") as profile_file:
+            json.dump(self.speedscope(), profile_file)
+        with open(os.path.join(directory, "reruns.collapsed"), "a", encoding="utf-8") as collapsed_file:
+            collapsed_file.write(self.collapsed())
+        return path
+
+
+# ==================== HOOKS ====================
+
+def active():
+    """Profile of the rerun running on this thread, if it is being profiled"""
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def attach(profile):
+    """Record this thread's DB calls in another thread's profile
+
+    Used by prefetch workers, whose calls then appear under the section the
+    rerun is in while it waits for them. Their times overlap, so that
+    section's DB time can exceed its wall time.
+    """
+    outer = active()
+    _local.profile = profile
+    try:
+        yield
+    finally:
+        _local.profile = outer
+
+
+@contextmanager
+def section(name):
+    """Time a block as a node of the current rerun's tree (no-op when off)"""
+    profile = active()
+    if profile is None:
+        yield
+        return
+    with profile.section(name):
+        yield
+
+
+def profiled(func):
+    """Decorator: time every call of a page or render function"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with section(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def record_query(entry):
+    """QueryLog listener: add a finished DatabaseHelper call as DB time"""
+    profile = active()
+    if profile is not None:
+        profile.add(f"db.{entry['method']}", "db", entry["elapsed"])
+
+
+def _timed_element(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = active()
+        if profile is None or profile._in_element:
+            return func(*args, **kwargs)
+        profile._in_element = True
+        try:
+            with profile.section(f"st.{name}", "st"):
+                return func(*args, **kwargs)
+        finally:
+            profile._in_element = False
+    return wrapper
+
+
+def install_element_hooks():
+    """Wrap st.<element> and DeltaGenerator.<element> so emission is timed
+
+    The wrappers only do work on a thread with an active profile.
+    """
+    global _hooks_installed
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        for name in ST_ELEMENTS:
+            if hasattr(st, name):
+                setattr(st, name, _timed_element(name, getattr(st, name)))
+            if hasattr(DeltaGenerator, name):
+                setattr(DeltaGenerator, name, _timed_element(name, getattr(DeltaGenerator, name)))
+        _hooks_installed = True
+
+
+@contextmanager
+def rerun(name, sample_rate, directory):
+    """Profile this rerun with probability sample_rate and save the result
+
+    Yields the Profile, or None when the rerun is not sampled.
+    """
+    if sample_rate <= 0 or random.random() >= sample_rate or active() is not None:
+        yield None
+        return
+
+    install_element_hooks()
+    profile = _local.profile = Profile(name)
+    try:
+        yield profile
+    finally:
+        _local.profile = None
+        profile.finish()
+        try:
+            profile.save(directory)
+        except OSError as e:
+            print(f"Profiler error: {e}")
@@ -0,0 +1,274 @@
+"""
+Query Cache Module for Event Contact System
+Read-through cache used by DatabaseHelper, with per-event versioning,
+TTLs, a memory-bounded LRU and optional stale-while-revalidate
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import sys
+import threading
+import time
+
+# Scope for entries that list events (dashboard, all events); writes that
+# change what the listing shows invalidate it
+LISTING = "__listing__"
+
+
+def part(name, event_id):
+    """Scope for one part of an event's data, e.g. part("messages", 5)
+
+    Invalidating the part leaves the event's other entries cached;
+    invalidating the whole event drops its parts too.
+    """
+    return (name, event_id)
+
+
+def _parent(scope):
+    """The event a part scope belongs to (None for event ids and LISTING)"""
+    return scope[1] if isinstance(scope, tuple) else None
+
+
+def estimate_size(value):
+    """Rough memory footprint of a cached result in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + sys.getsizeof(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class _Entry:
+    __slots__ = ("value", "size", "scope", "version", "loaded_at")
+
+    def __init__(self, value, size, scope, version, loaded_at):
+        self.value = value
+        self.size = size
+        self.scope = scope
+        self.version = version
+        self.loaded_at = loaded_at
+
+
+class QueryCache:
+    def __init__(self, ttl=30, max_bytes=64 * 1024 * 1024, stale_ttl=0, enabled=True):
+        """Create a cache
+
+        ttl is how long an entry is fresh, in seconds. With stale_ttl > 0 an
+        expired entry is still served for that many extra seconds while a
+        background thread reloads it (stale-while-revalidate).
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._scope_keys = {}
+        self._versions = {}
+        self._generation = 0
+        self._bytes = 0
+        self._refreshing = set()
+        self._local = threading.local()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh") if stale_ttl > 0 else None
+        self._stats = {}
+
+    # ==================== READS ====================
+
+    def get_or_load(self, namespace, args, scope, loader):
+        """Return the cached result for (namespace, args), loading it on a miss
+
+        scope is the event id the result depends on, a part() of one, or
+        LISTING. Exceptions
+        from loader propagate and nothing is cached.
+        """
+        if not self.enabled or getattr(self._local, "bypass", False):
+            return loader()
+
+        key = (namespace, args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == self._current(scope):
+                age = now - entry.loaded_at
+                if age < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._count(namespace, "hits")
+                    return entry.value
+                if age < self.ttl + self.stale_ttl:
+                    self._entries.move_to_end(key)
+                    self._count(namespace, "stale_hits")
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._refresher.submit(self._refresh, key, scope, loader)
+                    return entry.value
+            self._count(namespace, "misses")
+            version = self._current(scope)
+
+        value = loader()
+        self._store(key, scope, version, value)
+        return value
+
+    def get_or_load_many(self, namespace, scopes, loader):
+        """Return {scope: result} for several scopes, loading only the misses
+
+        Each result is cached under its own scope (e.g. one event's part), so
+        a write to one event reloads just that event's value.
+        loader(missing_scopes) returns {scope: result} for the misses in one
+        call.
+        """
+        if not self.enabled or getattr(self._local, "bypass", False):
+            return loader(list(scopes))
+
+        results = {}
+        missing = {}
+        now = time.monotonic()
+        with self._lock:
+            for scope in scopes:
+                key = (namespace, (scope,))
+                entry = self._entries.get(key)
+                if entry is not None and entry.version == self._current(scope) and now - entry.loaded_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self._count(namespace, "hits")
+                    results[scope] = entry.value
+                else:
+                    self._count(namespace, "misses")
+                    missing[scope] = self._current(scope)
+
+        if missing:
+            loaded = loader(list(missing))
+            for scope, version in missing.items():
+                results[scope] = loaded[scope]
+                self._store((namespace, (scope,)), scope, version, loaded[scope])
+        return results
+
+    @contextmanager
+    def bypass(self):
+        """Send this thread's reads straight to the database for the block
+
+        Used inside transactions, whose reads must see their own uncommitted
+        writes and must not be shared with other sessions.
+        """
+        outer = getattr(self._local, "bypass", False)
+        self._local.bypass = True
+        try:
+            yield
+        finally:
+            self._local.bypass = outer
+
+    def _refresh(self, key, scope, loader):
+        """Reload an entry in the background for stale-while-revalidate"""
+        try:
+            with self._lock:
+                version = self._current(scope)
+            self._store(key, scope, version, loader())
+        except Exception as e:
+            print(f"Cache refresh error: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _store(self, key, scope, version, value):
+        """Insert an entry unless a write bumped the scope while it loaded"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if self._current(scope) != version:
+                return
+            self._remove(key)
+            self._entries[key] = _Entry(value, size, scope, version, time.monotonic())
+            self._scope_keys.setdefault(scope, set()).add(key)
+            if _parent(scope) is not None:
+                self._scope_keys.setdefault(_parent(scope), set()).add(key)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._count(oldest[0], "evictions")
+
+    def _current(self, scope):
+        if _parent(scope) is not None:
+            # A part is also invalidated by a write to its whole event
+            return (self._generation, self._versions.get(_parent(scope), 0), self._versions.get(scope, 0))
+        return (self._generation, self._versions.get(scope, 0))
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+            for scope in (entry.scope, _parent(entry.scope)):
+                keys = self._scope_keys.get(scope)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._scope_keys[scope]
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate(self, event_id=None, listing=True, parts=None):
+        """Invalidate one event's entries (if given) and, with listing, every listing entry
+
+        With parts, only those part()s of the event are invalidated.
+        """
+        with self._lock:
+            if event_id is None:
+                scopes = []
+            elif parts:
+                scopes = [part(name, event_id) for name in parts]
+            else:
+                scopes = [event_id]
+            if listing:
+                scopes.append(LISTING)
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+                for key in list(self._scope_keys.get(scope, ())):
+                    self._remove(key)
+                    self._count(key[0], "invalidations")
+
+    def clear(self):
+        """Invalidate everything (used after arbitrary writes)"""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._scope_keys.clear()
+            self._bytes = 0
+
+    def version(self, event_id):
+        """Current version of an event's cached data"""
+        with self._lock:
+            return self._current(event_id)
+
+    # ==================== METRICS ====================
+
+    def _count(self, namespace, field):
+        counters = self._stats.setdefault(namespace, {
+            "hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0
+        })
+        counters[field] += 1
+
+    def stats(self):
+        """Return hit ratios per namespace plus totals"""
+        with self._lock:
+            per_namespace = {name: dict(counters) for name, counters in self._stats.items()}
+            entries = len(self._entries)
+            used = self._bytes
+
+        totals = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        for counters in per_namespace.values():
+            served = counters["hits"] + counters["stale_hits"]
+            lookups = served + counters["misses"]
+            counters["hit_ratio"] = served / lookups if lookups else 0.0
+            for field in totals:
+                totals[field] += counters[field]
+
+        served = totals["hits"] + totals["stale_hits"]
+        lookups = served + totals["misses"]
+        totals["hit_ratio"] = served / lookups if lookups else 0.0
+        totals["db_reads_saved"] = served
+        totals["entries"] = entries
+        totals["bytes"] = used
+        return {"total": totals, "namespaces": per_namespace}
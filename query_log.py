@@ -0,0 +1,194 @@
+"""
+Query Log Module for Event Contact System
+Times and counts DatabaseHelper calls per method, logs slow ones, and
+collects per-rerun totals with optional query budgets
+"""
+
+from contextlib import contextmanager
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger("event.db")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A page ran more DB queries than its budget allows"""
+
+
+def count_rows(result):
+    """Row count of a DatabaseHelper result"""
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if isinstance(result.get("events"), list):
+            return len(result["events"])
+        if result.get("success") is False:
+            return 0
+    return 0 if result is None else 1
+
+
+class QueryScope:
+    """Calls and DB queries made by one thread inside QueryLog.scope()"""
+
+    def __init__(self, name, budget=None):
+        self.name = name
+        self.budget = budget
+        self.calls = []      # Outermost DatabaseHelper calls: dicts of method, rows, queries, elapsed
+        self.queries = 0     # DB round trips (cache hits make none)
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def db_time(self):
+        return sum(call["elapsed"] for call in self.calls)
+
+    def summary(self):
+        return {
+            "name": self.name,
+            "calls": len(self.calls),
+            "queries": self.queries,
+            "cached": sum(1 for call in self.calls if call["queries"] == 0),
+            "db_time": self.db_time,
+            "elapsed": self.elapsed,
+            "budget": self.budget,
+        }
+
+
+class QueryLog:
+    def __init__(self, slow_ms=0, enforce_budgets=False):
+        """Create a log
+
+        Calls slower than slow_ms milliseconds are logged as warnings on the
+        "event.db" logger (0 turns that off). With enforce_budgets, leaving a
+        scope that ran more queries than its budget raises
+        QueryBudgetExceeded.
+        """
+        self.slow_ms = slow_ms
+        self.enforce_budgets = enforce_budgets
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._methods = {}
+        self._queries = 0
+        self.listeners = []  # Called with each finished outermost call
+
+    def _state(self):
+        local = self._local
+        if not hasattr(local, "calls"):
+            local.calls = []     # Stack of the calls in progress
+            local.scope = None
+        return local
+
+    # ==================== RECORDING ====================
+
+    @contextmanager
+    def call(self, method):
+        """Time one DatabaseHelper call; yields a dict to put the rows in"""
+        state = self._state()
+        entry = {"method": method, "rows": 0, "queries": 0, "elapsed": 0.0}
+        state.calls.append(entry)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["elapsed"] = time.perf_counter() - start
+            state.calls.pop()
+            self._record(entry, outermost=not state.calls)
+            if not state.calls:
+                for listener in self.listeners:
+                    listener(entry)
+            if state.scope is not None and not state.calls:
+                with self._lock:  # Prefetch workers share their caller's scope
+                    state.scope.calls.append(entry)
+
+    def query(self):
+        """Count one DB round trip against the current call and scope"""
+        state = self._state()
+        for entry in state.calls:
+            entry["queries"] += 1  # Nested calls count toward their callers too
+        with self._lock:
+            if state.scope is not None:
+                state.scope.queries += 1
+            self._queries += 1
+
+    def _record(self, entry, outermost=True):
+        with self._lock:
+            totals = self._methods.setdefault(entry["method"], {
+                "calls": 0, "queries": 0, "rows": 0, "total_time": 0.0, "max_time": 0.0
+            })
+            totals["calls"] += 1
+            totals["queries"] += entry["queries"]
+            totals["rows"] += entry["rows"]
+            totals["total_time"] += entry["elapsed"]
+            totals["max_time"] = max(totals["max_time"], entry["elapsed"])
+
+        if outermost and self.slow_ms and entry["elapsed"] * 1000 >= self.slow_ms:
+            logger.warning("Slow query: %s took %.1f ms (%d rows, %d queries)",
+                           entry["method"], entry["elapsed"] * 1000, entry["rows"], entry["queries"])
+
+    # ==================== SCOPES ====================
+
+    @contextmanager
+    def scope(self, name, budget=None):
+        """Collect the calls this thread makes, e.g. during one page rerun
+
+        The budget is only checked when the block finishes normally, so a
+        st.rerun() or st.stop() inside it is not reported.
+        """
+        state = self._state()
+        outer = state.scope
+        scope = state.scope = QueryScope(name, budget)
+        try:
+            yield scope
+        finally:
+            scope.elapsed = time.perf_counter() - scope.started
+            state.scope = outer
+            if outer is not None:
+                outer.calls.extend(scope.calls)
+                outer.queries += scope.queries
+
+        if self.enforce_budgets and budget is not None and scope.queries > budget:
+            raise QueryBudgetExceeded(
+                f"{name} ran {scope.queries} queries (budget {budget})"
+            )
+
+    def current_scope(self):
+        """The scope this thread's calls are collected in, if any"""
+        return self._state().scope
+
+    @contextmanager
+    def attach(self, scope):
+        """Collect this thread's calls in another thread's scope
+
+        Used by worker threads that run reads on behalf of a rerun.
+        """
+        state = self._state()
+        outer = state.scope
+        state.scope = scope
+        try:
+            yield
+        finally:
+            state.scope = outer
+
+    # ==================== METRICS ====================
+
+    def stats(self):
+        """Return per-method totals plus the overall query count"""
+        with self._lock:
+            methods = {name: dict(totals) for name, totals in self._methods.items()}
+            queries = self._queries
+        for totals in methods.values():
+            totals["avg_time"] = totals["total_time"] / totals["calls"] if totals["calls"] else 0.0
+        return {"queries": queries, "methods": methods}
+
+
+def instrumented(method):
+    """Decorator for DatabaseHelper methods: time the call and count its rows"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.query_log.call(method.__name__) as entry:
+            result = method(self, *args, **kwargs)
+            entry["rows"] = count_rows(result)
+            return result
+    return wrapper
@@ -0,0 +1,90 @@
+"""
+Rerun Memo Module for Event Contact System
+Memoizes DatabaseHelper reads for the length of one Streamlit rerun, so the
+same read with the same arguments reaches the database at most once per
+rerun; writes clear it
+"""
+
+from contextlib import contextmanager
+import functools
+import threading
+
+
+class RerunMemo:
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "clears": 0}
+
+    def _entries(self):
+        return getattr(self._local, "entries", None)
+
+    @contextmanager
+    def scope(self):
+        """Memoize this thread's reads until the block ends (one rerun)"""
+        outer = self._entries()
+        self._local.entries = {}
+        try:
+            yield
+        finally:
+            self._local.entries = outer
+
+    def current(self):
+        """This thread's memo, to hand to worker threads (see attach)"""
+        return self._entries()
+
+    @contextmanager
+    def attach(self, entries):
+        """Share another thread's memo, e.g. in prefetch workers"""
+        outer = self._entries()
+        self._local.entries = entries
+        try:
+            yield
+        finally:
+            self._local.entries = outer
+
+    def get_or_load(self, key, loader):
+        """Return the memoized result for key, calling loader on a miss
+
+        Outside a scope, or with unhashable arguments, loader always runs.
+        """
+        entries = self._entries()
+        if entries is None:
+            return loader()
+        try:
+            if key in entries:
+                with self._lock:
+                    self._stats["hits"] += 1
+                return entries[key]
+        except TypeError:
+            return loader()
+
+        with self._lock:
+            self._stats["misses"] += 1
+        value = loader()
+        entries[key] = value
+        return value
+
+    def clear(self):
+        """Forget this thread's memoized reads (called after every write)"""
+        entries = self._entries()
+        if entries:
+            entries.clear()
+            with self._lock:
+                self._stats["clears"] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+def memoized(method):
+    """Decorator for DatabaseHelper reads: run at most once per rerun per arguments
+
+    Callers get the same result object back, so they must not modify it.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (method.__name__, args, tuple(sorted(kwargs.items())))
+        return self.memo.get_or_load(key, lambda: method(self, *args, **kwargs))
+    return wrapper
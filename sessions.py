@@ -0,0 +1,165 @@
+"""
+Session Module for Event Contact System
+Signed, expiring login tokens kept in the page URL, so a browser refresh
+restores the signed-in user instead of asking for the password again.
+Sessions live in the User_Sessions table with an in-memory cache in front
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+from config import Config
+from db_helper import get_db
+
+# Longest a restored session is trusted from memory; a logout in another
+# app process reaches this one within this many seconds
+MAX_CACHE_TTL = 60
+
+
+class SessionStore:
+    def __init__(self, db, secret=None, ttl=12 * 3600, cache_ttl=30, cache_size=10000):
+        """Create a store on top of DatabaseHelper db
+
+        Tokens are signed with secret and expire ttl seconds after login.
+        Restored sessions are kept in memory for cache_ttl seconds (at most
+        cache_size of them), so a refresh usually costs no query. cache_ttl
+        is capped at MAX_CACHE_TTL, since a session revoked by another process
+        stays usable here until its entry expires. Without a secret a random
+        one is used, and sessions end when the app restarts.
+        """
+        self.db = db
+        if not secret:
+            print("⚠️ SESSION_SECRET is not set; sessions end when the app restarts")
+        self.secret = (secret or secrets.token_hex(32)).encode()
+        self.ttl = ttl
+        if cache_ttl > MAX_CACHE_TTL:
+            print(f"⚠️ SESSION_CACHE_TTL is capped at {MAX_CACHE_TTL} seconds")
+        self.cache_ttl = min(cache_ttl, MAX_CACHE_TTL)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"issued": 0, "hits": 0, "misses": 0, "rejected": 0, "revoked": 0}
+
+    # ==================== TOKENS ====================
+
+    def _sign(self, payload):
+        digest = hmac.new(self.secret, payload.encode(), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+    def _session_id(self, token):
+        """The session id of a correctly signed, unexpired token, else None"""
+        try:
+            session_id, expires, signature = token.split(".")
+            valid = hmac.compare_digest(self._sign(f"{session_id}.{expires}"), signature)
+            return session_id if valid and int(expires) > time.time() else None
+        except (AttributeError, ValueError):
+            return None
+
+    def issue(self, user_id, current_page="events"):
+        """Start a session for user_id and return its token (None on error)"""
+        session_id = secrets.token_hex(16)
+        expires = int(time.time() + self.ttl)
+        result = self.db.create_session(session_id, user_id, datetime.fromtimestamp(expires), current_page)
+        if not result["success"]:
+            print(f"Error: {result['error']}")
+            return None
+        self._count("issued")
+        return f"{session_id}.{expires}.{self._sign(f'{session_id}.{expires}')}"
+
+    # ==================== SESSIONS ====================
+
+    def restore(self, token):
+        """Return the session's user and page state, or None
+
+        Forged and expired tokens are rejected without a query; a valid one
+        is answered from memory when it was restored recently.
+        """
+        session_id = self._session_id(token)
+        if session_id is None:
+            self._count("rejected")
+            return None
+
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None and time.monotonic() - entry[1] < self.cache_ttl:
+                self._cache.move_to_end(session_id)
+                self._stats["hits"] += 1
+                return dict(entry[0])
+            self._stats["misses"] += 1
+
+        session = self.db.get_session(session_id)
+        if session is None:
+            self._forget(session_id)
+            return None
+        self._remember(session_id, session)
+        return dict(session)
+
+    def save_state(self, token, current_page, current_event=None):
+        """Remember the page (and event) a session is on, for the next restore"""
+        session_id = self._session_id(token)
+        if session_id is None:
+            return
+        self.db.update_session_state(session_id, current_page, current_event)
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is not None:
+                entry[0].update(current_page=current_page, current_event=current_event)
+
+    def revoke(self, token):
+        """End a session (logout)
+
+        Other app processes drop their cached copy within cache_ttl seconds.
+        """
+        session_id = self._session_id(token)
+        if session_id is None:
+            return
+        self._forget(session_id)
+        self.db.delete_session(session_id)
+        self._count("revoked")
+
+    def _remember(self, session_id, session):
+        with self._lock:
+            self._cache[session_id] = (dict(session), time.monotonic())
+            self._cache.move_to_end(session_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _forget(self, session_id):
+        with self._lock:
+            self._cache.pop(session_id, None)
+
+    def _count(self, field):
+        with self._lock:
+            self._stats[field] += 1
+
+    def stats(self):
+        """Return issued, cache hit/miss, rejected and revoked counts"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached"] = len(self._cache)
+        return stats
+
+
+# Singleton instance
+_store = None
+_store_lock = threading.Lock()
+
+def get_sessions():
+    """Get the session store (singleton pattern)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SessionStore(
+                get_db(),
+                secret=Config.SESSION_SECRET,
+                ttl=Config.SESSION_TTL_HOURS * 3600,
+                cache_ttl=Config.SESSION_CACHE_TTL,
+                cache_size=Config.SESSION_CACHE_SIZE
+            )
+    return _store
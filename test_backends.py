@@ -0,0 +1,90 @@
+"""
+Tests for the SQLite backend: MySQL-to-SQLite query rewrites, the cursor
+wrapper and duplicate-key detection
+Run with: python -m pytest test_backends.py
+"""
+
+import sqlite3
+
+import pytest
+
+from backends import SQLiteBackend, translate
+
+
+# ==================== TRANSLATE ====================
+
+@pytest.mark.parametrize("query, expected", [
+    ("SELECT * FROM users WHERE user_ID = %s AND username = %s",
+     "SELECT * FROM users WHERE user_ID = ? AND username = ?"),
+    ("SELECT event_id FROM eventz ORDER BY RAND() LIMIT %s",
+     "SELECT event_id FROM eventz ORDER BY RANDOM() LIMIT ?"),
+    ("UPDATE eventz SET updated_at = NOW()",
+     "UPDATE eventz SET updated_at = CURRENT_TIMESTAMP"),
+    ("INSERT IGNORE INTO joins (user_id, event_id) VALUES (%s, %s)",
+     "INSERT OR IGNORE INTO joins (user_id, event_id) VALUES (?, ?)"),
+    ("insert ignore into joins (user_id) values (%s)",
+     "INSERT OR IGNORE into joins (user_id) values (?)"),
+    ("SELECT capacity FROM sub_events WHERE sub_event_id = %s FOR UPDATE",
+     "SELECT capacity FROM sub_events WHERE sub_event_id = ?"),
+    ("SELECT CONCAT(first_name, ' ', last_name) AS name FROM users",
+     "SELECT (first_name || ' ' || last_name) AS name FROM users"),
+])
+def test_translate_rewrites_mysql_spellings(query, expected):
+    assert translate(query) == expected
+
+
+def test_translate_show_tables_lists_sqlite_tables():
+    translated = translate("SHOW TABLES")
+    assert "sqlite_master" in translated
+    assert "Tables_in_event" in translated
+
+
+def test_translate_leaves_portable_queries_alone():
+    query = "SELECT COUNT(*) AS n FROM chat_messages WHERE event_id = 1"
+    assert translate(query) == query
+
+
+# ==================== SQLITE BACKEND ====================
+
+@pytest.fixture
+def connection(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "backend.db"))
+    conn = backend.connect()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute("CREATE TABLE parent (id INTEGER PRIMARY KEY)")
+    cursor.execute("""
+    CREATE TABLE child (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        parent_id INT NOT NULL REFERENCES parent(id),
+        name TEXT UNIQUE
+    )
+    """)
+    cursor.execute("INSERT INTO parent (id) VALUES (%s)", (1,))
+    yield backend, cursor
+    conn.close()
+
+
+def test_cursor_returns_dict_rows_and_lastrowid(connection):
+    backend, cursor = connection
+    cursor.execute("INSERT INTO child (parent_id, name) VALUES (%s, %s)", (1, "a"))
+    first = cursor.lastrowid
+    cursor.execute("INSERT INTO child (parent_id, name) VALUES (%s, %s)", (1, "b"))
+    assert cursor.lastrowid == first + 1
+
+    cursor.execute("SELECT name FROM child WHERE id = %s", (first,))
+    assert cursor.fetchone() == {"name": "a"}
+
+
+def test_duplicate_key_is_detected(connection):
+    backend, cursor = connection
+    cursor.execute("INSERT INTO child (parent_id, name) VALUES (%s, %s)", (1, "a"))
+    with pytest.raises(sqlite3.IntegrityError) as error:
+        cursor.execute("INSERT INTO child (parent_id, name) VALUES (%s, %s)", (1, "a"))
+    assert backend.is_duplicate_key(error.value)
+
+
+def test_not_null_is_not_a_duplicate_key(connection):
+    backend, cursor = connection
+    with pytest.raises(sqlite3.IntegrityError) as error:
+        cursor.execute("INSERT INTO child (parent_id, name) VALUES (%s, %s)", (None, "a"))
+    assert not backend.is_duplicate_key(error.value)
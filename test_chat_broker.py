@@ -0,0 +1,114 @@
+"""
+Tests for the chat broker: message order, exactly-once delivery while
+inserts are in flight, DB refreshes and buffer overflow
+Run with: python -m pytest test_chat_broker.py
+"""
+
+from chat_broker import ChatBroker
+
+ROOM = (1, None)
+
+
+class FakeChatTable:
+    """Stands in for chat_messages; load_since counts its reads"""
+
+    def __init__(self):
+        self.rows = []
+        self.reads = 0
+
+    def insert(self, chat_id):
+        row = {"chat_id": chat_id, "chat_message": f"message {chat_id}"}
+        self.rows.append(row)
+        return row
+
+    def load_since(self, after_id):
+        self.reads += 1
+        return sorted((row for row in self.rows if row["chat_id"] > after_id), key=lambda row: row["chat_id"])
+
+
+def ids(messages):
+    return [message["chat_id"] for message in messages]
+
+
+# ==================== BROKER ====================
+
+def test_messages_come_back_in_id_order():
+    broker = ChatBroker(refresh_interval=None)
+    table = FakeChatTable()
+    subscription = broker.subscribe(ROOM, 0, table.load_since)
+    subscription.poll()
+
+    for chat_id in (3, 1, 2):
+        with broker.writing(ROOM):
+            broker.publish(ROOM, table.insert(chat_id))
+
+    assert ids(subscription.poll()) == [1, 2, 3]
+    assert subscription.poll() == []
+
+
+def test_late_commit_is_not_skipped_or_repeated():
+    broker = ChatBroker(refresh_interval=None)
+    table = FakeChatTable()
+    subscription = broker.subscribe(ROOM, 0, table.load_since)
+    subscription.poll()
+
+    with broker.writing(ROOM):
+        # Message 1 is still being written when message 2 is published
+        with broker.writing(ROOM):
+            broker.publish(ROOM, table.insert(2))
+        assert ids(subscription.poll()) == [2]
+        broker.publish(ROOM, table.insert(1))
+
+    assert ids(subscription.poll()) == [1]
+    assert subscription.poll() == []
+
+
+def test_refresh_does_not_skip_an_insert_in_flight():
+    broker = ChatBroker(refresh_interval=0)
+    table = FakeChatTable()
+    subscription = broker.subscribe(ROOM, 0, table.load_since)
+    subscription.poll()
+
+    with broker.writing(ROOM):
+        # Message 1 is being written here while message 2 commits elsewhere
+        table.insert(2)
+        assert ids(subscription.poll()) == [2]
+        broker.publish(ROOM, table.insert(1))
+
+    assert ids(subscription.poll()) == [1]
+    assert subscription.poll() == []
+
+
+def test_room_is_read_from_the_db_once():
+    broker = ChatBroker(refresh_interval=None)
+    table = FakeChatTable()
+    table.insert(1)
+    first = broker.subscribe(ROOM, 0, table.load_since)
+    second = broker.subscribe(ROOM, 0, table.load_since)
+
+    assert ids(first.poll()) == [1]
+    assert ids(second.poll()) == [1]
+    assert table.reads == 1
+
+
+def test_refresh_picks_up_messages_from_other_processes():
+    broker = ChatBroker(refresh_interval=0)
+    table = FakeChatTable()
+    subscription = broker.subscribe(ROOM, 0, table.load_since)
+    subscription.poll()
+
+    table.insert(1)  # Written without publishing, as another process would
+
+    assert ids(subscription.poll()) == [1]
+
+
+def test_subscriber_behind_the_buffer_reads_its_gap_directly():
+    broker = ChatBroker(buffer_size=2, refresh_interval=None)
+    table = FakeChatTable()
+    broker.subscribe(ROOM, 0, table.load_since).poll()
+    for chat_id in range(1, 6):
+        with broker.writing(ROOM):
+            broker.publish(ROOM, table.insert(chat_id))
+
+    assert ids(broker.subscribe(ROOM, 0, table.load_since).poll()) == [1, 2, 3, 4, 5]
+    assert broker.stats()["direct_reads"] == 1
@@ -0,0 +1,53 @@
+"""
+Tests for paging chat history backwards by chat_id: each page is in
+chronological order, older pages follow without gaps, and rooms stay apart
+Run with: python -m pytest test_chat_history.py
+"""
+
+import pytest
+
+
+@pytest.fixture
+def chat(db, make_event):
+    """(event_id, sub_event_id, main chat ids oldest first) with seven main chat messages"""
+    event_id = make_event()
+    sub_event_id = db.create_subevent("Track", "Test", event_id)["sub_event_id"]
+    chat_ids = []
+    for n in range(7):
+        chat_ids.append(db.send_message(event_id, "user", f"main {n}")["chat_id"])
+        db.send_message(event_id, "user", f"track {n}", sub_event_id=sub_event_id)
+    return event_id, sub_event_id, chat_ids
+
+
+def _ids(messages):
+    return [message["chat_id"] for message in messages]
+
+
+def test_latest_page_is_in_chronological_order(db, chat):
+    event_id, _, chat_ids = chat
+    assert _ids(db.get_event_chat(event_id, limit=3)) == chat_ids[-3:]
+
+
+def test_older_pages_follow_without_gaps(db, chat):
+    event_id, _, chat_ids = chat
+    pages = [db.get_event_chat(event_id, limit=3)]
+    while pages[-1]:
+        pages.append(db.get_event_chat(event_id, limit=3, before_id=pages[-1][0]["chat_id"]))
+
+    assert [len(page) for page in pages] == [3, 3, 1, 0]
+    assert [chat_id for page in reversed(pages) for chat_id in _ids(page)] == chat_ids
+
+
+def test_rooms_are_paged_separately(db, chat):
+    event_id, sub_event_id, chat_ids = chat
+    main = db.get_event_chat(event_id, limit=50)
+    track = db.get_subevent_chat(event_id, sub_event_id, limit=50)
+
+    assert _ids(main) == chat_ids
+    assert all(message["chat_message_text"].startswith("track") for message in track)
+    assert len(track) == 7
+
+
+def test_since_returns_only_newer_messages(db, chat):
+    event_id, _, chat_ids = chat
+    assert _ids(db.get_event_chat_since(event_id, chat_ids[4])) == chat_ids[5:]
@@ -0,0 +1,76 @@
+"""
+Tests for the chat write-behind queue: batching in submit order, retries
+and back-pressure
+Run with: python -m pytest test_chat_writer.py
+"""
+
+import threading
+
+from chat_writer import ChatWriteBehind
+
+
+def test_write_behind_batches_in_submit_order():
+    batches = []
+    writer = ChatWriteBehind(batches.append, flush_interval=0.05, max_batch=10)
+    try:
+        for n in range(25):
+            assert writer.submit({"chat_message": n})["queued"]
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    written = [message["chat_message"] for batch in batches for message in batch]
+    assert written == list(range(25))
+    assert max(len(batch) for batch in batches) <= 10
+    assert writer.stats()["written"] == 25
+
+
+def test_write_behind_retries_then_gives_up():
+    attempts = []
+
+    def failing_write(batch):
+        attempts.append(len(batch))
+        raise RuntimeError("database is down")
+
+    writer = ChatWriteBehind(failing_write, flush_interval=0.01, max_retries=2)
+    try:
+        writer.submit({"chat_message": "lost"})
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert attempts == [1, 1]
+    assert writer.stats()["failed"] == 1
+
+
+def test_write_behind_drops_only_the_bad_message_of_a_failed_batch():
+    written = []
+
+    def write_batch(batch):
+        if any(message["chat_message"] == "bad" for message in batch):
+            raise RuntimeError("foreign key constraint fails")
+        written.extend(message["chat_message"] for message in batch)
+
+    writer = ChatWriteBehind(write_batch, flush_interval=0.05, max_retries=1)
+    try:
+        for text in ("a", "bad", "b"):
+            writer.submit({"chat_message": text})
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert written == ["a", "b"]
+    assert (writer.stats()["written"], writer.stats()["failed"]) == (2, 1)
+
+
+def test_write_behind_rejects_when_the_queue_is_full():
+    release = threading.Event()
+    writer = ChatWriteBehind(lambda batch: release.wait(2), flush_interval=0.01,
+                             max_batch=1, queue_size=1, put_timeout=0.05)
+    try:
+        results = [writer.submit({"chat_message": n}) for n in range(4)]
+        assert any(not result["success"] for result in results)
+        assert writer.stats()["rejected"] >= 1
+    finally:
+        release.set()
+        writer.close()
@@ -4,6 +4,7 @@ Run this script to verify your database setup
 """
 
 from db_helper import get_db
+from config import Config
 from datetime import datetime, date, time
 
 def test_connection():
@@ -14,9 +15,10 @@ def test_connection():
     
     db = get_db()
     
-    if db.mydb and db.mydb.is_connected():
+    if db.is_connected():
         print("✅ Database connected successfully!")
-        print(f"   Host: {db.mydb.server_host}")
+        print(f"   Host: {Config.DB_HOST}")
+        print(f"   Pool size: {db.pool_stats()['pool_size']}")
         print(f"   Database: event")
         return True
     else:
@@ -38,8 +40,7 @@ def test_tables():
     ]
     
     try:
-        db.mycursor.execute("SHOW TABLES")
-        existing_tables = [table['Tables_in_event'] for table in db.mycursor.fetchall()]
+        existing_tables = [table['Tables_in_event'] for table in db.fetch_query("SHOW TABLES")]
         
         print(f"\nFound {len(existing_tables)} tables:")
         for table in existing_tables:
@@ -0,0 +1,65 @@
+"""
+Tests for keyset pagination of event listings: pages follow start date
+(newest first) without gaps or repeats, filters apply per page, and new
+events don't shift later pages
+Run with: python -m pytest test_events_pagination.py
+"""
+
+import pytest
+
+
+def _walk(db, user_id, page_size=2, **filters):
+    """Every page of the listing as lists of event ids"""
+    pages, cursor = [], None
+    while True:
+        page = db.get_events_page(user_id, after=cursor, page_size=page_size, **filters)
+        pages.append([event["event_id"] for event in page["events"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.fixture
+def events(make_event):
+    """Five events, two of them on the same day, oldest first"""
+    dates = ["2025-01-01", "2025-02-01", "2025-02-01", "2025-03-01", "2025-04-01"]
+    statuses = ["completed", "completed", "ongoing", "upcoming", "upcoming"]
+    return [make_event(date, status) for date, status in zip(dates, statuses)]
+
+
+def test_pages_cover_every_event_newest_first(db, make_user, events):
+    pages = _walk(db, make_user())
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    # Same-day events come in descending id order
+    assert [event_id for page in pages for event_id in page] == list(reversed(events))
+
+
+def test_exact_multiple_of_page_size_has_no_empty_last_page(db, make_user, events):
+    pages = _walk(db, make_user(), page_size=5)
+    assert pages == [list(reversed(events))]
+
+
+def test_status_filter_pages(db, make_user, events):
+    pages = _walk(db, make_user(), page_size=1, status="completed")
+    assert pages == [[events[1]], [events[0]]]
+
+
+def test_only_joined_pages(db, make_user, events):
+    user_id = make_user()
+    for event_id in events[::2]:
+        db.join_event(user_id, event_id)
+
+    pages = _walk(db, user_id, only_joined=True)
+
+    assert [event_id for page in pages for event_id in page] == [events[4], events[2], events[0]]
+
+
+def test_new_event_does_not_shift_later_pages(db, make_user, make_event, events):
+    user_id = make_user()
+    first = db.get_events_page(user_id, page_size=2)
+    second = db.get_events_page(user_id, after=first["next_cursor"], page_size=2)
+
+    make_event("2025-05-01")
+
+    assert db.get_events_page(user_id, after=first["next_cursor"], page_size=2)["events"] == second["events"]
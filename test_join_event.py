@@ -0,0 +1,56 @@
+"""
+Tests for joining an event: one membership per user and event, repeated
+joins change nothing, and real failures are reported as errors
+Run with: python -m pytest test_join_event.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from backends import SQLiteBackend
+from db_helper import DatabaseHelper
+
+
+def test_first_join_adds_the_member_with_the_role(db, make_user, make_event):
+    user_id, event_id = make_user(), make_event()
+
+    assert db.join_event(user_id, event_id, role="core") == {"success": True, "joined": True}
+
+    assert db.check_user_joined_event(user_id, event_id)
+    assert db.get_user_event_roles(user_id) == {event_id: "core"}
+
+
+def test_repeated_join_changes_nothing(db, make_user, make_event):
+    user_id, event_id = make_user(), make_event()
+    db.join_event(user_id, event_id, role="admin")
+
+    assert db.join_event(user_id, event_id) == {"success": True, "joined": False}
+
+    assert db.get_user_event_roles(user_id) == {event_id: "admin"}
+    assert len(db.get_event_participants(event_id)) == 1
+
+
+def test_join_of_a_missing_event_is_an_error(db, make_user):
+    result = db.join_event(make_user(), 999)
+    assert not result["success"]
+    assert "error" in result
+
+
+def test_concurrent_joins_add_one_membership(db, make_user, make_event, tmp_path):
+    user_id, event_id = make_user(), make_event()
+    pooled = DatabaseHelper(pool_size=4, backend=SQLiteBackend(str(tmp_path / "event.db")))
+    barrier = threading.Barrier(8)
+
+    def join(_):
+        barrier.wait()
+        return pooled.join_event(user_id, event_id)
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(join, range(8)))
+    finally:
+        pooled.close()
+
+    assert all(result["success"] for result in results)
+    assert sum(result["joined"] for result in results) == 1
+    assert len(db.get_event_participants(event_id)) == 1
@@ -0,0 +1,87 @@
+"""
+Tests for password hashing: verify, legacy SHA-256 hashes, rehash
+detection and the bounded worker pool
+Run with: python -m pytest test_passwords.py
+"""
+
+import hashlib
+import threading
+
+import pytest
+
+from passwords import PasswordHasher, PasswordPoolBusy
+
+
+@pytest.fixture
+def hasher():
+    # A tiny scrypt cost keeps the tests fast; the format is the same
+    hasher = PasswordHasher(log2_n=4, r=8, p=1, workers=2)
+    yield hasher
+    hasher.close()
+
+
+def test_hash_verifies_only_the_right_password(hasher):
+    stored = hasher.hash("correct horse")
+    assert stored.startswith("scrypt$4$8$1$")
+    assert hasher.verify("correct horse", stored)
+    assert not hasher.verify("wrong horse", stored)
+
+
+def test_hashes_are_salted(hasher):
+    assert hasher.hash("same") != hasher.hash("same")
+
+
+def test_unknown_user_never_verifies(hasher):
+    assert not hasher.verify("anything", None)
+
+
+def test_malformed_hash_does_not_verify(hasher):
+    assert not hasher.verify("secret", "scrypt$not$a$valid$hash")
+    assert not hasher.verify("secret", "bcrypt$4$8$1$c2FsdA==$a2V5")
+
+
+def test_legacy_sha256_verifies_and_needs_rehash(hasher):
+    legacy = hashlib.sha256(b"old password").hexdigest()
+    assert hasher.verify("old password", legacy)
+    assert not hasher.verify("other password", legacy)
+    assert hasher.needs_rehash(legacy)
+    assert hasher.stats()["legacy"] == 2
+
+
+def test_needs_rehash_when_cost_changes(hasher):
+    stored = hasher.hash("secret")
+    assert not hasher.needs_rehash(stored)
+
+    stronger = PasswordHasher(log2_n=5, r=8, p=1, workers=1)
+    try:
+        assert stronger.needs_rehash(stored)
+        # Hashes made with the old cost still verify until they are upgraded
+        assert stronger.verify("secret", stored)
+    finally:
+        stronger.close()
+
+
+def test_needs_rehash_for_missing_hash(hasher):
+    assert hasher.needs_rehash(None)
+    assert hasher.needs_rehash("")
+
+
+def test_full_pool_raises_busy():
+    hasher = PasswordHasher(log2_n=4, workers=1, queue_size=0, timeout=0.05)
+    started, release = threading.Event(), threading.Event()
+
+    def hold_worker():
+        started.set()
+        release.wait(2)
+
+    blocker = threading.Thread(target=hasher._run, args=(hold_worker,))
+    blocker.start()
+    started.wait(2)
+    try:
+        with pytest.raises(PasswordPoolBusy):
+            hasher.hash("secret")
+        assert hasher.stats()["busy"] == 1
+    finally:
+        release.set()
+        blocker.join()
+        hasher.close()
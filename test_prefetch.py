@@ -0,0 +1,51 @@
+"""
+Tests for prefetching reads: they run on worker threads with a pool, and
+inline on the transaction's connection inside a transaction
+Run with: python -m pytest test_prefetch.py
+"""
+
+import threading
+
+import pytest
+
+from backends import SQLiteBackend
+from db_helper import DatabaseHelper
+
+
+@pytest.fixture
+def pooled(db, tmp_path):
+    """A helper with a one-connection pool on the same database as db"""
+    helper = DatabaseHelper(pool_size=1, pool_timeout=1, backend=SQLiteBackend(str(tmp_path / "event.db")))
+    yield helper
+    helper.close()
+
+
+def _thread_name(_):
+    return threading.current_thread().name
+
+
+def test_reads_run_on_worker_threads(pooled, make_event):
+    event_id = make_event()
+    results = pooled.prefetch({
+        "event": (pooled.get_event_by_id, (event_id,)),
+        "thread": (_thread_name, (None,)),
+    })
+    assert results["event"]["event_id"] == event_id
+    assert results["thread"].startswith("db-prefetch")
+
+
+def test_reads_run_inline_inside_a_transaction(pooled):
+    with pooled.transaction():
+        event_id = pooled.create_event("Uncommitted", "Technology", "Test", "2025-01-01", "2025-01-01",
+                                       "09:00:00", "17:00:00", "upcoming", "TX1", None)["event_id"]
+        # The transaction holds the only pooled connection; workers would wait for it
+        results = pooled.prefetch({
+            "event": (pooled.get_event_by_id, (event_id,)),
+            "announcements": (pooled.get_event_announcements, (event_id,)),
+            "thread": (_thread_name, (None,)),
+        })
+
+    assert results["event"]["title"] == "Uncommitted"
+    assert results["announcements"] == []
+    assert results["thread"] == threading.current_thread().name
+    assert pooled.pool_stats()["exhausted"] == 0
@@ -0,0 +1,219 @@
+"""
+Tests for the read cache: hits, per-event and listing invalidation, TTL
+expiry and stale results, plus the invalidations DatabaseHelper writes make
+Run with: python -m pytest test_query_cache.py
+"""
+
+import threading
+import time
+
+import pytest
+
+from query_cache import LISTING, QueryCache, part
+
+
+class Loader:
+    """Counts calls and returns a new value on each one"""
+
+    def __init__(self, value="v"):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return f"{self.value}{self.calls}"
+
+
+# ==================== QUERY CACHE ====================
+
+def test_hit_after_first_load():
+    cache = QueryCache()
+    load = Loader()
+    assert cache.get_or_load("event", (1,), 1, load) == "v1"
+    assert cache.get_or_load("event", (1,), 1, load) == "v1"
+    assert load.calls == 1
+    assert cache.stats()["namespaces"]["event"]["hits"] == 1
+
+
+def test_invalidate_event_keeps_other_events_and_listing():
+    cache = QueryCache()
+    one, two, listing = Loader("one"), Loader("two"), Loader("list")
+    cache.get_or_load("event", (1,), 1, one)
+    cache.get_or_load("event", (2,), 2, two)
+    cache.get_or_load("events", (), LISTING, listing)
+
+    cache.invalidate(1, listing=False)
+
+    assert cache.get_or_load("event", (1,), 1, one) == "one2"
+    assert cache.get_or_load("event", (2,), 2, two) == "two1"
+    assert cache.get_or_load("events", (), LISTING, listing) == "list1"
+
+
+def test_invalidate_with_listing_drops_listing_entries():
+    cache = QueryCache()
+    listing = Loader("list")
+    cache.get_or_load("events", (), LISTING, listing)
+
+    cache.invalidate(1)
+
+    assert cache.get_or_load("events", (), LISTING, listing) == "list2"
+
+
+def test_invalidate_part_keeps_the_rest_of_the_event():
+    cache = QueryCache()
+    details, counts = Loader("details"), Loader("count")
+    cache.get_or_load("event", (1,), 1, details)
+    cache.get_or_load("count", (1,), part("messages", 1), counts)
+
+    cache.invalidate(1, listing=False, parts=("messages",))
+
+    assert cache.get_or_load("event", (1,), 1, details) == "details1"
+    assert cache.get_or_load("count", (1,), part("messages", 1), counts) == "count2"
+
+
+def test_invalidate_event_drops_its_parts():
+    cache = QueryCache()
+    counts = Loader("count")
+    cache.get_or_load("count", (1,), part("messages", 1), counts)
+
+    cache.invalidate(1, listing=False)
+
+    assert cache.get_or_load("count", (1,), part("messages", 1), counts) == "count2"
+    assert cache.stats()["total"]["entries"] == 1
+
+
+def test_clear_drops_everything():
+    cache = QueryCache()
+    load = Loader()
+    cache.get_or_load("event", (1,), 1, load)
+    cache.clear()
+    assert cache.get_or_load("event", (1,), 1, load) == "v2"
+
+
+def test_expired_entry_is_reloaded():
+    cache = QueryCache(ttl=0.05)
+    load = Loader()
+    cache.get_or_load("event", (1,), 1, load)
+    time.sleep(0.06)
+    assert cache.get_or_load("event", (1,), 1, load) == "v2"
+
+
+def test_stale_entry_is_served_while_it_reloads():
+    cache = QueryCache(ttl=0.05, stale_ttl=10)
+    load = Loader()
+    cache.get_or_load("event", (1,), 1, load)
+    time.sleep(0.06)
+
+    assert cache.get_or_load("event", (1,), 1, load) == "v1"
+    deadline = time.monotonic() + 2
+    while load.calls < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.01)
+    assert cache.get_or_load("event", (1,), 1, load) == "v2"
+    assert cache.stats()["namespaces"]["event"]["stale_hits"] == 1
+
+
+def test_write_during_load_is_not_cached():
+    cache = QueryCache()
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_load():
+        loading.set()
+        release.wait(2)
+        return "before write"
+
+    reader = threading.Thread(target=cache.get_or_load, args=("event", (1,), 1, slow_load))
+    reader.start()
+    loading.wait(2)
+    cache.invalidate(1)
+    release.set()
+    reader.join()
+
+    assert cache.get_or_load("event", (1,), 1, lambda: "after write") == "after write"
+
+
+def test_get_or_load_many_loads_only_misses():
+    cache = QueryCache()
+    requested = []
+
+    def load(missing):
+        requested.append(sorted(missing))
+        return {event_id: event_id * 10 for event_id in missing}
+
+    assert cache.get_or_load_many("count", [1, 2], load) == {1: 10, 2: 20}
+    cache.invalidate(2, listing=False)
+    assert cache.get_or_load_many("count", [1, 2, 3], load) == {1: 10, 2: 20, 3: 30}
+    assert requested == [[1, 2], [2, 3]]
+
+
+def test_bypass_skips_the_cache():
+    cache = QueryCache()
+    load = Loader()
+    cache.get_or_load("event", (1,), 1, load)
+    with cache.bypass():
+        assert cache.get_or_load("event", (1,), 1, load) == "v2"
+    assert cache.get_or_load("event", (1,), 1, load) == "v1"
+
+
+def test_lru_eviction_keeps_cache_under_max_bytes():
+    cache = QueryCache(max_bytes=2000)
+    for event_id in range(50):
+        cache.get_or_load("event", (event_id,), event_id, lambda: "x" * 100)
+    stats = cache.stats()["total"]
+    assert stats["bytes"] <= 2000
+    assert stats["evictions"] > 0
+
+
+# ==================== DATABASE HELPER ====================
+
+@pytest.fixture
+def member(db, make_user, make_event):
+    """(user_id, event_id) of a user who has joined an event"""
+    user_id, event_id = make_user(), make_event()
+    db.join_event(user_id, event_id)
+    return user_id, event_id
+
+
+def _invalidations(db, namespace):
+    return db.cache.stats()["namespaces"].get(namespace, {}).get("invalidations", 0)
+
+
+def test_chat_message_only_invalidates_message_counts(db, member):
+    user_id, event_id = member
+    before = {event["event_id"]: event for event in db.get_events_dashboard(user_id)}
+    db.get_event_by_id(event_id)
+    db.get_event_participants(event_id)
+
+    assert db.send_message(event_id, "user1@example.com", "Hello")["success"]
+
+    after = {event["event_id"]: event for event in db.get_events_dashboard(user_id)}
+    assert after[event_id]["message_count"] == before[event_id]["message_count"] + 1
+    assert _invalidations(db, "event_message_count") == 1
+    for namespace in ("events_dashboard", "event", "event_participants"):
+        assert _invalidations(db, namespace) == 0
+
+
+def test_subevent_join_only_invalidates_the_subevents_overview(db, member):
+    user_id, event_id = member
+    sub_event_id = db.create_subevent("Track", "Test", event_id, capacity=5)["sub_event_id"]
+    db.get_event_by_id(event_id)
+    db.get_event_subevents(event_id)
+    assert db.get_subevents_overview(event_id, user_id)[0]["participants_count"] == 0
+
+    assert db.join_subevent(user_id, sub_event_id)["status"] == "joined"
+
+    assert db.get_subevents_overview(event_id, user_id)[0]["participants_count"] == 1
+    for namespace in ("event", "event_subevents"):
+        assert _invalidations(db, namespace) == 0
+
+
+def test_join_invalidates_listing(db, member, make_user):
+    event_id = member[1]
+    other = make_user()
+    assert db.get_events_dashboard(other, only_joined=True) == []
+
+    assert db.join_event(other, event_id)["joined"]
+
+    assert [event["event_id"] for event in db.get_events_dashboard(other, only_joined=True)] == [event_id]
+    assert _invalidations(db, "events_dashboard") == 1
@@ -0,0 +1,81 @@
+"""
+Tests for the per-rerun memo: reads run once per scope, writes clear it and
+prefetch workers can share it
+Run with: python -m pytest test_rerun_memo.py
+"""
+
+import threading
+
+from rerun_memo import RerunMemo, memoized
+
+
+class Reader:
+    """Minimal DatabaseHelper stand-in with one memoized read"""
+
+    def __init__(self):
+        self.memo = RerunMemo()
+        self.queries = 0
+
+    @memoized
+    def get_event(self, event_id, detail=False):
+        self.queries += 1
+        return {"event_id": event_id, "detail": detail}
+
+
+def test_read_runs_once_per_scope():
+    reader = Reader()
+    with reader.memo.scope():
+        assert reader.get_event(1) is reader.get_event(1)
+        reader.get_event(2)
+        reader.get_event(1, detail=True)
+    assert reader.queries == 3
+
+    with reader.memo.scope():
+        reader.get_event(1)
+    assert reader.queries == 4
+
+
+def test_no_memo_outside_a_scope():
+    reader = Reader()
+    reader.get_event(1)
+    reader.get_event(1)
+    assert reader.queries == 2
+
+
+def test_clear_forgets_reads():
+    reader = Reader()
+    with reader.memo.scope():
+        reader.get_event(1)
+        reader.memo.clear()
+        reader.get_event(1)
+    assert reader.queries == 2
+    assert reader.memo.stats()["clears"] == 1
+
+
+def test_unhashable_arguments_are_not_memoized():
+    reader = Reader()
+    with reader.memo.scope():
+        reader.get_event([1])
+        reader.get_event([1])
+    assert reader.queries == 2
+
+
+def test_scopes_are_per_thread_unless_attached():
+    reader = Reader()
+    with reader.memo.scope():
+        reader.get_event(1)
+        shared = reader.memo.current()
+
+        def isolated():
+            reader.get_event(1)
+
+        def attached():
+            with reader.memo.attach(shared):
+                reader.get_event(1)
+
+        for target in (isolated, attached):
+            worker = threading.Thread(target=target)
+            worker.start()
+            worker.join()
+
+    assert reader.queries == 2
@@ -0,0 +1,119 @@
+"""
+Tests for login sessions: token signing and expiry, the in-memory cache and
+how long a revoked session survives in another process's cache
+Run with: python -m pytest test_sessions.py
+"""
+
+import time
+
+import pytest
+
+from sessions import MAX_CACHE_TTL, SessionStore
+
+
+class FakeSessionsTable:
+    """The four DatabaseHelper session methods over a dict"""
+
+    def __init__(self):
+        self.rows = {}
+        self.reads = 0
+
+    def create_session(self, session_id, user_id, expires_at, current_page="events"):
+        self.rows[session_id] = {"user_ID": user_id, "current_page": current_page, "current_event": None}
+        return {"success": True}
+
+    def get_session(self, session_id):
+        self.reads += 1
+        row = self.rows.get(session_id)
+        return dict(row) if row else None
+
+    def update_session_state(self, session_id, current_page, current_event=None):
+        if session_id in self.rows:
+            self.rows[session_id].update(current_page=current_page, current_event=current_event)
+        return {"success": True}
+
+    def delete_session(self, session_id):
+        self.rows.pop(session_id, None)
+        return {"success": True}
+
+
+@pytest.fixture
+def table():
+    return FakeSessionsTable()
+
+
+@pytest.fixture
+def store(table):
+    return SessionStore(table, secret="test-secret")
+
+
+def test_issued_token_restores_the_user(store):
+    token = store.issue(7, current_page="events")
+    session = store.restore(token)
+    assert session["user_ID"] == 7
+    assert session["current_page"] == "events"
+
+
+def test_forged_and_malformed_tokens_are_rejected_without_a_query(store, table):
+    session_id, expires, signature = store.issue(7).split(".")
+    forged = f"{session_id}.{int(expires) + 3600}.{signature}"
+    for token in (forged, "not-a-token", "", None):
+        assert store.restore(token) is None
+    assert table.reads == 0
+    assert store.stats()["rejected"] == 4
+
+
+def test_token_from_another_secret_is_rejected(store):
+    other = SessionStore(FakeSessionsTable(), secret="another-secret")
+    assert store.restore(other.issue(7)) is None
+
+
+def test_expired_token_is_rejected(table):
+    store = SessionStore(table, secret="test-secret", ttl=-1)
+    assert store.restore(store.issue(7)) is None
+
+
+def test_restore_is_cached(store, table):
+    token = store.issue(7)
+    store.restore(token)
+    store.restore(token)
+    assert table.reads == 1
+    assert store.stats()["hits"] == 1
+
+
+def test_saved_state_is_restored(store):
+    token = store.issue(7)
+    store.restore(token)
+    store.save_state(token, "event_details", 3)
+    session = store.restore(token)
+    assert (session["current_page"], session["current_event"]) == ("event_details", 3)
+
+
+def test_revoke_ends_the_session(store):
+    token = store.issue(7)
+    store.restore(token)
+    store.revoke(token)
+    assert store.restore(token) is None
+
+
+def test_revoke_reaches_other_processes_after_the_cache_ttl(table):
+    here = SessionStore(table, secret="test-secret", cache_ttl=0.05)
+    elsewhere = SessionStore(table, secret="test-secret", cache_ttl=0.05)
+    token = here.issue(7)
+    elsewhere.restore(token)
+
+    here.revoke(token)
+    time.sleep(0.06)
+
+    assert elsewhere.restore(token) is None
+
+
+def test_cache_ttl_is_capped(table):
+    assert SessionStore(table, secret="test-secret", cache_ttl=3600).cache_ttl == MAX_CACHE_TTL
+
+
+def test_cache_is_bounded(table):
+    store = SessionStore(table, secret="test-secret", cache_size=2)
+    for user_id in range(5):
+        store.restore(store.issue(user_id))
+    assert store.stats()["cached"] == 2
@@ -0,0 +1,97 @@
+"""
+Tests for subevent capacity: joins past capacity go to a FIFO waitlist,
+leaving promotes the next waitlisted user, and concurrent joins never
+overbook
+Run with: python -m pytest test_subevent_capacity.py
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from backends import SQLiteBackend
+from db_helper import DatabaseHelper
+
+
+@pytest.fixture
+def subevent(db, make_event):
+    """(event_id, sub_event_id) of a subevent with two places"""
+    event_id = make_event()
+    return event_id, db.create_subevent("Workshop", "Test", event_id, capacity=2)["sub_event_id"]
+
+
+def _overview(db, event_id, user_id):
+    return db.get_subevents_overview(event_id, user_id)[0]
+
+
+def test_joins_past_capacity_are_waitlisted_in_order(db, make_user, subevent):
+    event_id, sub_event_id = subevent
+    users = [make_user() for _ in range(4)]
+
+    results = [db.join_subevent(user_id, sub_event_id) for user_id in users]
+
+    assert [result["status"] for result in results] == ["joined", "joined", "waitlisted", "waitlisted"]
+    assert [result.get("position") for result in results[2:]] == [1, 2]
+    overview = _overview(db, event_id, users[2])
+    assert (overview["participants_count"], overview["waitlist_count"]) == (2, 2)
+    assert overview["is_waitlisted"] and not overview["is_registered"]
+
+
+def test_leaving_promotes_the_first_waitlisted_user(db, make_user, subevent):
+    event_id, sub_event_id = subevent
+    users = [make_user() for _ in range(4)]
+    for user_id in users:
+        db.join_subevent(user_id, sub_event_id)
+
+    result = db.leave_subevent(users[0], sub_event_id)
+
+    assert result["promoted"] == [users[2]]
+    assert _overview(db, event_id, users[2])["is_registered"]
+    assert _overview(db, event_id, users[3])["is_waitlisted"]
+
+
+def test_leaving_the_waitlist_promotes_nobody(db, make_user, subevent):
+    event_id, sub_event_id = subevent
+    users = [make_user() for _ in range(3)]
+    for user_id in users:
+        db.join_subevent(user_id, sub_event_id)
+
+    assert db.leave_subevent(users[2], sub_event_id)["promoted"] == []
+    assert _overview(db, event_id, users[0])["waitlist_count"] == 0
+
+
+def test_double_join_is_rejected(db, make_user, subevent):
+    user_id = make_user()
+    _, sub_event_id = subevent
+    assert db.join_subevent(user_id, sub_event_id)["success"]
+    assert not db.join_subevent(user_id, sub_event_id)["success"]
+
+
+def test_unlimited_subevent_never_waitlists(db, make_user, make_event):
+    event_id = make_event()
+    sub_event_id = db.create_subevent("Talk", "Test", event_id)["sub_event_id"]
+    statuses = {db.join_subevent(make_user(), sub_event_id)["status"] for _ in range(5)}
+    assert statuses == {"joined"}
+
+
+def test_concurrent_joins_never_overbook(db, make_user, subevent, tmp_path):
+    event_id, sub_event_id = subevent
+    users = [make_user() for _ in range(12)]
+    pooled = DatabaseHelper(pool_size=6, backend=SQLiteBackend(str(tmp_path / "event.db")))
+    barrier = threading.Barrier(len(users))
+
+    def join(user_id):
+        barrier.wait()
+        return pooled.join_subevent(user_id, sub_event_id)
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(users)) as pool:
+            results = list(pool.map(join, users))
+    finally:
+        pooled.close()
+
+    assert all(result["success"] for result in results)
+    assert sum(result["status"] == "joined" for result in results) == 2
+    assert db.get_subevent_participants_count(sub_event_id) == 2
+    assert sorted(result["position"] for result in results if result["status"] == "waitlisted") == list(range(1, 11))